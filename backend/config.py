@@ -5,9 +5,59 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
     openrouter_api_key: str = ""
+    openrouter_base_url: str = "https://openrouter.ai/api/v1"
     database_url: str = "sqlite:///./data/medtranslate.db"
     allowed_origins: str = "http://localhost:5173,https://medtranslate.vercel.app"
     audio_storage_path: str = "./data/audio"
+    archive_storage_path: str = "./data/archive"
+    archive_after_days: int = 30
+    summary_chunk_tokens: int = 6000
+    summary_max_concurrency: int = 4
+    auto_summary_enabled: bool = True
+    auto_summary_idle_seconds: int = 120
+    auto_summary_max_concurrency: int = 2
+    summary_job_concurrency: int = 4
+    summary_job_batch_size: int = 50
+    pubsub_url: str = "memory://"  # or redis://host:port, unix:///path/to.sock
+    ws_send_queue_size: int = 256
+    ws_slow_consumer_policy: str = "coalesce"  # for ephemeral frames: drop, coalesce or disconnect (chat frames always disconnect)
+    ws_max_in_flight_messages: int = 8
+    ws_resume_buffer_size: int = 200  # sequenced frames kept per conversation
+    ws_resume_max_conversations: int = 1000
+    ws_per_message_deflate: bool = True
+    ws_heartbeat_interval_seconds: float = 20.0
+    ws_idle_timeout_seconds: float = 60.0
+    ws_max_connections: int = 10000
+    ws_max_connections_per_conversation: int = 16
+    tracing_exporter: str = "none"  # none, console or file
+    tracing_file_path: str = "./data/traces.ndjson"
+    tracing_sample_rate: float = 1.0
+    slow_trace_threshold_ms: float = 3000.0
+    slow_trace_sample_rate: float = 1.0
+    conversation_cache_size: int = 10000  # conversations whose metadata is kept in memory
+    conversation_cache_ttl_seconds: float = 60.0  # reload even without an invalidation (e.g. one lost in pub/sub)
+    speculative_translation_enabled: bool = True  # clients opt in by sending drafts
+    speculative_debounce_ms: int = 400
+    speculative_min_chars: int = 4
+    speculative_min_interval_ms: int = 1000  # between speculations of one connection
+    speculative_max_concurrency: int = 16  # speculative translations in flight per worker
+    translation_memory_enabled: bool = True
+    translation_memory_max_entries: int = 20000  # per language pair
+    translation_memory_min_similarity: float = 0.6  # trigram Dice coefficient
+    translation_memory_examples: int = 3
+    translation_memory_max_chars: int = 200  # longer free text is never stored or reused
+    translation_memory_shared_examples: bool = False  # prompt with other conversations' messages
+    translation_breaker_threshold: int = 3  # consecutive failures before failing fast
+    translation_breaker_cooldown_seconds: float = 30.0
+    outbox_path: str = "./data/outbox.db"
+    outbox_workers: int = 2
+    outbox_retry_base_seconds: float = 2.0
+    outbox_retry_max_seconds: float = 300.0
+    outbox_max_attempts: int = 50
+    # How long the live message path waits for a locked outbox before giving up
+    outbox_enqueue_timeout_seconds: float = 0.5
+    typing_refresh_ms: int = 2000
+    typing_timeout_seconds: float = 5.0
 
     @property
     def cors_origins(self) -> List[str]:
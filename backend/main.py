@@ -1,55 +1,118 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from config import settings
-from database import init_db
-
-# Import routers
-from routers import conversations as conv_router
-from routers import messages as msg_router
-from routers import search as search_router
-from routers import audio as audio_router
-from routers import translate as translate_router
-from routers import summarize as summarize_router
-from websocket.handlers import websocket_router
-
-app = FastAPI(
-    title="MedTranslate API",
-    description="Real-time AI-powered healthcare translation",
-    version="1.0.0"
-)
-
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.cors_origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Include routers
-app.include_router(conv_router.router)
-app.include_router(msg_router.router)
-app.include_router(search_router.router)
-app.include_router(audio_router.router)
-app.include_router(translate_router.router)
-app.include_router(summarize_router.router)
-app.include_router(websocket_router)
-
-
-@app.on_event("startup")
+from serialization import FastJSONResponse
+
+
 async def startup_event():
-    """Initialize database on startup."""
+    """Initialize database, pub/sub, interrupted summary jobs and the outbox on startup."""
+    from database import init_db
+    from services.outbox import outbox
+    from services.runtime_metrics import loop_monitor
+    from services.summary_job_service import summary_job_service
+    from websocket.handlers import abandon_redelivery, redeliver_message
+    from websocket.manager import manager
+
     init_db()
+    loop_monitor.start()
+    await manager.start()
+    await summary_job_service.resume_jobs()
+    await outbox.start(redeliver_message, abandon_redelivery)
+
+
+async def shutdown_event():
+    """Stop background work and pub/sub, and flush exported spans."""
+    import asyncio
+    from services.openrouter_client import close_http_client
+    from services.outbox import outbox
+    from services.runtime_metrics import loop_monitor
+    from services.summary_job_service import summary_job_service
+    from services.summary_scheduler import summary_scheduler
+    from websocket.manager import manager
+    from websocket.pipeline import message_pipeline
+    from tracing import tracer_provider
+
+    await message_pipeline.shutdown()
+    await outbox.shutdown()
+    await summary_scheduler.shutdown()
+    await summary_job_service.shutdown()
+    await manager.stop()
+    await loop_monitor.stop()
+    await close_http_client()
+    await asyncio.to_thread(tracer_provider.shutdown)
 
 
-@app.get("/health")
 async def health_check():
     """Health check endpoint."""
     return {"status": "ok", "version": "1.0.0"}
 
 
+def create_app() -> FastAPI:
+    """
+    Build the FastAPI application.
+
+    Routers, services and the ORM are imported here rather than when this
+    module is imported, and services create their HTTP clients and storage
+    directories on first use. Optional dependencies (pyarrow, zstandard,
+    msgpack) are only imported by the requests that need them.
+    """
+    from routers import conversations as conv_router
+    from routers import messages as msg_router
+    from routers import search as search_router
+    from routers import audio as audio_router
+    from routers import translate as translate_router
+    from routers import summarize as summarize_router
+    from routers import export as export_router
+    from routers import summary_jobs as summary_jobs_router
+    from websocket.handlers import websocket_router
+    from tracing import TracingMiddleware
+
+    app = FastAPI(
+        title="MedTranslate API",
+        description="Real-time AI-powered healthcare translation",
+        version="1.0.0",
+        default_response_class=FastJSONResponse,
+    )
+
+    # Tracing middleware (added first so CORS wraps it)
+    app.add_middleware(TracingMiddleware)
+
+    # CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.cors_origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Include routers
+    app.include_router(conv_router.router)
+    app.include_router(msg_router.router)
+    app.include_router(search_router.router)
+    app.include_router(audio_router.router)
+    app.include_router(translate_router.router)
+    app.include_router(summarize_router.router)
+    app.include_router(export_router.router)
+    app.include_router(summary_jobs_router.router)
+    app.include_router(websocket_router)
+
+    app.on_event("startup")(startup_event)
+    app.on_event("shutdown")(shutdown_event)
+    app.get("/health")(health_check)
+
+    return app
+
+
+def __getattr__(name: str):
+    """Build main.app (used by uvicorn main:app) on first access."""
+    if name == "app":
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
-
+    uvicorn.run(create_app(), host="0.0.0.0", port=8000, ws_per_message_deflate=settings.ws_per_message_deflate)
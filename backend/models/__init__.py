@@ -1,5 +1,6 @@
 # Models package
 from models.conversation import Conversation
 from models.message import Message
+from models.summary_job import SummaryJob
 
-__all__ = ["Conversation", "Message"]
+__all__ = ["Conversation", "Message", "SummaryJob"]
@@ -16,9 +16,17 @@ class Conversation(Base):
     patient_language = Column(String, default="es", nullable=False)
     status = Column(String, default="active", nullable=False)  # active, completed, archived
     summary = Column(Text, nullable=True)
+    # Watermark of the last message covered by the stored summary
+    summary_message_id = Column(String, nullable=True)
+    summary_watermark_at = Column(DateTime, nullable=True)
 
     # Relationship to messages
-    messages = relationship("Message", back_populates="conversation", cascade="all, delete-orphan")
+    messages = relationship(
+        "Message",
+        back_populates="conversation",
+        cascade="all, delete-orphan",
+        order_by="Message.created_at",
+    )
 
     def __repr__(self):
         return f"<Conversation {self.id} ({self.doctor_language} → {self.patient_language})>"
@@ -1,21 +1,30 @@
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from database import Base
+from datetime import datetime
 import uuid
 
 
 class Message(Base):
     """Message model for storing individual messages in a conversation."""
     __tablename__ = "messages"
+    __table_args__ = (
+        # Serves per-conversation lookups, ordering and the list projection
+        Index("ix_messages_conversation_created", "conversation_id", "created_at"),
+    )
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     conversation_id = Column(String, ForeignKey("conversations.id"), nullable=False)
-    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    # Client-side default keeps sub-second precision for ordering and summary watermarks
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now(), nullable=False)
     role = Column(String, nullable=False)  # 'doctor' or 'patient'
     original_text = Column(Text, nullable=False)
     translated_text = Column(Text, nullable=False)
     audio_url = Column(String, nullable=True)
+    # 'pending' (retried by the outbox) or 'failed' while translated_text is a copy
+    # of original_text; NULL once translated
+    translation_status = Column(String, nullable=True)
 
     # Relationship to conversation
     conversation = relationship("Conversation", back_populates="messages")
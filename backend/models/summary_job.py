@@ -0,0 +1,45 @@
+from sqlalchemy import Column, String, DateTime, Text, Integer
+from sqlalchemy.sql import func
+from database import Base
+from datetime import datetime
+import uuid
+
+
+class SummaryJob(Base):
+    """Bulk summarization job over a filtered set of conversations."""
+    __tablename__ = "summary_jobs"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
+    status = Column(String, default="pending", nullable=False)  # pending, running, completed, cancelled, failed
+    filters = Column(Text, nullable=False, default="{}")  # JSON-encoded SummaryJobCreate
+    total = Column(Integer, default=0, nullable=False)
+    processed = Column(Integer, default=0, nullable=False)
+    failed = Column(Integer, default=0, nullable=False)
+    # Keyset checkpoint: last conversation id of the last completed batch
+    checkpoint_id = Column(String, nullable=True)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    error = Column(Text, nullable=True)
+
+    @property
+    def progress(self) -> float:
+        """Fraction of conversations handled so far."""
+        if not self.total:
+            return 1.0 if self.status == "completed" else 0.0
+        return min(1.0, (self.processed + self.failed) / self.total)
+
+    @property
+    def throughput_per_minute(self):
+        """Conversations handled per minute since the job started."""
+        if self.started_at is None:
+            return None
+        end = self.finished_at or datetime.utcnow()
+        elapsed = (end - self.started_at).total_seconds()
+        if elapsed <= 0:
+            return None
+        return round((self.processed + self.failed) * 60 / elapsed, 2)
+
+    def __repr__(self):
+        return f"<SummaryJob {self.id} ({self.status} {self.processed}/{self.total})>"
@@ -37,3 +37,64 @@ def get_summary_prompt(conversation_text: str) -> List[Dict]:
         {"role": "system", "content": MEDICAL_SUMMARY_SYSTEM},
         {"role": "user", "content": user_prompt},
     ]
+
+
+SUMMARY_UPDATE_PROMPT = """Below is an existing structured medical summary of a doctor-patient conversation, followed by new messages from the same conversation.
+
+Existing summary:
+{previous_summary}
+
+New messages:
+{conversation_text}
+
+Update the summary so it reflects the whole conversation. Keep existing information unless the new messages correct it, and add anything new.
+
+Return the summary as a JSON object with these exact keys:
+- chief_complaint
+- symptoms (array of strings)
+- duration
+- medications (array of strings)
+- allergies (array of strings)
+- follow_up
+
+Return ONLY the JSON object without markdown formatting, code blocks, or any additional text."""
+
+
+def get_summary_update_prompt(previous_summary: str, conversation_text: str) -> List[Dict]:
+    """Build prompt for merging new messages into an existing summary."""
+    user_prompt = SUMMARY_UPDATE_PROMPT.format(
+        previous_summary=previous_summary,
+        conversation_text=conversation_text,
+    )
+
+    return [
+        {"role": "system", "content": MEDICAL_SUMMARY_SYSTEM},
+        {"role": "user", "content": user_prompt},
+    ]
+
+
+SUMMARY_REDUCE_PROMPT = """The following JSON objects are structured medical summaries of consecutive parts of one doctor-patient conversation, in order.
+
+{partial_summaries}
+
+Combine them into a single summary of the whole conversation. Resolve conflicts in favour of later parts, and merge lists without duplicates.
+
+Return the summary as a JSON object with these exact keys:
+- chief_complaint
+- symptoms (array of strings)
+- duration
+- medications (array of strings)
+- allergies (array of strings)
+- follow_up
+
+Return ONLY the JSON object without markdown formatting, code blocks, or any additional text."""
+
+
+def get_summary_reduce_prompt(partial_summaries: str) -> List[Dict]:
+    """Build prompt for combining partial summaries of one conversation."""
+    user_prompt = SUMMARY_REDUCE_PROMPT.format(partial_summaries=partial_summaries)
+
+    return [
+        {"role": "system", "content": MEDICAL_SUMMARY_SYSTEM},
+        {"role": "user", "content": user_prompt},
+    ]
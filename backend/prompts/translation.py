@@ -1,4 +1,4 @@
-from typing import List, Dict
+from typing import List, Dict, Optional, Sequence, Tuple
 
 MEDICAL_TRANSLATION_SYSTEM = """You are a professional medical translator for healthcare conversations between doctors and patients.
 
@@ -21,12 +21,29 @@ LANGUAGE_NAMES = {
 }
 
 
-def get_translation_prompt(source_lang: str, target_lang: str, text: str) -> List[Dict]:
-    """Build translation prompt."""
+def get_translation_prompt(
+    source_lang: str,
+    target_lang: str,
+    text: str,
+    examples: Optional[Sequence[Tuple[str, str]]] = None,
+) -> List[Dict]:
+    """Build translation prompt, with similar past translations as examples."""
     source_name = LANGUAGE_NAMES.get(source_lang, source_lang)
     target_name = LANGUAGE_NAMES.get(target_lang, target_lang)
 
-    user_prompt = f"""Translate the following {source_name} text to {target_name}:
+    reference = ""
+    if examples:
+        pairs = "\n\n".join(
+            f"{source_name}: {original}\n{target_name}: {translated}"
+            for original, translated in examples
+        )
+        reference = f"""Approved translations of similar messages (reuse their wording and terminology):
+
+{pairs}
+
+"""
+
+    user_prompt = f"""{reference}Translate the following {source_name} text to {target_name}:
 
 {text}
 
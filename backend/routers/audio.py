@@ -7,11 +7,10 @@ import shutil
 from datetime import datetime
 from database import get_db
 from config import settings
+from tracing import get_current_span, get_tracer
 
 router = APIRouter(prefix="/api/audio", tags=["audio"])
-
-# Ensure audio directory exists
-os.makedirs(settings.audio_storage_path, exist_ok=True)
+tracer = get_tracer(__name__)
 
 ALLOWED_EXTENSIONS = {"webm", "wav", "mp3", "ogg", "m4a"}
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
@@ -32,10 +31,16 @@ async def upload_audio(file: UploadFile = File(...)):
     audio_id = str(uuid.uuid4())
     filename = f"{audio_id}.{ext}"
     filepath = os.path.join(settings.audio_storage_path, filename)
+    os.makedirs(settings.audio_storage_path, exist_ok=True)
+
+    # Links this request to the WebSocket trace that transcribes the audio
+    span = get_current_span()
+    if span is not None:
+        span.set_attribute("audio.id", audio_id)
 
     # Save file with size validation
     try:
-        with open(filepath, "wb") as buffer:
+        with tracer.start_as_current_span("audio.store"), open(filepath, "wb") as buffer:
             shutil.copyfileobj(file.file, buffer)
             file.file.seek(0, os.SEEK_END)
             size = file.file.tell()
@@ -1,20 +1,29 @@
 from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session, selectinload
 from typing import List
-from database import get_db, init_db
+from database import get_db
 from models.conversation import Conversation
 from models.message import Message
-from schemas.conversation import ConversationCreate, ConversationResponse, ConversationUpdate
+from services.archive_service import archive_service
+from services.conversation_cache import conversation_cache
+from services.summary_scheduler import summary_scheduler
+from schemas.conversation import (
+    ConversationCreate,
+    ConversationListItem,
+    ConversationResponse,
+    ConversationStatus,
+    ConversationUpdate,
+)
 
 router = APIRouter(prefix="/api/conversations", tags=["conversations"])
 
+PREVIEW_LENGTH = 120
+
 
 @router.post("/", response_model=ConversationResponse)
 async def create_conversation(data: ConversationCreate, db: Session = Depends(get_db)):
     """Create a new conversation."""
-    # Ensure tables exist
-    init_db()
-
     conversation = Conversation(
         doctor_language=data.doctor_language.value,
         patient_language=data.patient_language.value,
@@ -26,21 +35,59 @@ async def create_conversation(data: ConversationCreate, db: Session = Depends(ge
     return conversation
 
 
-@router.get("/", response_model=List[ConversationResponse])
+@router.get("/", response_model=List[ConversationListItem])
 async def list_conversations(
     limit: int = 50,
     offset: int = 0,
     db: Session = Depends(get_db),
 ):
-    """List all conversations."""
-    conversations = (
-        db.query(Conversation)
+    """List conversations with message counts and a last-message preview."""
+    # Page the conversations first so the aggregates only touch this page
+    page = (
+        select(Conversation)
         .order_by(Conversation.updated_at.desc())
         .limit(limit)
         .offset(offset)
-        .all()
+        .subquery()
+    )
+
+    stats = (
+        select(
+            Message.conversation_id,
+            func.count(Message.id).label("message_count"),
+            func.max(Message.created_at).label("last_message_at"),
+        )
+        .where(Message.conversation_id.in_(select(page.c.id)))
+        .group_by(Message.conversation_id)
+        .subquery()
+    )
+
+    last_preview = (
+        select(func.substr(Message.original_text, 1, PREVIEW_LENGTH))
+        .where(Message.conversation_id == page.c.id)
+        .order_by(Message.created_at.desc())
+        .limit(1)
+        .correlate(page)
+        .scalar_subquery()
     )
-    return conversations
+
+    rows = db.execute(
+        select(
+            page.c.id,
+            page.c.created_at,
+            page.c.updated_at,
+            page.c.doctor_language,
+            page.c.patient_language,
+            page.c.status,
+            func.coalesce(stats.c.message_count, 0).label("message_count"),
+            stats.c.last_message_at,
+            last_preview.label("last_message_preview"),
+        )
+        .outerjoin(stats, stats.c.conversation_id == page.c.id)
+        .order_by(page.c.updated_at.desc())
+    ).all()
+
+    return [ConversationListItem.model_validate(row._mapping) for row in rows]
 
 
 @router.get("/{conversation_id}", response_model=ConversationResponse)
@@ -48,10 +95,15 @@ async def get_conversation(conversation_id: str, db: Session = Depends(get_db)):
     """Get a conversation by ID with its messages."""
     conversation = (
         db.query(Conversation)
+        .options(selectinload(Conversation.messages))
         .filter(Conversation.id == conversation_id)
         .first()
     )
 
+    if not conversation:
+        # Fall back to the cold tier for archived conversations
+        conversation = archive_service.load_conversation(conversation_id)
+
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
@@ -76,11 +128,21 @@ async def update_conversation(
 
     if updates.status is not None:
         conversation.status = updates.status.value
+    if updates.doctor_language is not None:
+        conversation.doctor_language = updates.doctor_language.value
+    if updates.patient_language is not None:
+        conversation.patient_language = updates.patient_language.value
     if updates.summary is not None:
         conversation.summary = updates.summary.model_dump_json()
 
     db.commit()
     db.refresh(conversation)
+    await conversation_cache.invalidate(conversation_id)
+
+    # Have the summary ready by the time someone asks for it
+    if updates.status == ConversationStatus.COMPLETED:
+        summary_scheduler.schedule_now(conversation_id)
+
     return conversation
 
 
@@ -98,4 +160,5 @@ async def delete_conversation(conversation_id: str, db: Session = Depends(get_db
 
     db.delete(conversation)
     db.commit()
+    await conversation_cache.invalidate(conversation_id)
     return {"message": "Conversation deleted"}
@@ -0,0 +1,167 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from datetime import datetime
+from enum import Enum
+from typing import Iterator, List, Optional
+import csv
+import io
+from database import SessionLocal
+from models.conversation import Conversation
+from models.message import Message
+from schemas.conversation import ConversationStatus
+from serialization import dumps_bytes
+
+router = APIRouter(prefix="/api/export", tags=["export"])
+
+EXPORT_BATCH_SIZE = 1000
+
+# One row per message; conversations without messages get a single row with empty message fields
+EXPORT_COLUMNS = [
+    Conversation.id.label("conversation_id"),
+    Conversation.doctor_language,
+    Conversation.patient_language,
+    Conversation.status,
+    Conversation.created_at.label("conversation_created_at"),
+    Conversation.updated_at.label("conversation_updated_at"),
+    Message.id.label("message_id"),
+    Message.role,
+    Message.original_text,
+    Message.translated_text,
+    Message.audio_url,
+    Message.created_at.label("message_created_at"),
+]
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS]
+
+
+class ExportFormat(str, Enum):
+    """Supported export formats."""
+    NDJSON = "ndjson"
+    CSV = "csv"
+    PARQUET = "parquet"
+
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.PARQUET: "application/vnd.apache.parquet",
+}
+
+
+def _iter_batches(
+    status: Optional[ConversationStatus],
+    created_after: Optional[datetime],
+    created_before: Optional[datetime],
+) -> Iterator[List[dict]]:
+    """Yield export rows in batches from a server-side cursor."""
+    query = (
+        select(*EXPORT_COLUMNS)
+        .outerjoin(Message, Message.conversation_id == Conversation.id)
+        .order_by(Conversation.created_at.asc(), Conversation.id.asc(), Message.created_at.asc())
+    )
+    if status is not None:
+        query = query.where(Conversation.status == status.value)
+    if created_after is not None:
+        query = query.where(Conversation.created_at >= created_after)
+    if created_before is not None:
+        query = query.where(Conversation.created_at < created_before)
+
+    # The session outlives the request handler, so it is owned by the stream
+    db = SessionLocal()
+    try:
+        result = db.execute(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        for partition in result.partitions():
+            yield [dict(row._mapping) for row in partition]
+    finally:
+        db.close()
+
+
+def _stream_ndjson(batches: Iterator[List[dict]]) -> Iterator[bytes]:
+    for rows in batches:
+        yield b"".join(dumps_bytes(row) + b"\n" for row in rows)
+
+
+def _stream_csv(batches: Iterator[List[dict]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+    for rows in batches:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands written bytes back to the stream."""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def _stream_parquet(batches: Iterator[List[dict]]) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        (field, pa.timestamp("us") if field.endswith("_at") else pa.string())
+        for field in EXPORT_FIELDS
+    ])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        # Each batch becomes one row group, flushed as soon as it is written
+        for rows in batches:
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+@router.get("/")
+def export_conversations(
+    format: ExportFormat = ExportFormat.NDJSON,
+    status: Optional[ConversationStatus] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+):
+    """Stream conversations and their messages as NDJSON, CSV or Parquet."""
+    if format == ExportFormat.PARQUET:
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise HTTPException(status_code=400, detail="Parquet export requires the 'pyarrow' package")
+
+    batches = _iter_batches(status, created_after, created_before)
+    encoders = {
+        ExportFormat.NDJSON: _stream_ndjson,
+        ExportFormat.CSV: _stream_csv,
+        ExportFormat.PARQUET: _stream_parquet,
+    }
+    filename = f"conversations-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}.{format.value}"
+
+    return StreamingResponse(
+        encoders[format](batches),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
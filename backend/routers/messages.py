@@ -5,8 +5,10 @@ from database import get_db
 from models.conversation import Conversation
 from models.message import Message
 from schemas.message import MessageCreate, MessageResponse
+from tracing import get_current_span, get_tracer
 
 router = APIRouter(prefix="/api/messages", tags=["messages"])
+tracer = get_tracer(__name__)
 
 
 @router.post("/", response_model=MessageResponse)
@@ -34,8 +36,13 @@ async def create_message(data: MessageCreate, db: Session = Depends(get_db)):
     # Update conversation timestamp
     conversation.updated_at = message.created_at
 
-    db.commit()
-    db.refresh(message)
+    with tracer.start_as_current_span("db.insert"):
+        db.commit()
+        db.refresh(message)
+
+    span = get_current_span()
+    if span is not None:
+        span.set_attribute("message.id", message.id)
     return message
 
 
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from typing import List
 from database import get_db
 from models.message import Message
+from services.archive_service import archive_service, like_pattern
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/api/search", tags=["search"])
@@ -18,65 +19,103 @@ class SearchResult(BaseModel):
     created_at: str
 
 
+def _build_result(
+    message_id: str,
+    conversation_id: str,
+    original_text: str,
+    translated_text: str,
+    role: str,
+    created_at: str,
+    q: str,
+) -> SearchResult:
+    """Build a search result with snippet and highlighted match."""
+    query_lower = q.lower()
+
+    # Find matching text
+    if query_lower in original_text.lower():
+        match_text = original_text
+    else:
+        match_text = translated_text
+
+    # Create snippet (context around match)
+    words = match_text.split()
+    snippet_words = []
+    for i, word in enumerate(words):
+        if query_lower in word.lower():
+            start = max(0, i - 3)
+            end = min(len(words), i + 4)
+            snippet_words = words[start:end]
+            break
+
+    snippet = "..." + " ".join(snippet_words) + "..."
+
+    # Highlight matches
+    highlighted = match_text.replace(
+        q, f"<mark>{q}</mark>"
+    ).replace(
+        q.capitalize(), f"<mark>{q.capitalize()}</mark>"
+    ).replace(
+        q.lower(), f"<mark>{q.lower()}</mark>"
+    ).replace(
+        q.upper(), f"<mark>{q.upper()}</mark>"
+    )
+
+    return SearchResult(
+        message_id=message_id,
+        conversation_id=conversation_id,
+        snippet=snippet,
+        highlighted_text=highlighted,
+        role=role,
+        created_at=created_at,
+    )
+
+
 @router.get("/", response_model=List[SearchResult])
-async def search_messages(q: str, db: Session = Depends(get_db)):
-    """Search across all message texts."""
+async def search_messages(
+    q: str,
+    include_archived: bool = False,
+    db: Session = Depends(get_db),
+):
+    """Search across all message texts, optionally including archived ones."""
     if not q or len(q.strip()) < 2:
         return []
 
-    query_lower = q.lower()
-
-    # Search in both original and translated text
+    # Search in both original and translated text; % and _ in q are literal
+    pattern = like_pattern(q)
     messages = (
         db.query(Message)
         .filter(
-            (Message.original_text.ilike(f"%{q}%")) |
-            (Message.translated_text.ilike(f"%{q}%"))
+            (Message.original_text.ilike(pattern, escape="\\")) |
+            (Message.translated_text.ilike(pattern, escape="\\"))
         )
         .order_by(Message.created_at.desc())
         .limit(50)
         .all()
     )
 
-    results = []
-    for msg in messages:
-        # Find matching text
-        text = msg.original_text
-        if query_lower in text.lower():
-            match_text = text
-        else:
-            match_text = msg.translated_text
-
-        # Create snippet (context around match)
-        words = match_text.split()
-        snippet_words = []
-        for i, word in enumerate(words):
-            if q.lower() in word.lower():
-                start = max(0, i - 3)
-                end = min(len(words), i + 4)
-                snippet_words = words[start:end]
-                break
-
-        snippet = "..." + " ".join(snippet_words) + "..."
-
-        # Highlight matches
-        highlighted = match_text.replace(
-            q, f"<mark>{q}</mark>"
-        ).replace(
-            q.capitalize(), f"<mark>{q.capitalize()}</mark>"
-        ).replace(
-            q.lower(), f"<mark>{q.lower()}</mark>"
-        ).replace(
-            q.upper(), f"<mark>{q.upper()}</mark>"
+    results = [
+        _build_result(
+            msg.id,
+            msg.conversation_id,
+            msg.original_text,
+            msg.translated_text,
+            msg.role,
+            msg.created_at.isoformat(),
+            q,
         )
+        for msg in messages
+    ]
 
-        results.append(SearchResult(
-            message_id=msg.id,
-            conversation_id=msg.conversation_id,
-            snippet=snippet,
-            highlighted_text=highlighted,
-            role=msg.role,
-            created_at=msg.created_at.isoformat(),
-        ))
+    if include_archived and len(results) < 50:
+        for row in archive_service.search_messages(q, limit=50 - len(results)):
+            results.append(_build_result(
+                row["message_id"],
+                row["conversation_id"],
+                row["original_text"],
+                row["translated_text"],
+                row["role"],
+                row["created_at"] or "",
+                q,
+            ))
 
     return results
@@ -0,0 +1,54 @@
+from fastapi import APIRouter, HTTPException, Depends
+from sqlalchemy.orm import Session
+from typing import List
+from database import get_db
+from models.summary_job import SummaryJob
+from schemas.summary_job import SummaryJobCreate, SummaryJobResponse
+from services.summary_job_service import summary_job_service
+
+router = APIRouter(prefix="/api/summaries/jobs", tags=["summary jobs"])
+
+
+@router.post("/", response_model=SummaryJobResponse)
+async def create_job(filters: SummaryJobCreate, db: Session = Depends(get_db)):
+    """Start summarizing every conversation matching the filters."""
+    return await summary_job_service.create_job(db, filters)
+
+
+@router.get("/", response_model=List[SummaryJobResponse])
+async def list_jobs(
+    limit: int = 50,
+    offset: int = 0,
+    db: Session = Depends(get_db),
+):
+    """List summary jobs, newest first."""
+    jobs = (
+        db.query(SummaryJob)
+        .order_by(SummaryJob.created_at.desc())
+        .limit(limit)
+        .offset(offset)
+        .all()
+    )
+    return jobs
+
+
+@router.get("/{job_id}", response_model=SummaryJobResponse)
+async def get_job(job_id: str, db: Session = Depends(get_db)):
+    """Get job status, progress and throughput."""
+    job = db.get(SummaryJob, job_id)
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Summary job not found")
+
+    return job
+
+
+@router.post("/{job_id}/cancel", response_model=SummaryJobResponse)
+async def cancel_job(job_id: str, db: Session = Depends(get_db)):
+    """Cancel a pending or running job."""
+    job = await summary_job_service.cancel_job(db, job_id)
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Summary job not found")
+
+    return job
@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 from pydantic import BaseModel
+from typing import Optional
 from services.translation_service import translation_service
 
 router = APIRouter(prefix="/api/translate", tags=["translate"])
@@ -18,14 +19,26 @@ class TranslateResponse(BaseModel):
     translated_text: str
     source_language: str
     target_language: str
+    # 'failed' when translation failed and translated_text is a copy of original_text
+    translation_status: Optional[str] = None
 
 
 @router.post("/", response_model=TranslateResponse)
 async def translate(request: TranslateRequest):
     """Translate text from source language to target language."""
-    result = await translation_service.translate(
-        text=request.text,
-        source_language=request.source_language,
-        target_language=request.target_language,
-    )
-    return result
+    try:
+        return await translation_service.translate(
+            text=request.text,
+            source_language=request.source_language,
+            target_language=request.target_language,
+            fallback=False,
+        )
+    except Exception:
+        # Logged by the translation service; nothing retries a one-off request
+        return {
+            "original_text": request.text,
+            "translated_text": request.text,
+            "source_language": request.source_language,
+            "target_language": request.target_language,
+            "translation_status": "failed",
+        }
@@ -50,6 +50,8 @@ class ConversationCreate(ConversationBase):
 class ConversationUpdate(BaseModel):
     """Schema for updating a conversation."""
     status: Optional[ConversationStatus] = None
+    doctor_language: Optional[Language] = None
+    patient_language: Optional[Language] = None
     summary: Optional[MedicalSummary] = None
 
 
@@ -76,6 +78,20 @@ class ConversationResponse(ConversationBase):
         from_attributes = True
 
 
+class ConversationListItem(ConversationBase):
+    """Lightweight conversation projection for list views."""
+    id: str
+    created_at: datetime
+    updated_at: datetime
+    status: ConversationStatus
+    message_count: int = 0
+    last_message_preview: Optional[str] = None
+    last_message_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
 # Forward reference resolution
 def update_forward_refs():
     from schemas.message import MessageResponse
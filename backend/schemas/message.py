@@ -23,6 +23,7 @@ class MessageResponse(MessageBase):
     conversation_id: str
     created_at: datetime
     audio_url: Optional[str] = None
+    translation_status: Optional[str] = None  # 'pending' or 'failed' while untranslated
 
     class Config:
         from_attributes = True
@@ -0,0 +1,50 @@
+from pydantic import BaseModel, field_validator
+from datetime import datetime
+from typing import Optional
+from enum import Enum
+import json
+from schemas.conversation import ConversationStatus
+
+
+class SummaryJobStatus(str, Enum):
+    """Summary job status."""
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    CANCELLED = "cancelled"
+    FAILED = "failed"
+
+
+class SummaryJobCreate(BaseModel):
+    """Filters selecting the conversations to summarize."""
+    status: Optional[ConversationStatus] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    only_missing: bool = False  # Skip conversations that already have a summary
+    limit: Optional[int] = None
+
+
+class SummaryJobResponse(BaseModel):
+    """Schema for summary job response."""
+    id: str
+    status: SummaryJobStatus
+    filters: SummaryJobCreate
+    total: int
+    processed: int
+    failed: int
+    progress: float = 0.0
+    throughput_per_minute: Optional[float] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+
+    @field_validator('filters', mode='before')
+    @classmethod
+    def parse_filters(cls, v):
+        if isinstance(v, str):
+            return json.loads(v)
+        return v
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,49 @@
+"""Move old inactive conversations into the compressed cold tier.
+
+Usage (from the backend directory):
+    python -m scripts.archive_conversations --older-than-days 30
+"""
+import argparse
+import logging
+
+from config import settings
+from database import SessionLocal, init_db
+from services.archive_service import ARCHIVABLE_STATUSES, archive_service
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive inactive conversations")
+    parser.add_argument(
+        "--older-than-days",
+        type=int,
+        default=settings.archive_after_days,
+        help="Archive conversations not updated for this many days",
+    )
+    parser.add_argument(
+        "--status",
+        action="append",
+        choices=ARCHIVABLE_STATUSES,
+        help="Status to archive (repeatable, defaults to completed and archived)",
+    )
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    init_db()
+
+    db = SessionLocal()
+    try:
+        stats = archive_service.archive_conversations(
+            db,
+            older_than_days=args.older_than_days,
+            statuses=args.status or ARCHIVABLE_STATUSES,
+            batch_size=args.batch_size,
+        )
+    finally:
+        db.close()
+
+    print(f"Archived {stats['conversations']} conversations ({stats['messages']} messages)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Micro-benchmark for WebSocket broadcast fan-out.
+
+Compares encoding a frame once per recipient (what send_json does) with the
+manager's encode-once path, for rooms of increasing size. Sockets are fakes,
+so the numbers are CPU cost per broadcast on the event loop, not network time.
+
+Usage (from the backend directory):
+    python -m scripts.bench_broadcast --rooms 2 10 100 1000 --broadcasts 200
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime
+
+from websocket.manager import ConnectionManager
+from websocket.pubsub import InMemoryHub, InMemoryPubSub
+
+
+class FakeWebSocket:
+    """Accepts frames instantly and counts them."""
+
+    def __init__(self):
+        self.scope = {}
+        self.frames = 0
+
+    async def accept(self, subprotocol=None):
+        pass
+
+    async def send_text(self, data: str):
+        self.frames += 1
+
+    async def send_json(self, data: dict):
+        # Same work as Starlette's WebSocket.send_json
+        json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+        self.frames += 1
+
+    async def close(self, code: int = 1000, reason=None):
+        pass
+
+
+def sample_message() -> dict:
+    return {
+        "type": "new_message",
+        "message": {
+            "id": str(uuid.uuid4()),
+            "conversation_id": str(uuid.uuid4()),
+            "role": "doctor",
+            "original_text": "How long have you had the chest pain, and does it spread to your arm?",
+            "translated_text": "¿Desde cuándo tiene el dolor de pecho y se extiende a su brazo?",
+            "original_language": "en",
+            "translated_language": "es",
+            "audio_url": None,
+            "created_at": datetime.utcnow().isoformat(),
+        },
+    }
+
+
+async def bench_per_recipient(sockets, message: dict, broadcasts: int) -> float:
+    started = time.perf_counter()
+    for _ in range(broadcasts):
+        for websocket in sockets:
+            await websocket.send_json(message)
+    return time.perf_counter() - started
+
+
+async def bench_encode_once(room_size: int, message: dict, broadcasts: int) -> float:
+    manager = ConnectionManager(pubsub=InMemoryPubSub(InMemoryHub()))
+    manager.max_connections_per_conversation = room_size
+    await manager.start()
+    conversation_id = message["message"]["conversation_id"]
+    sockets = [FakeWebSocket() for _ in range(room_size)]
+    for websocket in sockets:
+        await manager.connect(websocket, conversation_id)
+    # Let the writer tasks start
+    await asyncio.sleep(0)
+
+    started = time.perf_counter()
+    for _ in range(broadcasts):
+        await manager.broadcast(conversation_id, message)
+        # Drain the queues so they never hit the slow-consumer limit
+        while any(connection.depth for connection in manager.connections.values()):
+            await asyncio.sleep(0)
+    elapsed = time.perf_counter() - started
+
+    for websocket in sockets:
+        manager.disconnect(websocket)
+    await manager.stop()
+    return elapsed
+
+
+async def run(rooms, broadcasts: int):
+    message = sample_message()
+    print(f"{'room':>6} {'per-recipient ms':>18} {'encode-once ms':>16} {'speedup':>8}")
+    for room_size in rooms:
+        baseline = await bench_per_recipient(
+            [FakeWebSocket() for _ in range(room_size)], message, broadcasts
+        )
+        encoded = await bench_encode_once(room_size, message, broadcasts)
+        print(
+            f"{room_size:>6} {baseline / broadcasts * 1000:>18.3f} "
+            f"{encoded / broadcasts * 1000:>16.3f} {baseline / encoded:>7.1f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark WebSocket broadcast fan-out")
+    parser.add_argument("--rooms", type=int, nargs="+", default=[2, 10, 100, 1000])
+    parser.add_argument("--broadcasts", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.rooms, args.broadcasts))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Measure cold-start time: importing the app, building it and running startup.
+
+Each run starts a fresh interpreter with ``-X importtime`` on a temporary
+database, so nothing is cached between runs. Reports median phase timings
+and the modules with the largest cumulative import time, grouped by
+top-level package or by module.
+
+Usage (from the backend directory):
+    python -m scripts.bench_startup --runs 5 --top 15
+    python -m scripts.bench_startup --by-module --top 30
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in the child interpreter; prints phase timings as JSON
+CHILD = """
+import asyncio, json, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+app = main.create_app()
+built = time.perf_counter()
+
+async def start_and_stop():
+    async with app.router.lifespan_context(app):
+        ready = time.perf_counter()
+    return ready
+
+ready = asyncio.run(start_and_stop())
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "create_app_ms": (built - imported) * 1000,
+    "startup_ms": (ready - built) * 1000,
+}))
+"""
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """(module, depth, cumulative microseconds) for each -X importtime line."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, _, rest = line.partition(":")
+        _, cumulative, name = rest.split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules.append((name.strip(), depth, int(cumulative)))
+    return modules
+
+
+def run_once(data_dir: str) -> Tuple[Dict[str, float], List[Tuple[str, int, int]]]:
+    env = dict(os.environ)
+    env.update(
+        DATABASE_URL=f"sqlite:///{os.path.join(data_dir, 'startup.db')}",
+        AUDIO_STORAGE_PATH=os.path.join(data_dir, "audio"),
+        OUTBOX_PATH=os.path.join(data_dir, "outbox.db"),
+        AUTO_SUMMARY_ENABLED="false",
+        PYTHONWARNINGS="ignore",
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        errors = [line for line in result.stderr.splitlines() if not line.startswith("import time:")]
+        raise RuntimeError("App failed to start:\n" + "\n".join(errors[-20:]))
+    phases = json.loads(result.stdout.strip().splitlines()[-1])
+    return phases, parse_importtime(result.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure backend cold-start time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--by-module", action="store_true",
+                        help="Report individual modules instead of top-level packages")
+    args = parser.parse_args()
+
+    phase_samples: Dict[str, List[float]] = defaultdict(list)
+    import_samples: Dict[str, List[int]] = defaultdict(list)
+
+    for _ in range(args.runs):
+        # A fresh database each run, as on a new deployment
+        with tempfile.TemporaryDirectory() as data_dir:
+            phases, modules = run_once(data_dir)
+        for phase, ms in phases.items():
+            phase_samples[phase].append(ms)
+
+        totals: Dict[str, int] = defaultdict(int)
+        for name, depth, cumulative in modules:
+            if args.by_module:
+                totals[name] = max(totals[name], cumulative)
+            elif depth == 1:
+                # Only outermost imports, so nested time is not counted twice
+                totals[name.split(".")[0]] += cumulative
+        for name, cumulative in totals.items():
+            import_samples[name].append(cumulative)
+
+    print(f"Median over {args.runs} runs:")
+    for phase, samples in phase_samples.items():
+        print(f"  {phase:<14} {statistics.median(samples):8.1f}")
+    total = sum(statistics.median(samples) for samples in phase_samples.values())
+    print(f"  {'total_ms':<14} {total:8.1f}")
+
+    label = "module" if args.by_module else "package"
+    print(f"\nSlowest imports by {label} (median cumulative ms):")
+    ranked = sorted(
+        ((statistics.median(samples) / 1000, name) for name, samples in import_samples.items()),
+        reverse=True,
+    )
+    for ms, name in ranked[:args.top]:
+        print(f"  {ms:8.1f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Benchmark WebSocket wire formats: JSON text vs MessagePack binary.
+
+Reports bytes per frame (raw and with permessage-deflate) and encode/decode
+CPU per frame for typical frames. Message texts come from the seed_database
+phrase banks, one language pair per simulated connection. permessage-deflate
+is simulated with raw deflate, both with context takeover (one stream per
+connection, so later frames can refer back to earlier ones) and without it
+(each frame compressed on its own, as when a client negotiates
+no_context_takeover).
+
+Usage (from the backend directory):
+    python -m scripts.bench_ws_encoding --iterations 20000
+"""
+import argparse
+import json
+import random
+import time
+import zlib
+from datetime import timedelta
+from typing import Callable, Dict, List
+
+from scripts.seed_database import (
+    BASE_TIME, DOCTOR_PHRASES, LANGUAGES, PATIENT_PHRASES, _build_text, _uuid,
+)
+from serialization import dumps, get_msgpack, loads, msgpack_dumps, msgpack_loads
+
+
+def sample_frames(
+    rng: random.Random, connections: int, frames_per_connection: int
+) -> Dict[str, List[List[dict]]]:
+    """Frames of each type, as one list per connection."""
+    frames: Dict[str, List[List[dict]]] = {"new_message": [], "message_pending": [], "typing": []}
+    for _ in range(connections):
+        conversation_id = _uuid(rng)
+        doctor_language, patient_language = rng.sample(LANGUAGES, 2)
+        created_at = BASE_TIME + timedelta(seconds=rng.randrange(10 ** 7))
+        messages, pending, typing = [], [], []
+        for seq in range(1, frames_per_connection + 1):
+            role = "doctor" if seq % 2 else "patient"
+            if role == "doctor":
+                original, translated = _build_text(rng, DOCTOR_PHRASES, doctor_language, patient_language)
+            else:
+                original, translated = _build_text(rng, PATIENT_PHRASES, patient_language, doctor_language)
+            created_at += timedelta(seconds=rng.uniform(5, 90))
+            messages.append({
+                "type": "new_message",
+                "seq": seq,
+                "data": {
+                    "id": _uuid(rng),
+                    "conversation_id": conversation_id,
+                    "role": role,
+                    "original_text": original,
+                    "translated_text": translated,
+                    "audio_url": None,
+                    "translation_status": None,
+                    "created_at": created_at.isoformat(),
+                },
+            })
+            pending.append({
+                "type": "message_pending",
+                "seq": seq,
+                "data": {
+                    "client_id": _uuid(rng),
+                    "conversation_id": conversation_id,
+                    "role": role,
+                    "original_text": original,
+                    "audio_url": None,
+                    "created_at": created_at.isoformat(),
+                },
+            })
+            typing.append({"type": "typing", "data": {"role": role, "is_typing": bool(seq % 2)}})
+        frames["new_message"].append(messages)
+        frames["message_pending"].append(pending)
+        frames["typing"].append(typing)
+    return frames
+
+
+def deflated_size(connections: List[List[bytes]]) -> float:
+    """Average compressed size per frame, one deflate stream per connection (context takeover)."""
+    total = count = 0
+    for payloads in connections:
+        compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+        for payload in payloads:
+            data = compressor.compress(payload) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            total += len(data) - 4  # Trailing 00 00 ff ff is stripped on the wire
+            count += 1
+    return total / count
+
+
+def deflated_size_no_context(connections: List[List[bytes]]) -> float:
+    """Average compressed size per frame, each frame compressed on its own (no_context_takeover)."""
+    sizes = []
+    for payloads in connections:
+        for payload in payloads:
+            compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+            data = compressor.compress(payload) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            sizes.append(len(data) - 4)
+    return sum(sizes) / len(sizes)
+
+
+def per_frame_us(func: Callable, items: list, iterations: int) -> float:
+    started = time.perf_counter()
+    count = 0
+    while count < iterations:
+        for item in items:
+            func(item)
+        count += len(items)
+    return (time.perf_counter() - started) / count * 1e6
+
+
+def run(iterations: int, connections: int, frames_per_connection: int, seed: int):
+    codecs = {
+        "json (orjson)": (lambda m: dumps(m).encode("utf-8"), loads),
+        "json (stdlib)": (
+            lambda m: json.dumps(m, separators=(",", ":"), ensure_ascii=False).encode("utf-8"),
+            json.loads,
+        ),
+    }
+    if get_msgpack() is not None:
+        codecs["msgpack"] = (msgpack_dumps, msgpack_loads)
+    else:
+        print("msgpack is not installed; only JSON is measured\n")
+
+    print(f"{connections} connections x {frames_per_connection} frames, seed {seed}")
+    print(
+        f"{'frame':<16} {'codec':<14} {'bytes':>7} {'deflate':>8} {'no ctx':>7} "
+        f"{'enc us':>8} {'dec us':>8}"
+    )
+    rng = random.Random(seed)
+    for frame_type, per_connection in sample_frames(rng, connections, frames_per_connection).items():
+        frames = [frame for connection in per_connection for frame in connection]
+        for name, (encode, decode) in codecs.items():
+            payloads = [[encode(frame) for frame in connection] for connection in per_connection]
+            flat = [payload for connection in payloads for payload in connection]
+            raw = sum(len(p) for p in flat) / len(flat)
+            print(
+                f"{frame_type:<16} {name:<14} {raw:>7.0f} {deflated_size(payloads):>8.0f} "
+                f"{deflated_size_no_context(payloads):>7.0f} "
+                f"{per_frame_us(encode, frames, iterations):>8.2f} "
+                f"{per_frame_us(decode, flat, iterations):>8.2f}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark WebSocket wire formats")
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--connections", type=int, default=20)
+    parser.add_argument("--frames-per-connection", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    run(args.iterations, args.connections, args.frames_per_connection, args.seed)
+
+
+if __name__ == "__main__":
+    main()
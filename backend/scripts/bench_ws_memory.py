@@ -0,0 +1,117 @@
+"""Measure per-connection memory in ConnectionManager and check it stays flat.
+
+Opens a batch of fake connections to measure bytes per socket, then churns
+connections (connect, broadcast, heartbeat sweep, disconnect) for many
+rounds, reporting traced Python memory and RSS after each group of rounds.
+Memory that keeps growing across rounds indicates a leak.
+
+Usage (from the backend directory):
+    python -m scripts.bench_ws_memory --connections 2000 --rounds 50
+"""
+import argparse
+import asyncio
+import gc
+import os
+import tracemalloc
+import uuid
+
+from websocket.manager import ConnectionManager
+from websocket.pubsub import InMemoryHub, InMemoryPubSub
+
+
+class FakeWebSocket:
+    """Accepts frames instantly."""
+
+    def __init__(self):
+        self.scope = {}
+
+    async def accept(self, subprotocol=None):
+        pass
+
+    async def send_text(self, data: str):
+        pass
+
+    async def send_bytes(self, data: bytes):
+        pass
+
+    async def close(self, code: int = 1000, reason=None):
+        pass
+
+
+def rss_bytes() -> int:
+    """Current resident set size (Linux), or 0 if unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+def traced() -> int:
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+async def open_room(manager: ConnectionManager, size: int):
+    conversation_id = str(uuid.uuid4())
+    sockets = [FakeWebSocket() for _ in range(size)]
+    for websocket in sockets:
+        await manager.connect(websocket, conversation_id)
+    return conversation_id, sockets
+
+
+async def run(connections: int, room_size: int, rounds: int, report_every: int):
+    manager = ConnectionManager(pubsub=InMemoryPubSub(InMemoryHub()))
+    manager.max_connections = connections * 2
+    # Keep resume buffers from dominating the churn numbers
+    manager.resume_max_conversations = 100
+    tracemalloc.start()
+
+    baseline = traced()
+    rooms = [await open_room(manager, room_size) for _ in range(connections // room_size)]
+    await asyncio.sleep(0)
+    opened = traced()
+    print(f"{len(manager.connections)} connections: "
+          f"{(opened - baseline) / len(manager.connections):.0f} bytes/connection (traced)")
+
+    for _, sockets in rooms:
+        for websocket in sockets:
+            manager.disconnect(websocket)
+    rooms.clear()
+    await asyncio.sleep(0)
+
+    print(f"{'round':>6} {'connections':>12} {'traced KB':>10} {'RSS MB':>8}")
+    for round_number in range(1, rounds + 1):
+        rooms = [await open_room(manager, room_size) for _ in range(connections // room_size)]
+        for seq, (conversation_id, _) in enumerate(rooms, start=1):
+            await manager.broadcast(conversation_id, {
+                "type": "new_message",
+                "seq": manager.next_seq(conversation_id),
+                "data": {"original_text": "How are you feeling today?", "translated_text": "¿Cómo se siente hoy?"},
+            })
+        manager.sweep()
+        await asyncio.sleep(0)
+        for _, sockets in rooms:
+            for websocket in sockets:
+                manager.disconnect(websocket)
+        await asyncio.sleep(0)
+
+        if round_number % report_every == 0 or round_number == 1:
+            print(f"{round_number:>6} {len(manager.connections):>12} "
+                  f"{traced() / 1024:>10.0f} {rss_bytes() / 1024 / 1024:>8.1f}")
+
+    tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure WebSocket connection memory")
+    parser.add_argument("--connections", type=int, default=2000)
+    parser.add_argument("--room-size", type=int, default=2)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--report-every", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(run(args.connections, args.room_size, args.rounds, args.report_every))
+
+
+if __name__ == "__main__":
+    main()
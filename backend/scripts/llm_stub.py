@@ -0,0 +1,95 @@
+"""Local stand-in for the OpenRouter chat completions API.
+
+Answers translation prompts with a tagged echo of the text and audio
+transcription requests with a fixed clinical sentence, after a simulated
+latency. Point the backend at it with OPENROUTER_BASE_URL for load tests
+that should not hit (or pay for) the real API.
+
+Usage (from the backend directory):
+    python -m scripts.llm_stub --port 8081 --latency-ms 400
+    OPENROUTER_BASE_URL=http://127.0.0.1:8081 uvicorn main:app
+"""
+import argparse
+import asyncio
+import math
+import random
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+TRANSCRIPT = "The pain started two days ago and gets worse when I climb stairs."
+
+# Set from the command line before the server starts
+stub_config = {
+    "latency_ms": 400.0,  # median
+    "sigma": 0.5,         # lognormal spread
+    "error_rate": 0.0,    # fraction of requests answered with 503
+}
+
+app = FastAPI(title="LLM stub")
+
+
+def _latency() -> float:
+    median = stub_config["latency_ms"] / 1000
+    if median <= 0:
+        return 0.0
+    return random.lognormvariate(math.log(median), stub_config["sigma"])
+
+
+def _reply_for(content) -> str:
+    # Multimodal content (a list of parts) is an audio transcription request
+    if isinstance(content, list):
+        return TRANSCRIPT
+    lines = [line for line in str(content).strip().splitlines() if line.strip()]
+    text = lines[-1] if lines else ""
+    return f"[stub] {text[:500]}"
+
+
+@app.post("/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    await asyncio.sleep(_latency())
+
+    if random.random() < stub_config["error_rate"]:
+        return JSONResponse({"error": {"message": "Stub overloaded"}}, status_code=503)
+
+    messages = body.get("messages") or [{}]
+    reply = _reply_for(messages[-1].get("content", ""))
+    return {
+        "id": f"stub-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "stub"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": reply},
+            "finish_reason": "stop",
+        }],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    }
+
+
+@app.get("/models")
+async def models():
+    return {"data": [{"id": "stub"}]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local OpenRouter-compatible LLM stub")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=400.0, help="Median response latency")
+    parser.add_argument("--sigma", type=float, default=0.5, help="Lognormal latency spread")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    stub_config.update(latency_ms=args.latency_ms, sigma=args.sigma, error_rate=args.error_rate)
+
+    import uvicorn
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
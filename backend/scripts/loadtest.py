@@ -0,0 +1,338 @@
+"""WebSocket load test: doctor/patient pairs replaying clinical dialogues.
+
+Each pair creates a conversation, connects a doctor and a patient socket to
+/ws/{conversation_id} and replays a scripted dialogue: a burst of typing
+events, then the message (text, or an uploaded audio clip) sent with a
+client_id. Latency is measured from sending to the other participant
+receiving message_pending and message_translated. Server event-loop lag
+and RSS are sampled from /api/ws/metrics during the run.
+
+Usage (from the backend directory):
+    # Against a running backend (ideally started with OPENROUTER_BASE_URL
+    # pointing at scripts.llm_stub)
+    python -m scripts.loadtest --url http://127.0.0.1:8000 --pairs 500
+
+    # Start the LLM stub and a backend on a temporary database, then run
+    python -m scripts.loadtest --spawn --pairs 1000 --latency-ms 400
+
+Thousands of pairs need a raised open-file limit (ulimit -n) on both sides.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import httpx
+
+try:
+    import websockets
+except ImportError:  # pragma: no cover - installed with uvicorn[standard]
+    websockets = None
+
+# (role, text, is_audio)
+DIALOGUE = [
+    ("doctor", "Good morning, what brings you in today?", False),
+    ("patient", "I have had chest pain since yesterday evening.", False),
+    ("doctor", "Does the pain spread to your arm, neck or jaw?", False),
+    ("patient", None, True),
+    ("doctor", "Are you taking any medication at the moment?", False),
+    ("patient", "Only aspirin, one tablet a day.", False),
+    ("doctor", "Any allergies to medications?", False),
+    ("patient", "I am allergic to penicillin.", False),
+    ("doctor", "We will run an ECG and some blood tests now.", False),
+    ("patient", "Thank you, doctor.", False),
+]
+
+# Smallest valid-looking WebM header; the LLM stub does not decode audio
+FAKE_AUDIO = b"\x1a\x45\xdf\xa3" + b"\x00" * 512
+
+
+@dataclass
+class Stats:
+    """Counters and samples shared by all pairs."""
+    pending_latencies: List[float] = field(default_factory=list)
+    final_latencies: List[float] = field(default_factory=list)
+    messages_sent: int = 0
+    messages_completed: int = 0
+    timeouts: int = 0
+    frames_received: int = 0
+    connect_failures: int = 0
+    errors: int = 0
+    server_lag_p99_ms: List[float] = field(default_factory=list)
+    server_lag_max_ms: float = 0.0
+    server_rss_max: int = 0
+
+
+class Participant:
+    """One side of a pair: a socket and a reader task."""
+
+    def __init__(self, role: str, websocket, stats: Stats, waiting: Dict[str, dict]):
+        self.role = role
+        self.websocket = websocket
+        self.stats = stats
+        # client_id -> {"sent": t, "done": Event} for messages from the other side
+        self.waiting = waiting
+        self.reader: Optional[asyncio.Task] = None
+
+    async def read(self):
+        async for raw in self.websocket:
+            self.stats.frames_received += 1
+            frame = json.loads(raw)
+            frame_type = frame.get("type")
+
+            if frame_type == "ping":
+                await self.websocket.send(json.dumps({"type": "pong"}))
+                continue
+
+            data = frame.get("data") or {}
+            entry = self.waiting.get(data.get("client_id"))
+            # Only the other participant's receipt counts
+            if entry is None or data.get("role") == self.role:
+                continue
+
+            elapsed = time.perf_counter() - entry["sent"]
+            if frame_type == "message_pending" and not entry["pending_seen"]:
+                entry["pending_seen"] = True
+                self.stats.pending_latencies.append(elapsed)
+            elif frame_type == "message_translated":
+                self.stats.final_latencies.append(elapsed)
+                entry["done"].set()
+
+
+def percentile(samples: List[float], p: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(int(p * len(ordered)), len(ordered) - 1)]
+
+
+async def upload_audio(http: httpx.AsyncClient) -> Optional[str]:
+    response = await http.post(
+        "/api/audio/upload",
+        files={"file": ("clip.webm", FAKE_AUDIO, "audio/webm")},
+    )
+    response.raise_for_status()
+    return response.json()["url"]
+
+
+async def run_pair(
+    index: int,
+    http: httpx.AsyncClient,
+    ws_url: str,
+    stats: Stats,
+    args: argparse.Namespace,
+):
+    rng = random.Random(args.seed + index)
+    await asyncio.sleep(args.ramp * index / max(args.pairs, 1))
+
+    participants: Dict[str, Participant] = {}
+    try:
+        response = await http.post("/api/conversations/", json={})
+        response.raise_for_status()
+        conversation_id = response.json()["id"]
+        audio_url = await upload_audio(http) if args.audio else None
+
+        waiting: Dict[str, dict] = {}
+        for role in ("doctor", "patient"):
+            websocket = await websockets.connect(
+                f"{ws_url}/ws/{conversation_id}", open_timeout=30, ping_interval=None
+            )
+            participant = Participant(role, websocket, stats, waiting)
+            participant.reader = asyncio.create_task(participant.read())
+            participants[role] = participant
+    except Exception as e:
+        stats.connect_failures += 1
+        if args.verbose:
+            print(f"pair {index}: connect failed: {e}", file=sys.stderr)
+        for participant in participants.values():
+            participant.reader.cancel()
+            await participant.websocket.close()
+        return
+
+    try:
+        for turn in range(args.turns):
+            role, text, is_audio = DIALOGUE[turn % len(DIALOGUE)]
+            if is_audio and not audio_url:
+                text, is_audio = "It feels like pressure in the middle of my chest.", False
+            websocket = participants[role].websocket
+
+            # Keystroke-level typing burst
+            for _ in range(args.typing_events):
+                await websocket.send(json.dumps({"type": "typing", "role": role, "is_typing": True}))
+                await asyncio.sleep(args.typing_interval)
+            await websocket.send(json.dumps({"type": "typing", "role": role, "is_typing": False}))
+
+            client_id = str(uuid.uuid4())
+            entry = {"sent": time.perf_counter(), "pending_seen": False, "done": asyncio.Event()}
+            waiting[client_id] = entry
+            await websocket.send(json.dumps({
+                "type": "send_message",
+                "role": role,
+                "text": text or "",
+                "audio_url": audio_url if is_audio else None,
+                "client_id": client_id,
+            }))
+            stats.messages_sent += 1
+
+            try:
+                await asyncio.wait_for(entry["done"].wait(), timeout=args.timeout)
+                stats.messages_completed += 1
+            except asyncio.TimeoutError:
+                stats.timeouts += 1
+            waiting.pop(client_id, None)
+
+            await asyncio.sleep(rng.uniform(0.5, 1.5) * args.think)
+    except Exception as e:
+        stats.errors += 1
+        if args.verbose:
+            print(f"pair {index}: {e}", file=sys.stderr)
+    finally:
+        for participant in participants.values():
+            await participant.websocket.close()
+            participant.reader.cancel()
+        await asyncio.gather(*(p.reader for p in participants.values()), return_exceptions=True)
+
+
+async def sample_server(http: httpx.AsyncClient, stats: Stats, stop: asyncio.Event):
+    """Poll the server's runtime metrics once a second."""
+    while not stop.is_set():
+        try:
+            metrics = (await http.get("/api/ws/metrics")).json()
+            lag = metrics.get("event_loop_lag", {})
+            stats.server_lag_p99_ms.append(lag.get("p99_ms", 0.0))
+            stats.server_lag_max_ms = max(stats.server_lag_max_ms, lag.get("max_ms", 0.0))
+            stats.server_rss_max = max(stats.server_rss_max, metrics.get("rss_bytes", 0))
+        except Exception:
+            pass
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=1.0)
+        except asyncio.TimeoutError:
+            pass
+
+
+def report(stats: Stats, elapsed: float, args: argparse.Namespace):
+    def row(name: str, samples: List[float]):
+        print(
+            f"  {name:<20} p50 {percentile(samples, 0.50) * 1000:8.1f}  "
+            f"p90 {percentile(samples, 0.90) * 1000:8.1f}  "
+            f"p99 {percentile(samples, 0.99) * 1000:8.1f}  "
+            f"max {max(samples, default=0) * 1000:8.1f} ms"
+        )
+
+    print(f"\nPairs: {args.pairs} ({stats.connect_failures} failed to connect), "
+          f"duration {elapsed:.1f}s")
+    print(f"Messages: {stats.messages_sent} sent, {stats.messages_completed} delivered, "
+          f"{stats.timeouts} timed out, {stats.errors} pair errors")
+    print("End-to-end latency (sender -> other participant):")
+    row("message_pending", stats.pending_latencies)
+    row("message_translated", stats.final_latencies)
+    print(f"Frames received: {stats.frames_received} ({stats.frames_received / elapsed:.0f}/s)")
+    print(f"Server event-loop lag: p99 {max(stats.server_lag_p99_ms, default=0):.1f} ms "
+          f"(worst window), max {stats.server_lag_max_ms:.1f} ms")
+    print(f"Server RSS (max): {stats.server_rss_max / 1024 / 1024:.1f} MB")
+
+
+async def wait_for_health(url: str, path: str = "/health", timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=url) as http:
+        while time.monotonic() < deadline:
+            try:
+                if (await http.get(path)).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not become healthy")
+
+
+def spawn_servers(args: argparse.Namespace, workdir: str) -> List[subprocess.Popen]:
+    """Start the LLM stub and a backend on a temporary database."""
+    stub = subprocess.Popen([
+        sys.executable, "-m", "scripts.llm_stub",
+        "--port", str(args.stub_port), "--latency-ms", str(args.latency_ms),
+    ])
+    env = dict(
+        os.environ,
+        OPENROUTER_BASE_URL=f"http://127.0.0.1:{args.stub_port}",
+        OPENROUTER_API_KEY="stub",
+        DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'loadtest.db')}",
+        AUDIO_STORAGE_PATH=os.path.join(workdir, "audio"),
+        OUTBOX_PATH=os.path.join(workdir, "outbox.db"),
+        AUTO_SUMMARY_ENABLED="false",
+        WS_MAX_CONNECTIONS=str(args.pairs * 2 + 100),
+    )
+    backend = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(args.port), "--log-level", "warning"],
+        env=env,
+    )
+    return [stub, backend]
+
+
+async def run(args: argparse.Namespace):
+    if websockets is None:
+        raise SystemExit("The load test needs the 'websockets' package")
+
+    url = args.url.rstrip("/")
+    ws_url = url.replace("http://", "ws://").replace("https://", "wss://")
+    stats = Stats()
+    stop = asyncio.Event()
+
+    limits = httpx.Limits(max_connections=200)
+    async with httpx.AsyncClient(base_url=url, timeout=30.0, limits=limits) as http:
+        sampler = asyncio.create_task(sample_server(http, stats, stop))
+        started = time.perf_counter()
+        await asyncio.gather(*(run_pair(i, http, ws_url, stats, args) for i in range(args.pairs)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await sampler
+
+    report(stats, elapsed, args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WebSocket load test with doctor/patient pairs")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--pairs", type=int, default=100)
+    parser.add_argument("--turns", type=int, default=len(DIALOGUE))
+    parser.add_argument("--ramp", type=float, default=10.0, help="Seconds over which pairs start")
+    parser.add_argument("--think", type=float, default=1.0, help="Mean pause between turns (s)")
+    parser.add_argument("--typing-events", type=int, default=10)
+    parser.add_argument("--typing-interval", type=float, default=0.05)
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-message delivery timeout (s)")
+    parser.add_argument("--no-audio", dest="audio", action="store_false", help="Skip audio turns")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--verbose", action="store_true")
+    parser.add_argument("--spawn", action="store_true", help="Start the LLM stub and a backend")
+    parser.add_argument("--port", type=int, default=8001, help="Backend port with --spawn")
+    parser.add_argument("--stub-port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=400.0, help="LLM stub median latency")
+    args = parser.parse_args()
+
+    if not args.spawn:
+        asyncio.run(run(args))
+        return
+
+    with tempfile.TemporaryDirectory() as workdir:
+        processes = spawn_servers(args, workdir)
+        try:
+            args.url = f"http://127.0.0.1:{args.port}"
+            asyncio.run(wait_for_health(f"http://127.0.0.1:{args.stub_port}", "/models"))
+            asyncio.run(wait_for_health(args.url))
+            asyncio.run(run(args))
+        finally:
+            for process in processes:
+                process.terminate()
+            for process in processes:
+                process.wait()
+
+
+if __name__ == "__main__":
+    main()
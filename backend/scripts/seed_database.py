@@ -0,0 +1,335 @@
+"""Fill the database with synthetic conversations for benchmarking.
+
+Generation is fully determined by --seed, so two runs with the same
+arguments produce identical rows (ids, timestamps and text included).
+
+Usage (from the backend directory):
+    python -m scripts.seed_database --conversations 20000 --messages-per-conversation 50 --seed 42
+"""
+import argparse
+import logging
+import math
+import os
+import random
+import struct
+import time
+import uuid
+import wave
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from sqlalchemy import insert, text
+
+from config import settings
+from database import Base, SessionLocal, engine, init_db
+from models.conversation import Conversation
+from models.message import Message
+from schemas.conversation import Language
+
+# Aligned phrase banks: index i is the same sentence in every language, so a
+# message built from indices in one language has a matching "translation".
+DOCTOR_PHRASES: Dict[str, List[str]] = {
+    "en": [
+        "Good morning, what brings you in today?",
+        "How long have you had these symptoms?",
+        "Do you have any allergies to medications?",
+        "Are you currently taking any medication?",
+        "Please take this tablet twice a day after meals.",
+        "I would like to order a blood test.",
+        "Let me check your blood pressure.",
+        "Come back in two weeks for a follow-up visit.",
+    ],
+    "es": [
+        "Buenos días, ¿qué le trae hoy?",
+        "¿Cuánto tiempo lleva con estos síntomas?",
+        "¿Tiene alergia a algún medicamento?",
+        "¿Está tomando algún medicamento actualmente?",
+        "Por favor tome esta pastilla dos veces al día después de las comidas.",
+        "Me gustaría pedir un análisis de sangre.",
+        "Déjeme tomarle la presión arterial.",
+        "Vuelva en dos semanas para una consulta de seguimiento.",
+    ],
+    "zh": [
+        "早上好，今天哪里不舒服？",
+        "这些症状持续多久了？",
+        "您对什么药物过敏吗？",
+        "您目前在服用什么药吗？",
+        "请饭后服用这片药，每天两次。",
+        "我想给您开一个血液检查。",
+        "我来给您量一下血压。",
+        "两周后回来复诊。",
+    ],
+    "vi": [
+        "Chào buổi sáng, hôm nay anh chị bị sao?",
+        "Các triệu chứng này kéo dài bao lâu rồi?",
+        "Anh chị có dị ứng với thuốc nào không?",
+        "Hiện tại anh chị có đang dùng thuốc gì không?",
+        "Xin uống viên thuốc này hai lần mỗi ngày sau bữa ăn.",
+        "Tôi muốn chỉ định xét nghiệm máu.",
+        "Để tôi đo huyết áp cho anh chị.",
+        "Hai tuần nữa quay lại tái khám.",
+    ],
+    "ko": [
+        "안녕하세요, 오늘 어디가 불편하세요?",
+        "이 증상이 얼마나 오래 되었나요?",
+        "약물 알레르기가 있으신가요?",
+        "현재 복용 중인 약이 있나요?",
+        "이 약을 하루 두 번 식후에 드세요.",
+        "혈액 검사를 하겠습니다.",
+        "혈압을 재 보겠습니다.",
+        "2주 후에 다시 진료 받으러 오세요.",
+    ],
+    "ar": [
+        "صباح الخير، ما الذي أتى بك اليوم؟",
+        "منذ متى وأنت تعاني من هذه الأعراض؟",
+        "هل لديك حساسية من أي أدوية؟",
+        "هل تتناول أي أدوية حاليًا؟",
+        "من فضلك تناول هذا القرص مرتين يوميًا بعد الوجبات.",
+        "أود أن أطلب تحليل دم.",
+        "دعني أقيس ضغط دمك.",
+        "عد بعد أسبوعين لزيارة متابعة.",
+    ],
+    "fr": [
+        "Bonjour, qu'est-ce qui vous amène aujourd'hui ?",
+        "Depuis combien de temps avez-vous ces symptômes ?",
+        "Êtes-vous allergique à des médicaments ?",
+        "Prenez-vous actuellement des médicaments ?",
+        "Prenez ce comprimé deux fois par jour après les repas.",
+        "Je voudrais prescrire une prise de sang.",
+        "Je vais prendre votre tension artérielle.",
+        "Revenez dans deux semaines pour un suivi.",
+    ],
+}
+
+PATIENT_PHRASES: Dict[str, List[str]] = {
+    "en": [
+        "I have had a headache for three days.",
+        "My stomach hurts after I eat.",
+        "I am allergic to penicillin.",
+        "I take ibuprofen when the pain is bad.",
+        "I feel dizzy when I stand up.",
+        "I have a fever and a cough at night.",
+        "Thank you, doctor.",
+        "The pain is worse in the morning.",
+    ],
+    "es": [
+        "Tengo dolor de cabeza desde hace tres días.",
+        "Me duele el estómago después de comer.",
+        "Soy alérgico a la penicilina.",
+        "Tomo ibuprofeno cuando el dolor es fuerte.",
+        "Me mareo cuando me levanto.",
+        "Tengo fiebre y tos por la noche.",
+        "Gracias, doctor.",
+        "El dolor es peor por la mañana.",
+    ],
+    "zh": [
+        "我头痛三天了。",
+        "我吃完饭后胃疼。",
+        "我对青霉素过敏。",
+        "疼得厉害时我吃布洛芬。",
+        "我站起来的时候会头晕。",
+        "我晚上发烧还咳嗽。",
+        "谢谢医生。",
+        "早上疼得更厉害。",
+    ],
+    "vi": [
+        "Tôi bị đau đầu ba ngày nay.",
+        "Tôi bị đau bụng sau khi ăn.",
+        "Tôi bị dị ứng với penicillin.",
+        "Tôi uống ibuprofen khi đau nhiều.",
+        "Tôi bị chóng mặt khi đứng dậy.",
+        "Tôi bị sốt và ho vào ban đêm.",
+        "Cảm ơn bác sĩ.",
+        "Buổi sáng đau nhiều hơn.",
+    ],
+    "ko": [
+        "사흘 동안 두통이 있었어요.",
+        "먹고 나면 배가 아파요.",
+        "페니실린 알레르기가 있어요.",
+        "많이 아플 때 이부프로펜을 먹어요.",
+        "일어설 때 어지러워요.",
+        "밤에 열이 나고 기침을 해요.",
+        "감사합니다, 선생님.",
+        "아침에 통증이 더 심해요.",
+    ],
+    "ar": [
+        "أعاني من صداع منذ ثلاثة أيام.",
+        "تؤلمني معدتي بعد الأكل.",
+        "لدي حساسية من البنسلين.",
+        "أتناول الإيبوبروفين عندما يشتد الألم.",
+        "أشعر بدوار عندما أقف.",
+        "لدي حمى وسعال في الليل.",
+        "شكرًا لك يا دكتور.",
+        "الألم أسوأ في الصباح.",
+    ],
+    "fr": [
+        "J'ai mal à la tête depuis trois jours.",
+        "J'ai mal au ventre après avoir mangé.",
+        "Je suis allergique à la pénicilline.",
+        "Je prends de l'ibuprofène quand la douleur est forte.",
+        "J'ai des vertiges quand je me lève.",
+        "J'ai de la fièvre et je tousse la nuit.",
+        "Merci, docteur.",
+        "La douleur est pire le matin.",
+    ],
+}
+
+LANGUAGES = [language.value for language in Language]
+STATUS_WEIGHTS = {"active": 0.2, "completed": 0.6, "archived": 0.2}
+BASE_TIME = datetime(2025, 1, 1)
+AUDIO_SAMPLE_RATE = 8000
+
+
+def _uuid(rng: random.Random) -> str:
+    """Deterministic UUID4 drawn from the seeded generator."""
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _sentence_count(rng: random.Random) -> int:
+    """Sentences per message: mostly short turns with a long tail."""
+    return max(1, min(12, int(rng.lognormvariate(0.3, 0.6))))
+
+
+def _build_text(rng: random.Random, phrases: Dict[str, List[str]], source: str, target: str):
+    """Build an original/translated pair from aligned phrase indices."""
+    indices = [rng.randrange(len(phrases[source])) for _ in range(_sentence_count(rng))]
+    original = " ".join(phrases[source][i] for i in indices)
+    translated = " ".join(phrases[target][i] for i in indices)
+    return original, translated
+
+
+def _write_audio_files(rng: random.Random, count: int) -> List[str]:
+    """Write short low-volume noise WAV files and return their audio URLs."""
+    os.makedirs(settings.audio_storage_path, exist_ok=True)
+    urls = []
+    for _ in range(count):
+        audio_id = _uuid(rng)
+        seconds = rng.uniform(1.0, 8.0)
+        frames = int(seconds * AUDIO_SAMPLE_RATE)
+        samples = struct.pack(f"<{frames}h", *(rng.randint(-200, 200) for _ in range(frames)))
+        path = os.path.join(settings.audio_storage_path, f"{audio_id}.wav")
+        with wave.open(path, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(AUDIO_SAMPLE_RATE)
+            wav.writeframes(samples)
+        urls.append(f"/api/audio/{audio_id}")
+    return urls
+
+
+def seed(
+    conversations: int,
+    messages_per_conversation: int,
+    seed_value: int,
+    audio_ratio: float,
+    audio_files: int,
+    batch_size: int,
+) -> Dict[str, int]:
+    """Insert synthetic conversations and messages with Core bulk inserts."""
+    rng = random.Random(seed_value)
+    audio_urls = _write_audio_files(rng, audio_files) if audio_ratio > 0 and audio_files > 0 else []
+    statuses = list(STATUS_WEIGHTS)
+    status_weights = list(STATUS_WEIGHTS.values())
+    # Lognormal with the requested mean: exp(mu + sigma^2 / 2) == mean
+    sigma = 0.8
+    mu = math.log(max(messages_per_conversation, 1)) - sigma ** 2 / 2
+
+    db = SessionLocal()
+    db.execute(text("PRAGMA synchronous=OFF"))
+    stats = {"conversations": 0, "messages": 0}
+    conversation_rows: List[dict] = []
+    message_rows: List[dict] = []
+
+    def flush():
+        if conversation_rows:
+            db.execute(insert(Conversation.__table__), conversation_rows)
+            conversation_rows.clear()
+        if message_rows:
+            db.execute(insert(Message.__table__), message_rows)
+            message_rows.clear()
+        db.commit()
+
+    try:
+        for _ in range(conversations):
+            conversation_id = _uuid(rng)
+            doctor_language = "en" if rng.random() < 0.8 else rng.choice(LANGUAGES)
+            patient_language = rng.choice([lang for lang in LANGUAGES if lang != doctor_language])
+            started_at = BASE_TIME + timedelta(seconds=rng.randrange(365 * 24 * 3600))
+            message_count = max(1, int(rng.lognormvariate(mu, sigma)))
+
+            timestamp = started_at
+            for turn in range(message_count):
+                role = "doctor" if turn % 2 == 0 or rng.random() < 0.2 else "patient"
+                if role == "doctor":
+                    original, translated = _build_text(rng, DOCTOR_PHRASES, doctor_language, patient_language)
+                else:
+                    original, translated = _build_text(rng, PATIENT_PHRASES, patient_language, doctor_language)
+                timestamp += timedelta(seconds=rng.randint(5, 90))
+                audio_url = (
+                    rng.choice(audio_urls) if audio_urls and rng.random() < audio_ratio else None
+                )
+                message_rows.append({
+                    "id": _uuid(rng),
+                    "conversation_id": conversation_id,
+                    "created_at": timestamp,
+                    "role": role,
+                    "original_text": original,
+                    "translated_text": translated,
+                    "audio_url": audio_url,
+                })
+
+            conversation_rows.append({
+                "id": conversation_id,
+                "created_at": started_at,
+                "updated_at": timestamp,
+                "doctor_language": doctor_language,
+                "patient_language": patient_language,
+                "status": rng.choices(statuses, weights=status_weights)[0],
+                "summary": None,
+            })
+            stats["conversations"] += 1
+            stats["messages"] += message_count
+
+            if len(message_rows) >= batch_size:
+                flush()
+        flush()
+    finally:
+        db.close()
+
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed the database with synthetic conversations")
+    parser.add_argument("--conversations", type=int, default=1000)
+    parser.add_argument("--messages-per-conversation", type=int, default=40, help="Mean messages per conversation")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--audio-ratio", type=float, default=0.1, help="Fraction of messages with an audio URL")
+    parser.add_argument("--audio-files", type=int, default=50, help="Number of distinct fake audio files to write")
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--reset", action="store_true", help="Drop and recreate all tables first")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.reset:
+        Base.metadata.drop_all(bind=engine)
+    init_db()
+
+    started = time.perf_counter()
+    stats = seed(
+        conversations=args.conversations,
+        messages_per_conversation=args.messages_per_conversation,
+        seed_value=args.seed,
+        audio_ratio=args.audio_ratio,
+        audio_files=args.audio_files,
+        batch_size=args.batch_size,
+    )
+    elapsed = time.perf_counter() - started
+    print(
+        f"Inserted {stats['conversations']} conversations and {stats['messages']} messages "
+        f"in {elapsed:.1f}s ({stats['messages'] / elapsed:,.0f} messages/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
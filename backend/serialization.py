@@ -0,0 +1,103 @@
+"""Fast JSON encoding shared by REST responses and WebSocket frames.
+
+Uses orjson when it is installed and falls back to the standard library.
+MessagePack (for the binary WebSocket subprotocol) needs ``msgpack``.
+"""
+import json
+from functools import lru_cache
+from typing import Any, Optional
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+
+
+def _default(value: Any):
+    """Encode values the standard library cannot (datetimes, enums, ...)."""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if hasattr(value, "value"):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Encode an object as UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps(obj: Any) -> str:
+    """Encode an object as a JSON string (for WebSocket text frames)."""
+    return dumps_bytes(obj).decode("utf-8")
+
+
+def loads(data) -> Any:
+    """Decode JSON text or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@lru_cache(maxsize=None)
+def get_msgpack():
+    """The msgpack module, imported on first use; None if it is not installed."""
+    try:
+        import msgpack
+    except ImportError:  # pragma: no cover - optional, only for binary WebSocket clients
+        return None
+    return msgpack
+
+
+def msgpack_dumps(obj: Any) -> bytes:
+    """Encode an object as MessagePack."""
+    msgpack = get_msgpack()
+    if msgpack is None:
+        raise RuntimeError("MessagePack encoding requires the 'msgpack' package")
+    return msgpack.packb(obj, default=_default, use_bin_type=True)
+
+
+def msgpack_loads(data: bytes) -> Any:
+    """Decode MessagePack bytes."""
+    msgpack = get_msgpack()
+    if msgpack is None:
+        raise RuntimeError("MessagePack decoding requires the 'msgpack' package")
+    return msgpack.unpackb(data, raw=False)
+
+
+class Frame:
+    """An outbound WebSocket message, encoded at most once per wire format."""
+
+    __slots__ = ("message", "_text", "_binary")
+
+    def __init__(self, message: dict):
+        self.message = message
+        self._text: Optional[str] = None
+        self._binary: Optional[bytes] = None
+
+    @property
+    def type(self) -> Optional[str]:
+        return self.message.get("type")
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = dumps(self.message)
+        return self._text
+
+    @property
+    def binary(self) -> bytes:
+        if self._binary is None:
+            self._binary = msgpack_dumps(self.message)
+        return self._binary
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with the fast encoder."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_bytes(content)
@@ -0,0 +1,282 @@
+"""Cold-tier storage for inactive conversations.
+
+Old completed/archived conversations are moved out of the main SQLite tables
+into append-only segment files. Each conversation is written as one NDJSON
+line compressed as an independent zstd frame, so a single conversation can be
+read back from its byte offset without touching the rest of the segment.
+Offsets and a searchable copy of the message text live in a separate SQLite
+index next to the segments.
+"""
+import json
+import logging
+import os
+import sqlite3
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from config import settings
+from models.conversation import Conversation
+from models.message import Message
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def _zstandard():
+    """The zstandard module, imported on first use; None if it is not installed."""
+    try:
+        import zstandard
+    except ImportError:  # pragma: no cover - optional until archiving is used
+        return None
+    return zstandard
+
+
+def like_pattern(query: str) -> str:
+    """A LIKE pattern matching query as a literal substring (use with ESCAPE '\\')."""
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+ARCHIVABLE_STATUSES = ("completed", "archived")
+SEGMENT_MAX_BYTES = 64 * 1024 * 1024  # Roll over to a new segment after 64MB
+
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS archived_conversations (
+    conversation_id TEXT PRIMARY KEY,
+    segment TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    created_at TEXT,
+    updated_at TEXT,
+    archived_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cold_messages (
+    message_id TEXT PRIMARY KEY,
+    conversation_id TEXT NOT NULL,
+    role TEXT NOT NULL,
+    original_text TEXT NOT NULL,
+    translated_text TEXT NOT NULL,
+    created_at TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_cold_messages_created ON cold_messages (created_at);
+CREATE INDEX IF NOT EXISTS ix_cold_messages_conversation ON cold_messages (conversation_id);
+"""
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+class ArchiveService:
+    """Moves inactive conversations to compressed segments and reads them back."""
+
+    def __init__(self, storage_path: Optional[str] = None):
+        self.storage_path = storage_path or settings.archive_storage_path
+        self.index_path = os.path.join(self.storage_path, "index.db")
+
+    def _connect_index(self) -> sqlite3.Connection:
+        """Open the cold index, creating it on first use."""
+        os.makedirs(self.storage_path, exist_ok=True)
+        conn = sqlite3.connect(self.index_path)
+        conn.row_factory = sqlite3.Row
+        conn.executescript(INDEX_SCHEMA)
+        return conn
+
+    def _current_segment(self) -> str:
+        """Return the segment file to append to, rolling over when it is full."""
+        segments = sorted(
+            name for name in os.listdir(self.storage_path)
+            if name.startswith("segment-") and name.endswith(".ndjson.zst")
+        )
+        if segments:
+            latest = os.path.join(self.storage_path, segments[-1])
+            if os.path.getsize(latest) < SEGMENT_MAX_BYTES:
+                return segments[-1]
+        return f"segment-{datetime.utcnow().strftime('%Y%m%d%H%M%S%f')}.ndjson.zst"
+
+    def _conversation_record(self, conversation: Conversation, messages: List[Message]) -> dict:
+        """Build the archived representation (same shape as ConversationResponse)."""
+        return {
+            "id": conversation.id,
+            "doctor_language": conversation.doctor_language,
+            "patient_language": conversation.patient_language,
+            "status": conversation.status,
+            "summary": conversation.summary,
+            "created_at": _isoformat(conversation.created_at),
+            "updated_at": _isoformat(conversation.updated_at),
+            "messages": [
+                {
+                    "id": m.id,
+                    "conversation_id": m.conversation_id,
+                    "role": m.role,
+                    "original_text": m.original_text,
+                    "translated_text": m.translated_text,
+                    "audio_url": m.audio_url,
+                    "translation_status": m.translation_status,
+                    "created_at": _isoformat(m.created_at),
+                }
+                for m in messages
+            ],
+        }
+
+    def archive_conversations(
+        self,
+        db: Session,
+        older_than_days: Optional[int] = None,
+        statuses: Sequence[str] = ARCHIVABLE_STATUSES,
+        batch_size: int = 100,
+    ) -> Dict[str, int]:
+        """
+        Move inactive conversations older than the cutoff into the cold tier.
+
+        Args:
+            db: Database session
+            older_than_days: Only archive conversations not updated for this long
+            statuses: Conversation statuses eligible for archiving
+            batch_size: Conversations written and deleted per batch
+
+        Returns:
+            Dict with the number of archived conversations and messages
+        """
+        zstandard = _zstandard()
+        if zstandard is None:
+            raise RuntimeError("Archiving requires the 'zstandard' package")
+
+        if older_than_days is None:
+            older_than_days = settings.archive_after_days
+        cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+
+        compressor = zstandard.ZstdCompressor(level=10)
+        index = self._connect_index()
+        stats = {"conversations": 0, "messages": 0}
+
+        try:
+            while True:
+                conversations = db.execute(
+                    select(Conversation)
+                    .where(Conversation.status.in_(statuses))
+                    .where(Conversation.updated_at < cutoff)
+                    .order_by(Conversation.updated_at.asc())
+                    .limit(batch_size)
+                ).scalars().all()
+                if not conversations:
+                    break
+
+                ids = [c.id for c in conversations]
+                messages_by_conversation: Dict[str, List[Message]] = {cid: [] for cid in ids}
+                for message in db.execute(
+                    select(Message)
+                    .where(Message.conversation_id.in_(ids))
+                    .order_by(Message.created_at.asc())
+                ).scalars():
+                    messages_by_conversation[message.conversation_id].append(message)
+
+                segment = self._current_segment()
+                segment_path = os.path.join(self.storage_path, segment)
+                archived_at = datetime.utcnow().isoformat()
+                index_rows = []
+                message_rows = []
+
+                # Append one independent zstd frame per conversation
+                with open(segment_path, "ab") as f:
+                    for conversation in conversations:
+                        messages = messages_by_conversation[conversation.id]
+                        record = self._conversation_record(conversation, messages)
+                        line = json.dumps(record, ensure_ascii=False) + "\n"
+                        frame = compressor.compress(line.encode("utf-8"))
+                        offset = f.tell()
+                        f.write(frame)
+                        index_rows.append((
+                            conversation.id, segment, offset, len(frame), conversation.status,
+                            record["created_at"], record["updated_at"], archived_at,
+                        ))
+                        message_rows.extend(
+                            (m["id"], m["conversation_id"], m["role"], m["original_text"],
+                             m["translated_text"], m["created_at"])
+                            for m in record["messages"]
+                        )
+                    f.flush()
+                    os.fsync(f.fileno())
+
+                index.executemany(
+                    "INSERT OR REPLACE INTO archived_conversations VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    index_rows,
+                )
+                index.executemany(
+                    "INSERT OR REPLACE INTO cold_messages VALUES (?, ?, ?, ?, ?, ?)",
+                    message_rows,
+                )
+                index.commit()
+
+                # Only drop the hot rows once the cold copy is durable
+                db.execute(delete(Message).where(Message.conversation_id.in_(ids)))
+                db.execute(delete(Conversation).where(Conversation.id.in_(ids)))
+                db.commit()
+                db.expunge_all()
+
+                stats["conversations"] += len(ids)
+                stats["messages"] += len(message_rows)
+                logger.info(f"Archived {len(ids)} conversations to {segment}")
+        finally:
+            index.close()
+
+        return stats
+
+    def load_conversation(self, conversation_id: str) -> Optional[dict]:
+        """Rehydrate an archived conversation with its messages."""
+        if not os.path.exists(self.index_path):
+            return None
+
+        index = self._connect_index()
+        try:
+            row = index.execute(
+                "SELECT segment, offset, length FROM archived_conversations WHERE conversation_id = ?",
+                (conversation_id,),
+            ).fetchone()
+        finally:
+            index.close()
+
+        if row is None:
+            return None
+        zstandard = _zstandard()
+        if zstandard is None:
+            raise RuntimeError("Reading archived conversations requires the 'zstandard' package")
+
+        with open(os.path.join(self.storage_path, row["segment"]), "rb") as f:
+            f.seek(row["offset"])
+            frame = f.read(row["length"])
+
+        line = zstandard.ZstdDecompressor().decompress(frame)
+        return json.loads(line)
+
+    def search_messages(self, query: str, limit: int = 50) -> List[dict]:
+        """Search archived message texts in the cold index."""
+        if not os.path.exists(self.index_path):
+            return []
+
+        pattern = like_pattern(query)
+        index = self._connect_index()
+        try:
+            rows = index.execute(
+                """
+                SELECT message_id, conversation_id, role, original_text, translated_text, created_at
+                FROM cold_messages
+                WHERE original_text LIKE ? ESCAPE '\\' OR translated_text LIKE ? ESCAPE '\\'
+                ORDER BY created_at DESC
+                LIMIT ?
+                """,
+                (pattern, pattern, limit),
+            ).fetchall()
+        finally:
+            index.close()
+
+        return [dict(row) for row in rows]
+
+
+# Singleton instance
+archive_service = ArchiveService()
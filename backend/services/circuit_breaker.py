@@ -0,0 +1,80 @@
+"""Circuit breaker that fails fast while an upstream dependency is down."""
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose circuit is open."""
+    pass
+
+
+class CircuitBreaker:
+    """
+    Opens after `threshold` consecutive failures.
+
+    While open, allow() is False, so callers skip the dependency instead of
+    waiting on its timeouts and retries. After cooldown_seconds, one trial
+    call is let through (half-open). Its success closes the circuit; its
+    failure opens it for another cooldown.
+    """
+
+    def __init__(self, name: str, threshold: int = 3, cooldown_seconds: float = 30.0):
+        self.name = name
+        self.threshold = threshold
+        self.cooldown = cooldown_seconds
+        self.failures = 0
+        self.opened_at = None
+        # When the half-open trial call started; a trial that never reports
+        # back (e.g. cancelled) is replaced after another cooldown
+        self._trial_started = None
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        now = time.monotonic()
+        if state == "half_open" and (
+            self._trial_started is None or now - self._trial_started >= self.cooldown
+        ):
+            self._trial_started = now
+            return True
+        self.rejected += 1
+        return False
+
+    def check(self):
+        """Raise CircuitOpenError unless a call is allowed."""
+        if not self.allow():
+            raise CircuitOpenError(f"{self.name} circuit is open")
+
+    def record_success(self):
+        if self.opened_at is not None:
+            logger.info(f"{self.name} circuit closed")
+        self.failures = 0
+        self.opened_at = None
+        self._trial_started = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self._trial_started is not None or self.failures >= self.threshold:
+            if self.opened_at is None:
+                logger.warning(f"{self.name} circuit opened after {self.failures} failures")
+            self.opened_at = time.monotonic()
+        self._trial_started = None
+
+    def get_metrics(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "rejected": self.rejected,
+        }
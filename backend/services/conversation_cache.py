@@ -0,0 +1,158 @@
+"""In-process cache of conversation metadata used on the message hot path."""
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Set, Tuple
+
+from config import settings
+from database import SessionLocal
+from services.database_service import database_service
+from websocket.manager import manager
+
+logger = logging.getLogger(__name__)
+
+# Column defaults of Conversation, used when a conversation is not found
+DEFAULT_DOCTOR_LANGUAGE = "en"
+DEFAULT_PATIENT_LANGUAGE = "es"
+
+# Published to the other workers when a conversation changes
+INVALIDATE_CONTROL = "conversation_cache.invalidate"
+
+
+@dataclass(frozen=True)
+class ConversationInfo:
+    """The fields of a conversation that message handling needs."""
+    id: str
+    doctor_language: str
+    patient_language: str
+    status: str
+
+    def language_pair(self, role: str) -> Tuple[str, str]:
+        """(source, target) languages for a message sent by role."""
+        if role == "doctor":
+            return self.doctor_language, self.patient_language
+        return self.patient_language, self.doctor_language
+
+
+class ConversationCache:
+    """
+    LRU cache of conversation metadata.
+
+    Entries are loaded when a socket connects, so sending a message needs no
+    query. Each worker has its own cache: the conversation routes invalidate
+    an entry on every worker (through pub/sub) when they change or delete the
+    conversation, and entries older than ttl seconds are reloaded anyway in
+    case an invalidation was lost. Invalidated and expired entries are
+    reloaded on next use but kept as a last-known fallback while the database
+    is unavailable.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 60.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, ConversationInfo]" = OrderedDict()
+        # conversation_id -> time.monotonic() when loaded
+        self._loaded_at: Dict[str, float] = {}
+        # Entries to reload before they are used again
+        self._invalid: Set[str] = set()
+        self.hits = 0
+        self.misses = 0
+        self.fallbacks = 0
+
+    def get(self, conversation_id: str) -> Optional[ConversationInfo]:
+        if conversation_id in self._invalid:
+            return None
+        info = self._entries.get(conversation_id)
+        if info is None:
+            return None
+        if time.monotonic() - self._loaded_at[conversation_id] > self.ttl:
+            self._invalid.add(conversation_id)
+            return None
+        self._entries.move_to_end(conversation_id)
+        return info
+
+    async def load(self, conversation_id: str) -> Optional[ConversationInfo]:
+        """Return a conversation's metadata, querying the database on a miss."""
+        info = self.get(conversation_id)
+        if info is not None:
+            self.hits += 1
+            return info
+
+        self.misses += 1
+        db = SessionLocal()
+        try:
+            conversation = await database_service.get_conversation(db, conversation_id)
+        finally:
+            db.close()
+
+        if conversation is None:
+            self._entries.pop(conversation_id, None)
+            self._loaded_at.pop(conversation_id, None)
+            self._invalid.discard(conversation_id)
+            return None
+
+        info = ConversationInfo(
+            id=conversation["id"],
+            doctor_language=conversation["doctor_language"],
+            patient_language=conversation["patient_language"],
+            status=conversation["status"],
+        )
+        self._entries[conversation_id] = info
+        self._entries.move_to_end(conversation_id)
+        self._loaded_at[conversation_id] = time.monotonic()
+        self._invalid.discard(conversation_id)
+        while len(self._entries) > self.max_size:
+            evicted, _ = self._entries.popitem(last=False)
+            del self._loaded_at[evicted]
+            self._invalid.discard(evicted)
+        return info
+
+    async def language_pair(self, conversation_id: str, role: str) -> Tuple[str, str]:
+        """
+        (source, target) languages for a message sent by role in a conversation.
+
+        Never raises: if the database fails, the last known languages (or
+        the defaults) are used so the message is still delivered.
+        """
+        try:
+            info = await self.load(conversation_id)
+        except Exception as e:
+            self.fallbacks += 1
+            info = self._entries.get(conversation_id)
+            known = "last known" if info is not None else "default"
+            logger.warning(f"Failed to load conversation {conversation_id} ({e}), using {known} languages")
+        else:
+            if info is None:
+                logger.warning(f"Conversation {conversation_id} not found, using default languages")
+
+        if info is None:
+            info = ConversationInfo(
+                conversation_id, DEFAULT_DOCTOR_LANGUAGE, DEFAULT_PATIENT_LANGUAGE, "active"
+            )
+        return info.language_pair(role)
+
+    async def invalidate(self, conversation_id: str):
+        """Have every worker reload a conversation's metadata on next use."""
+        self._invalidate_local(conversation_id)
+        await manager.publish_control(conversation_id, INVALIDATE_CONTROL)
+
+    def _invalidate_local(self, conversation_id: str):
+        if conversation_id in self._entries:
+            self._invalid.add(conversation_id)
+
+    def get_metrics(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "fallbacks": self.fallbacks,
+        }
+
+
+# Singleton instance
+conversation_cache = ConversationCache(
+    max_size=settings.conversation_cache_size,
+    ttl=settings.conversation_cache_ttl_seconds,
+)
+manager.on_control(INVALIDATE_CONTROL, conversation_cache._invalidate_local)
@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import and_, or_, select
 from typing import List, Optional
 from datetime import datetime
 import uuid
@@ -65,6 +65,7 @@ class DatabaseService:
         original_text: str,
         translated_text: str,
         audio_url: Optional[str] = None,
+        translation_status: Optional[str] = None,
     ) -> dict:
         """Create a new message."""
         message = Message(
@@ -73,12 +74,73 @@ class DatabaseService:
             original_text=original_text,
             translated_text=translated_text,
             audio_url=audio_url,
+            translation_status=translation_status,
         )
         db.add(message)
         db.commit()
         db.refresh(message)
         return self._message_to_dict(message)
 
+    async def restore_message(self, db: Session, message: dict) -> Optional[dict]:
+        """
+        Save a message under its existing id, if not saved already.
+
+        The message keeps its original time. If a summary already covers
+        later messages, its watermark is cleared so the next summary is
+        rebuilt from every message instead of skipping this one.
+
+        Returns None if its conversation no longer exists.
+        """
+        existing = db.get(Message, message["id"])
+        if existing is not None:
+            return self._message_to_dict(existing)
+        conversation = db.get(Conversation, message["conversation_id"])
+        if conversation is None:
+            return None
+
+        restored = Message(
+            id=message["id"],
+            conversation_id=message["conversation_id"],
+            role=message["role"],
+            original_text=message["original_text"],
+            translated_text=message["translated_text"],
+            audio_url=message.get("audio_url"),
+            translation_status=message.get("translation_status"),
+            created_at=datetime.fromisoformat(message["created_at"]),
+        )
+        db.add(restored)
+        watermark = conversation.summary_watermark_at
+        if watermark is not None and (
+            restored.created_at < watermark
+            or (restored.created_at == watermark and restored.id < conversation.summary_message_id)
+        ):
+            conversation.summary_watermark_at = None
+            conversation.summary_message_id = None
+        db.commit()
+        db.refresh(restored)
+        return self._message_to_dict(restored)
+
+    async def update_translation(self, db: Session, message_id: str, translated_text: str) -> Optional[dict]:
+        """Replace a message's translation."""
+        message = db.get(Message, message_id)
+        if message is None:
+            return None
+        message.translated_text = translated_text
+        message.translation_status = None
+        db.commit()
+        db.refresh(message)
+        return self._message_to_dict(message)
+
+    async def set_translation_status(self, db: Session, message_id: str, status: Optional[str]) -> Optional[dict]:
+        """Record whether a message's translation is pending or failed."""
+        message = db.get(Message, message_id)
+        if message is None:
+            return None
+        message.translation_status = status
+        db.commit()
+        db.refresh(message)
+        return self._message_to_dict(message)
+
     async def get_messages(
         self,
         db: Session,
@@ -93,6 +155,29 @@ class DatabaseService:
         messages = result.scalars().all()
         return [self._message_to_dict(m) for m in messages]
 
+    async def get_messages_after(
+        self,
+        db: Session,
+        conversation_id: str,
+        message_id: str,
+    ) -> Optional[List[dict]]:
+        """Get messages created after a given message (None if it is unknown)."""
+        anchor = db.get(Message, message_id)
+        if anchor is None or anchor.conversation_id != conversation_id:
+            return None
+
+        result = db.execute(
+            select(Message)
+            .where(Message.conversation_id == conversation_id)
+            .where(or_(
+                Message.created_at > anchor.created_at,
+                and_(Message.created_at == anchor.created_at, Message.id > anchor.id),
+            ))
+            .order_by(Message.created_at.asc(), Message.id.asc())
+        )
+        messages = result.scalars().all()
+        return [self._message_to_dict(m) for m in messages]
+
     def _conversation_to_dict(self, conversation: Conversation) -> dict:
         """Convert conversation model to dict."""
         return {
@@ -114,6 +199,7 @@ class DatabaseService:
             "original_text": message.original_text,
             "translated_text": message.translated_text,
             "audio_url": message.audio_url,
+            "translation_status": message.translation_status,
             "created_at": message.created_at.isoformat() if message.created_at else None,
         }
 
@@ -1,13 +1,40 @@
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional
-import httpx
+from typing import TYPE_CHECKING, Optional
 import asyncio
 import logging
 from config import settings
 
+if TYPE_CHECKING:
+    import httpx
+
 logger = logging.getLogger(__name__)
 
+# Shared by every OpenRouter caller; created on first request
+_http_client: Optional["httpx.AsyncClient"] = None
+
+
+def get_http_client() -> "httpx.AsyncClient":
+    """
+    Return the shared HTTP client, creating it on first use.
+
+    httpx is imported here rather than at module load, and one pooled
+    client replaces a new client (and TLS handshake) per request.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        import httpx
+        _http_client = httpx.AsyncClient(timeout=30.0)
+    return _http_client
+
+
+async def close_http_client():
+    """Close the shared HTTP client (on shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 
 class ModelProvider(str, Enum):
     ANTHROPIC = "anthropic"
@@ -61,7 +88,7 @@ class OpenRouterClient:
 
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or settings.openrouter_api_key
-        self.base_url = "https://openrouter.ai/api/v1"
+        self.base_url = settings.openrouter_base_url
         self.max_retries = 3
         self.base_delay = 1.0  # seconds
 
@@ -82,6 +109,8 @@ class OpenRouterClient:
         max_tokens: int = 1000,
     ) -> str:
         """Make request with exponential backoff retry."""
+        import httpx
+
         model_config = MODELS.get(model, MODELS["flash"])
 
         payload = {
@@ -95,27 +124,26 @@ class OpenRouterClient:
 
         for attempt in range(self.max_retries):
             try:
-                async with httpx.AsyncClient(timeout=30.0) as client:
-                    response = await client.post(
-                        f"{self.base_url}/chat/completions",
-                        headers=self._get_headers(),
-                        json=payload,
-                    )
-
-                    # Handle auth errors
-                    if response.status_code == 401:
-                        raise AuthenticationError("Invalid API key")
-
-                    # Handle rate limits
-                    if response.status_code == 429:
-                        delay = self.base_delay * (2 ** attempt)
-                        logger.warning(f"Rate limited, waiting {delay}s")
-                        await asyncio.sleep(delay)
-                        continue
-
-                    response.raise_for_status()
-                    data = response.json()
-                    return data["choices"][0]["message"]["content"]
+                response = await get_http_client().post(
+                    f"{self.base_url}/chat/completions",
+                    headers=self._get_headers(),
+                    json=payload,
+                )
+
+                # Handle auth errors
+                if response.status_code == 401:
+                    raise AuthenticationError("Invalid API key")
+
+                # Handle rate limits
+                if response.status_code == 429:
+                    delay = self.base_delay * (2 ** attempt)
+                    logger.warning(f"Rate limited, waiting {delay}s")
+                    await asyncio.sleep(delay)
+                    continue
+
+                response.raise_for_status()
+                data = response.json()
+                return data["choices"][0]["message"]["content"]
 
             except httpx.TimeoutException:
                 last_error = "Request timeout"
@@ -142,11 +170,11 @@ class OpenRouterClient:
     async def health_check(self) -> bool:
         """Check if OpenRouter API is accessible."""
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(
-                    "https://openrouter.ai/api/v1/models",
-                    headers=self._get_headers(),
-                )
-                return response.status_code == 200
+            response = await get_http_client().get(
+                f"{self.base_url}/models",
+                headers=self._get_headers(),
+                timeout=5.0,
+            )
+            return response.status_code == 200
         except Exception:
             return False
@@ -0,0 +1,249 @@
+"""Durable outbox for work that failed on the live message path.
+
+When translating or saving a message fails, the message is delivered
+anyway (untranslated, or under its final id but not yet saved) and the
+remaining work is written here. A small worker pool retries it with
+exponential backoff until it succeeds.
+
+The outbox is a separate SQLite file accessed with sqlite3, so it keeps
+working when the main database is the thing that is failing. Jobs are
+claimed with a lease, so several workers or processes can share one file.
+All file access runs in threads, off the event loop.
+"""
+import asyncio
+import json
+import logging
+import os
+import random
+import sqlite3
+import time
+import uuid
+from typing import Awaitable, Callable, List, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[dict], Awaitable[None]]
+
+# A claimed job is retried by another worker if not finished within this time
+LEASE_SECONDS = 300
+POLL_INTERVAL_SECONDS = 5.0
+
+OUTBOX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    locked_until REAL,
+    last_error TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_outbox_due ON outbox (status, next_attempt_at);
+"""
+
+
+class Outbox:
+    """
+    Persists jobs and runs them through a handler until they succeed.
+
+    The handler may update the payload dict in place to record progress;
+    when it raises, the updated payload is stored with the next retry time.
+    Jobs that fail max_attempts times are kept with status 'dead' and
+    passed to the dead handler, if any.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or settings.outbox_path
+        self.workers = settings.outbox_workers
+        self.base_delay = settings.outbox_retry_base_seconds
+        self.max_delay = settings.outbox_retry_max_seconds
+        self.max_attempts = settings.outbox_max_attempts
+        self.enqueue_timeout = settings.outbox_enqueue_timeout_seconds
+        self._handler: Optional[JobHandler] = None
+        self._dead_handler: Optional[JobHandler] = None
+        self._tasks: List[asyncio.Task] = []
+        self._wake: Optional[asyncio.Event] = None
+        self._schema_ready = False
+        self.completed = 0
+        self.retries = 0
+
+    def _connect(self, timeout: float = 10) -> sqlite3.Connection:
+        """Open the outbox, creating it on first use; timeout is how long to wait for a lock."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=timeout, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        if not self._schema_ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(OUTBOX_SCHEMA)
+            self._schema_ready = True
+        return conn
+
+    async def enqueue(self, payload: dict) -> str:
+        """
+        Store a job and wake a worker. Returns the job id.
+
+        Called on the live message path, so a locked outbox fails after
+        enqueue_timeout seconds instead of holding up the message.
+        """
+        job_id = str(uuid.uuid4())
+        await asyncio.to_thread(self._insert, job_id, json.dumps(payload))
+        if self._wake is not None:
+            self._wake.set()
+        return job_id
+
+    def _insert(self, job_id: str, payload: str):
+        now = time.time()
+        conn = self._connect(timeout=self.enqueue_timeout)
+        try:
+            conn.execute(
+                "INSERT INTO outbox (id, payload, status, next_attempt_at, created_at) "
+                "VALUES (?, ?, 'pending', ?, ?)",
+                (job_id, payload, now, now),
+            )
+        finally:
+            conn.close()
+
+    async def start(self, handler: JobHandler, dead_handler: Optional[JobHandler] = None):
+        """Start the worker pool; jobs left by a previous process are picked up."""
+        if self._tasks:
+            return
+        self._handler = handler
+        self._dead_handler = dead_handler
+        self._wake = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def shutdown(self):
+        """Stop the workers; unfinished jobs stay in the outbox."""
+        tasks = self._tasks
+        self._tasks = []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _claim(self) -> Optional[sqlite3.Row]:
+        """Lease the next due job, if any."""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT id, payload, attempts FROM outbox "
+                "WHERE status = 'pending' AND next_attempt_at <= ? "
+                "AND (locked_until IS NULL OR locked_until < ?) "
+                "ORDER BY next_attempt_at LIMIT 1",
+                (now, now),
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE outbox SET locked_until = ? WHERE id = ?",
+                    (now + LEASE_SECONDS, row["id"]),
+                )
+            conn.execute("COMMIT")
+            return row
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _complete(self, job_id: str):
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM outbox WHERE id = ?", (job_id,))
+        finally:
+            conn.close()
+        self.completed += 1
+
+    def _reschedule(self, job_id: str, payload: dict, attempts: int, error: str) -> str:
+        """Store a failed attempt; returns the job's new status."""
+        if attempts >= self.max_attempts:
+            logger.error(f"Outbox job {job_id} failed {attempts} times, giving up: {error}")
+            status, next_attempt_at = "dead", time.time()
+        else:
+            # Exponential backoff with jitter so retries do not arrive in bursts
+            delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+            status, next_attempt_at = "pending", time.time() + delay * random.uniform(0.5, 1.0)
+            self.retries += 1
+
+        conn = self._connect()
+        try:
+            conn.execute(
+                "UPDATE outbox SET payload = ?, status = ?, attempts = ?, next_attempt_at = ?, "
+                "locked_until = NULL, last_error = ? WHERE id = ?",
+                (json.dumps(payload), status, attempts, next_attempt_at, error[:1000], job_id),
+            )
+        finally:
+            conn.close()
+        return status
+
+    async def _worker(self):
+        while True:
+            try:
+                row = await asyncio.to_thread(self._claim)
+            except Exception as e:
+                logger.error(f"Failed to read outbox: {e}")
+                row = None
+
+            if row is None:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), POLL_INTERVAL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            payload = json.loads(row["payload"])
+            try:
+                await self._handler(payload)
+            except Exception as e:
+                logger.warning(f"Outbox job {row['id']} failed (attempt {row['attempts'] + 1}): {e}")
+                try:
+                    status = await asyncio.to_thread(
+                        self._reschedule, row["id"], payload, row["attempts"] + 1, str(e)
+                    )
+                except Exception as e:
+                    # The lease expires and the job is retried as claimed
+                    logger.error(f"Failed to reschedule outbox job {row['id']}: {e}")
+                    continue
+                if status == "dead" and self._dead_handler is not None:
+                    try:
+                        await self._dead_handler(payload)
+                    except Exception as e:
+                        logger.error(f"Dead handler failed for outbox job {row['id']}: {e}")
+                continue
+
+            try:
+                await asyncio.to_thread(self._complete, row["id"])
+            except Exception as e:
+                # The lease expires and the (idempotent) job runs again
+                logger.error(f"Failed to complete outbox job {row['id']}: {e}")
+
+    def _count_by_status(self) -> dict:
+        conn = self._connect()
+        try:
+            return dict(conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall())
+        finally:
+            conn.close()
+
+    async def get_metrics(self) -> dict:
+        try:
+            counts = await asyncio.to_thread(self._count_by_status)
+        except Exception as e:
+            logger.error(f"Failed to read outbox: {e}")
+            counts = {}
+        return {
+            "pending": counts.get("pending", 0),
+            "dead": counts.get("dead", 0),
+            "completed": self.completed,
+            "retries": self.retries,
+        }
+
+
+# Singleton instance
+outbox = Outbox()
@@ -0,0 +1,71 @@
+"""Process-level runtime metrics: event-loop lag and resident memory."""
+import asyncio
+import logging
+import os
+from collections import deque
+from typing import Deque, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def process_rss_bytes() -> int:
+    """Current resident set size of this process (Linux), or 0 if unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+class LoopLagMonitor:
+    """
+    Samples event-loop lag: how late a periodic sleep wakes up.
+
+    Lag means something is blocking the loop (CPU-bound work, synchronous
+    I/O) and every WebSocket in the process waits for it.
+    """
+
+    def __init__(self, interval: float = 0.1, window: int = 600):
+        self.interval = interval
+        # Recent lag samples in seconds
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.max_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(loop.time() - started - self.interval, 0.0)
+            self.samples.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+
+    def snapshot(self) -> dict:
+        """Lag percentiles over the recent window, in milliseconds."""
+        ordered = sorted(self.samples)
+
+        def percentile(p: float) -> float:
+            if not ordered:
+                return 0.0
+            return ordered[min(int(p * len(ordered)), len(ordered) - 1)] * 1000
+
+        return {
+            "p50_ms": round(percentile(0.50), 2),
+            "p99_ms": round(percentile(0.99), 2),
+            "max_ms": round(self.max_lag * 1000, 2),
+        }
+
+
+# Singleton instance
+loop_monitor = LoopLagMonitor()
@@ -0,0 +1,196 @@
+"""Bulk summarization jobs driven through SummaryService."""
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from config import settings
+from database import SessionLocal
+from models.conversation import Conversation
+from models.summary_job import SummaryJob
+from schemas.summary_job import SummaryJobCreate, SummaryJobStatus
+from services.summary_service import summary_service
+
+logger = logging.getLogger(__name__)
+
+RESUMABLE_STATUSES = (SummaryJobStatus.PENDING.value, SummaryJobStatus.RUNNING.value)
+
+
+class SummaryJobService:
+    """
+    Runs summary jobs in the background with a bounded worker pool.
+
+    Conversations are processed in id order, one batch at a time. After each
+    batch the job stores the last id as its checkpoint, so a job interrupted
+    by a restart resumes after the last completed batch.
+    """
+
+    def __init__(self):
+        self.concurrency = settings.summary_job_concurrency
+        self.batch_size = settings.summary_job_batch_size
+        # job_id -> running task
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def _conversation_query(self, filters: SummaryJobCreate):
+        """Select conversation keys matching the job filters."""
+        query = select(Conversation.id)
+        if filters.status is not None:
+            query = query.where(Conversation.status == filters.status.value)
+        if filters.created_after is not None:
+            query = query.where(Conversation.created_at >= filters.created_after)
+        if filters.created_before is not None:
+            query = query.where(Conversation.created_at < filters.created_before)
+        if filters.only_missing:
+            query = query.where(Conversation.summary.is_(None))
+        return query
+
+    async def create_job(self, db: Session, filters: SummaryJobCreate) -> SummaryJob:
+        """Create a job for the matching conversations and start it."""
+        total = db.execute(
+            select(func.count()).select_from(self._conversation_query(filters).subquery())
+        ).scalar_one()
+        if filters.limit is not None:
+            total = min(total, filters.limit)
+
+        job = SummaryJob(
+            status=SummaryJobStatus.PENDING.value,
+            filters=filters.model_dump_json(),
+            total=total,
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+
+        self._start(job.id)
+        return job
+
+    async def cancel_job(self, db: Session, job_id: str) -> Optional[SummaryJob]:
+        """Cancel a pending or running job."""
+        job = db.get(SummaryJob, job_id)
+        if job is None:
+            return None
+
+        if job.status in RESUMABLE_STATUSES:
+            job.status = SummaryJobStatus.CANCELLED.value
+            job.finished_at = datetime.utcnow()
+            db.commit()
+            db.refresh(job)
+
+        task = self._tasks.pop(job_id, None)
+        if task is not None:
+            task.cancel()
+        return job
+
+    async def resume_jobs(self):
+        """Restart jobs left pending or running by a previous process."""
+        db = SessionLocal()
+        try:
+            job_ids = db.execute(
+                select(SummaryJob.id).where(SummaryJob.status.in_(RESUMABLE_STATUSES))
+            ).scalars().all()
+        finally:
+            db.close()
+
+        for job_id in job_ids:
+            logger.info(f"Resuming summary job {job_id}")
+            self._start(job_id)
+
+    async def shutdown(self):
+        """Stop workers; interrupted jobs stay resumable."""
+        tasks = list(self._tasks.values())
+        self._tasks.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _start(self, job_id: str):
+        if job_id not in self._tasks:
+            self._tasks[job_id] = asyncio.create_task(self._run(job_id))
+
+    async def _summarize_one(self, conversation_id: str, semaphore: asyncio.Semaphore) -> bool:
+        async with semaphore:
+            db = SessionLocal()
+            try:
+                await summary_service.generate_summary(db, conversation_id)
+                return True
+            except Exception as e:
+                logger.error(f"Summary job failed for conversation {conversation_id}: {e}")
+                return False
+            finally:
+                db.close()
+
+    def _next_batch(self, db: Session, job: SummaryJob, filters: SummaryJobCreate, size: int) -> List[str]:
+        query = self._conversation_query(filters)
+        if job.checkpoint_id is not None:
+            query = query.where(Conversation.id > job.checkpoint_id)
+        query = query.order_by(Conversation.id.asc()).limit(size)
+        return db.execute(query).scalars().all()
+
+    async def _run(self, job_id: str):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        db = SessionLocal()
+        try:
+            job = db.get(SummaryJob, job_id)
+            if job is None or job.status not in RESUMABLE_STATUSES:
+                return
+
+            filters = SummaryJobCreate.model_validate_json(job.filters)
+            job.status = SummaryJobStatus.RUNNING.value
+            job.started_at = job.started_at or datetime.utcnow()
+            db.commit()
+
+            while True:
+                remaining = self.batch_size
+                if filters.limit is not None:
+                    remaining = min(remaining, filters.limit - job.processed - job.failed)
+                batch = self._next_batch(db, job, filters, remaining) if remaining > 0 else []
+                if not batch:
+                    break
+
+                batch_started = time.perf_counter()
+                results = await asyncio.gather(
+                    *(self._summarize_one(conversation_id, semaphore) for conversation_id in batch)
+                )
+
+                # Stop without overwriting a cancellation made meanwhile
+                db.refresh(job)
+                if job.status != SummaryJobStatus.RUNNING.value:
+                    return
+
+                succeeded = sum(results)
+                job.processed += succeeded
+                job.failed += len(results) - succeeded
+                job.checkpoint_id = batch[-1]
+                db.commit()
+
+                elapsed = time.perf_counter() - batch_started
+                logger.info(
+                    f"Summary job {job_id}: {job.processed + job.failed}/{job.total} "
+                    f"({len(batch) / elapsed:.1f} conversations/s)"
+                )
+
+            job.status = SummaryJobStatus.COMPLETED.value
+            job.finished_at = datetime.utcnow()
+            db.commit()
+
+        except Exception as e:
+            logger.error(f"Summary job {job_id} failed: {e}")
+            db.rollback()
+            job = db.get(SummaryJob, job_id)
+            if job is not None:
+                job.status = SummaryJobStatus.FAILED.value
+                job.error = str(e)
+                job.finished_at = datetime.utcnow()
+                db.commit()
+        finally:
+            db.close()
+            if self._tasks.get(job_id) is asyncio.current_task():
+                del self._tasks[job_id]
+
+
+# Singleton instance
+summary_job_service = SummaryJobService()
@@ -0,0 +1,101 @@
+"""Background auto-summarization for idle and completed conversations."""
+import asyncio
+import logging
+from typing import Dict, Optional, Set
+
+from config import settings
+from database import SessionLocal
+from services.summary_service import summary_service
+from websocket.manager import manager
+
+logger = logging.getLogger(__name__)
+
+
+class SummaryScheduler:
+    """
+    Debounced per-conversation summary regeneration.
+
+    Every activity on a conversation pushes its timer back; the summary is
+    regenerated once the conversation has been idle for the configured delay,
+    or immediately when it is marked completed. A global semaphore caps how
+    many summaries are generated at once.
+    """
+
+    def __init__(self):
+        self.enabled = settings.auto_summary_enabled
+        self.idle_seconds = settings.auto_summary_idle_seconds
+        self.max_concurrency = settings.auto_summary_max_concurrency
+        # conversation_id -> timer task still waiting out its delay
+        self._timers: Dict[str, asyncio.Task] = {}
+        self._running: Set[str] = set()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def touch(self, conversation_id: str):
+        """Record activity and (re)start the idle timer."""
+        self._schedule(conversation_id, self.idle_seconds)
+
+    def schedule_now(self, conversation_id: str):
+        """Regenerate as soon as a worker slot is free."""
+        self._schedule(conversation_id, 0)
+
+    def _schedule(self, conversation_id: str, delay: float):
+        if not self.enabled:
+            return
+
+        timer = self._timers.pop(conversation_id, None)
+        if timer is not None:
+            timer.cancel()
+
+        self._timers[conversation_id] = asyncio.create_task(
+            self._run_after(conversation_id, delay)
+        )
+
+    async def _run_after(self, conversation_id: str, delay: float):
+        await asyncio.sleep(delay)
+
+        # Past the debounce window: from here on the run is no longer cancellable
+        if self._timers.get(conversation_id) is asyncio.current_task():
+            del self._timers[conversation_id]
+
+        if conversation_id in self._running:
+            # Already summarizing; pick up the newer messages afterwards
+            self.touch(conversation_id)
+            return
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        self._running.add(conversation_id)
+        try:
+            async with self._semaphore:
+                await self._summarize(conversation_id)
+        finally:
+            self._running.discard(conversation_id)
+
+    async def _summarize(self, conversation_id: str):
+        db = SessionLocal()
+        try:
+            summary = await summary_service.generate_summary(db, conversation_id)
+        except Exception as e:
+            logger.error(f"Auto-summary failed for {conversation_id}: {e}")
+            return
+        finally:
+            db.close()
+
+        await manager.broadcast(conversation_id, {
+            "type": "summary_updated",
+            "data": {"conversation_id": conversation_id, "summary": summary},
+        })
+        logger.info(f"Auto-summary updated for {conversation_id}")
+
+    async def shutdown(self):
+        """Cancel pending timers."""
+        timers = list(self._timers.values())
+        self._timers.clear()
+        for timer in timers:
+            timer.cancel()
+        await asyncio.gather(*timers, return_exceptions=True)
+
+
+# Singleton instance
+summary_scheduler = SummaryScheduler()
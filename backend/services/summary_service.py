@@ -1,14 +1,27 @@
+import asyncio
 import json
-from typing import List
+from typing import Dict, List, Optional
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
+from config import settings
 from services.openrouter_client import OpenRouterClient
-from prompts.summary import get_summary_prompt
+from services.token_budget import estimate_tokens, split_by_token_budget
+from services.transcript_compaction import compact_transcript
+from prompts.summary import (
+    get_summary_prompt,
+    get_summary_reduce_prompt,
+    get_summary_update_prompt,
+)
 from models.conversation import Conversation
 from models.message import Message
 import logging
 
 logger = logging.getLogger(__name__)
 
+LIST_FIELDS = ("symptoms", "medications", "allergies")
+TEXT_FIELDS = ("chief_complaint", "duration", "follow_up")
+NOT_DISCUSSED = "Not discussed"
+
 
 class SummaryService:
     """Service for generating medical summaries from conversations."""
@@ -16,13 +29,18 @@ class SummaryService:
     def __init__(self):
         self.client = OpenRouterClient()
 
+    def _build_conversation_lines(self, messages: List[Message]) -> List[str]:
+        """Build compacted transcript lines (one per speaker turn)."""
+        result = compact_transcript([(msg.role, msg.original_text) for msg in messages])
+        logger.info(
+            f"Transcript compaction: {result.original_tokens} -> {result.compacted_tokens} "
+            f"tokens ({result.tokens_saved} saved)"
+        )
+        return result.lines
+
     def _build_conversation_text(self, messages: List[Message]) -> str:
         """Build conversation text from messages."""
-        lines = []
-        for msg in messages:
-            role = "Doctor" if msg.role == "doctor" else "Patient"
-            lines.append(f"{role}: {msg.original_text}")
-        return "\n".join(lines)
+        return "\n".join(self._build_conversation_lines(messages))
 
     def _extract_json(self, response: str) -> str:
         """Extract JSON from response, handling markdown code blocks."""
@@ -38,6 +56,115 @@ class SummaryService:
                 response = response[:-3]
         return response.strip()
 
+    async def _request_summary(self, messages_prompt: List[Dict]) -> dict:
+        """Run a summary prompt and parse the JSON response."""
+        response = await self.client.chat_completion(
+            messages=messages_prompt,
+            model="flash",
+            temperature=0.5,
+            max_tokens=1000,
+        )
+        # Parse JSON response (handle markdown code blocks)
+        return json.loads(self._extract_json(response))
+
+    def _merge_summaries(self, summaries: List[dict]) -> Optional[dict]:
+        """
+        Merge partial summaries without an LLM call where possible.
+
+        List fields are unioned in order. Text fields are merged only when the
+        parts agree (ignoring "Not discussed"); otherwise None is returned so
+        the caller can fall back to an LLM reduce step.
+        """
+        merged = {}
+        for field in LIST_FIELDS:
+            seen = set()
+            values = []
+            for summary in summaries:
+                for item in summary.get(field) or []:
+                    key = str(item).strip().lower()
+                    if key and key not in seen:
+                        seen.add(key)
+                        values.append(item)
+            merged[field] = values
+
+        for field in TEXT_FIELDS:
+            values = {}
+            for summary in summaries:
+                value = str(summary.get(field) or "").strip()
+                if value and value.lower() != NOT_DISCUSSED.lower():
+                    values.setdefault(value.lower(), value)
+            if len(values) > 1:
+                return None
+            merged[field] = next(iter(values.values()), NOT_DISCUSSED)
+
+        return merged
+
+    async def _summarize_chunked(
+        self,
+        lines: List[str],
+        previous_summary: Optional[dict] = None,
+    ) -> dict:
+        """Map-reduce summary for transcripts larger than the chunk budget."""
+        chunks = split_by_token_budget(lines, settings.summary_chunk_tokens)
+        semaphore = asyncio.Semaphore(settings.summary_max_concurrency)
+        logger.info(f"Summarizing {len(lines)} lines in {len(chunks)} chunks")
+
+        async def summarize_chunk(chunk: List[str]) -> dict:
+            async with semaphore:
+                return await self._request_summary(get_summary_prompt("\n".join(chunk)))
+
+        partials = list(await asyncio.gather(*(summarize_chunk(c) for c in chunks)))
+        if previous_summary is not None:
+            partials.insert(0, previous_summary)
+
+        merged = self._merge_summaries(partials)
+        if merged is not None:
+            return merged
+
+        # Parts disagree on free-text fields; let the model reconcile them once
+        return await self._request_summary(
+            get_summary_reduce_prompt(json.dumps(partials, ensure_ascii=False))
+        )
+
+    async def _summarize_lines(
+        self,
+        lines: List[str],
+        previous_summary: Optional[dict] = None,
+    ) -> dict:
+        """Summarize transcript lines, chunking long transcripts."""
+        if not lines:
+            # Only pleasantries and placeholders; nothing for the model to add
+            if previous_summary is not None:
+                return previous_summary
+            return {
+                "chief_complaint": "No conversation yet",
+                "symptoms": [],
+                "duration": "Not discussed",
+                "medications": [],
+                "allergies": [],
+                "follow_up": "Not discussed",
+            }
+
+        conversation_text = "\n".join(lines)
+        if estimate_tokens(conversation_text) > settings.summary_chunk_tokens:
+            return await self._summarize_chunked(lines, previous_summary)
+
+        # Merge into the previous summary when there is one
+        if previous_summary is not None:
+            return await self._request_summary(
+                get_summary_update_prompt(json.dumps(previous_summary), conversation_text)
+            )
+        return await self._request_summary(get_summary_prompt(conversation_text))
+
+    def _load_previous_summary(self, conversation: Conversation) -> Optional[dict]:
+        """Return the stored summary if it carries a usable watermark."""
+        if not conversation.summary or conversation.summary_watermark_at is None:
+            return None
+        try:
+            return json.loads(conversation.summary)
+        except json.JSONDecodeError:
+            return None
+
     async def generate_summary(
         self,
         db: Session,
@@ -46,6 +173,10 @@ class SummaryService:
         """
         Generate a medical summary from a conversation.
 
+        The stored summary keeps a watermark of the last message it covers, so
+        later calls only send newer messages to be merged into it, and return
+        the stored summary without an LLM call when nothing has changed.
+
         Args:
             db: Database session
             conversation_id: Conversation ID
@@ -63,12 +194,23 @@ class SummaryService:
         if not conversation:
             raise ValueError("Conversation not found")
 
-        messages = (
-            db.query(Message)
-            .filter(Message.conversation_id == conversation_id)
-            .order_by(Message.created_at.asc())
-            .all()
-        )
+        previous_summary = self._load_previous_summary(conversation)
+
+        query = db.query(Message).filter(Message.conversation_id == conversation_id)
+        if previous_summary is not None:
+            # Only messages after the watermark, in the same (created_at, id) order
+            query = query.filter(or_(
+                Message.created_at > conversation.summary_watermark_at,
+                and_(
+                    Message.created_at == conversation.summary_watermark_at,
+                    Message.id > conversation.summary_message_id,
+                ),
+            ))
+        messages = query.order_by(Message.created_at.asc(), Message.id.asc()).all()
+
+        if previous_summary is not None and not messages:
+            # Nothing new since the last summary
+            return previous_summary
 
         if not messages:
             # Return empty summary
@@ -82,24 +224,15 @@ class SummaryService:
             }
 
         try:
-            # Build conversation text
-            conversation_text = self._build_conversation_text(messages)
-
-            # Get summary from AI
-            messages_prompt = get_summary_prompt(conversation_text)
-            response = await self.client.chat_completion(
-                messages=messages_prompt,
-                model="flash",
-                temperature=0.5,
-                max_tokens=1000,
-            )
-
-            # Parse JSON response (handle markdown code blocks)
-            json_text = self._extract_json(response)
-            summary_data = json.loads(json_text)
+            # Build conversation text and get summary from AI
+            lines = self._build_conversation_lines(messages)
+            summary_data = await self._summarize_lines(lines, previous_summary)
 
-            # Update conversation with summary
+            # Update conversation with summary and move the watermark
+            last_message = messages[-1]
             conversation.summary = json.dumps(summary_data)
+            conversation.summary_message_id = last_message.id
+            conversation.summary_watermark_at = last_message.created_at
             db.commit()
 
             return summary_data
@@ -0,0 +1,34 @@
+"""Rough token accounting for building prompts within a budget."""
+from typing import List
+
+# Average characters per token for the models we use; good enough for budgeting
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in a piece of text."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def split_by_token_budget(lines: List[str], budget: int) -> List[List[str]]:
+    """
+    Group lines into consecutive chunks that each fit the token budget.
+
+    A single line larger than the budget gets a chunk of its own.
+    """
+    chunks: List[List[str]] = []
+    current: List[str] = []
+    current_tokens = 0
+
+    for line in lines:
+        tokens = estimate_tokens(line)
+        if current and current_tokens + tokens > budget:
+            chunks.append(current)
+            current = []
+            current_tokens = 0
+        current.append(line)
+        current_tokens += tokens
+
+    if current:
+        chunks.append(current)
+    return chunks
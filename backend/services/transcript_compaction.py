@@ -0,0 +1,148 @@
+"""Shrink conversation transcripts before they are sent for summarization."""
+import re
+from dataclasses import dataclass
+from typing import List, Sequence, Set, Tuple
+
+from services.token_budget import estimate_tokens
+
+# Placeholders written by the WebSocket handler when there is no real text
+PLACEHOLDERS = {"[Empty message]", "[Transcription failed]"}
+
+# Stock pleasantries with no clinical content, compared after normalization.
+# Answers are deliberately absent, including acknowledgements ("ok", "sure",
+# "claro") and "I'm fine": they answer clinical questions.
+PLEASANTRIES = {
+    # English
+    "hi", "hello", "hey", "thanks", "thank you",
+    "thank you doctor", "thanks doctor", "good morning", "good afternoon", "good evening",
+    "goodbye", "bye", "you're welcome", "you are welcome", "nice to meet you",
+    "how are you", "uh", "um", "hmm", "mm",
+    # Spanish
+    "hola", "gracias", "muchas gracias", "gracias doctor", "buenos días", "buenas tardes",
+    "buenas noches", "adiós", "de nada", "mucho gusto",
+    # French
+    "bonjour", "bonsoir", "merci", "merci docteur", "au revoir", "de rien",
+    # Vietnamese, Korean, Chinese, Arabic
+    "xin chào", "cảm ơn", "cảm ơn bác sĩ", "안녕하세요", "감사합니다",
+    "你好", "谢谢", "谢谢医生", "مرحبا", "شكرا", "شكرًا",
+}
+
+# Very short turns ("No.", "Twice a day.") repeat legitimately as answers
+MIN_DUPLICATE_WORDS = 4
+
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?。！？])\s+")
+NORMALIZE_STRIP = re.compile(r"[^\w\s']", re.UNICODE)
+
+
+@dataclass
+class CompactionResult:
+    """Compacted transcript lines and token accounting."""
+    lines: List[str]
+    original_tokens: int
+    compacted_tokens: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.original_tokens - self.compacted_tokens
+
+
+def _label(role: str) -> str:
+    return "Doctor" if role == "doctor" else "Patient"
+
+
+def _normalize(text: str) -> str:
+    return " ".join(NORMALIZE_STRIP.sub(" ", text.lower()).split())
+
+
+def _strip_pleasantries(text: str) -> str:
+    """Drop sentences that are only a greeting, thanks or filler."""
+    sentences = SENTENCE_SPLIT.split(text.strip())
+    kept = [s for s in sentences if _normalize(s) and _normalize(s) not in PLEASANTRIES]
+    return " ".join(kept)
+
+
+def _shingles(text: str) -> Set[str]:
+    """Word bigrams (or single words for very short texts)."""
+    words = _normalize(text).split()
+    if len(words) < 2:
+        return set(words)
+    return {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+
+def _similarity(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _is_recent_duplicate(
+    role: str,
+    shingles: Set[str],
+    kept: List[Tuple[str, str, Set[str]]],
+    window_tokens: int,
+    threshold: float,
+) -> bool:
+    """
+    Check the most recent kept turns, up to window_tokens, for a near-duplicate.
+
+    Only turns by the same role count: a patient repeating the doctor's
+    question ("Chest pain when I walk?") is still the patient's answer.
+    """
+    seen_tokens = 0
+    for previous_role, previous_text, previous_shingles in reversed(kept):
+        if previous_role == role and _similarity(shingles, previous_shingles) >= threshold:
+            return True
+        seen_tokens += estimate_tokens(previous_text)
+        if seen_tokens >= window_tokens:
+            break
+    return False
+
+
+def compact_transcript(
+    turns: Sequence[Tuple[str, str]],
+    dedupe_window_tokens: int = 2000,
+    duplicate_threshold: float = 0.85,
+    max_line_tokens: int = 500,
+) -> CompactionResult:
+    """
+    Compact (role, text) turns into transcript lines.
+
+    Removes placeholders and stock pleasantries, drops turns that nearly
+    repeat something the same speaker said within the last dedupe_window_tokens, and merges
+    consecutive turns by the same role into one line of at most
+    max_line_tokens, so long transcripts can still be chunked by line.
+    """
+    original_tokens = sum(
+        estimate_tokens(f"{_label(role)}: {text}") for role, text in turns
+    )
+
+    # (role, text, shingles) of kept turns, most recent last
+    kept: List[Tuple[str, str, Set[str]]] = []
+    for role, text in turns:
+        if not text or text.strip() in PLACEHOLDERS:
+            continue
+
+        text = _strip_pleasantries(text)
+        if not text:
+            continue
+
+        shingles = _shingles(text)
+        if len(_normalize(text).split()) >= MIN_DUPLICATE_WORDS and _is_recent_duplicate(
+            role, shingles, kept, dedupe_window_tokens, duplicate_threshold
+        ):
+            continue
+
+        kept.append((role, text, shingles))
+
+    # Merge consecutive turns by the same speaker
+    lines: List[str] = []
+    previous_role = None
+    for role, text, _ in kept:
+        if role == previous_role and estimate_tokens(f"{lines[-1]} {text}") <= max_line_tokens:
+            lines[-1] = f"{lines[-1]} {text}"
+        else:
+            lines.append(f"{_label(role)}: {text}")
+        previous_role = role
+
+    compacted_tokens = sum(estimate_tokens(line) for line in lines)
+    return CompactionResult(lines, original_tokens, compacted_tokens)
@@ -3,8 +3,8 @@ import base64
 import logging
 from pathlib import Path
 from typing import Optional
-import httpx
 from config import settings
+from services.openrouter_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -14,7 +14,7 @@ class TranscriptionService:
 
     def __init__(self):
         self.api_key = settings.openrouter_api_key
-        self.base_url = "https://openrouter.ai/api/v1"
+        self.base_url = settings.openrouter_base_url
         self.model = "google/gemini-2.5-flash"
 
     def _get_headers(self) -> dict:
@@ -86,21 +86,21 @@ class TranscriptionService:
                 "max_tokens": 1000,
             }
 
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/chat/completions",
-                    headers=self._get_headers(),
-                    json=payload,
-                )
-
-                if response.status_code != 200:
-                    logger.error(f"Transcription API error: {response.status_code} - {response.text}")
-                    return None
-
-                data = response.json()
-                transcription = data["choices"][0]["message"]["content"].strip()
-                logger.info(f"Transcription successful: {transcription[:100]}...")
-                return transcription
+            response = await get_http_client().post(
+                f"{self.base_url}/chat/completions",
+                headers=self._get_headers(),
+                json=payload,
+                timeout=60.0,
+            )
+
+            if response.status_code != 200:
+                logger.error(f"Transcription API error: {response.status_code} - {response.text}")
+                return None
+
+            data = response.json()
+            transcription = data["choices"][0]["message"]["content"].strip()
+            logger.info(f"Transcription successful: {transcription[:100]}...")
+            return transcription
 
         except Exception as e:
             logger.error(f"Transcription failed: {e}")
@@ -0,0 +1,348 @@
+"""Fuzzy translation memory built from persisted messages."""
+import asyncio
+import logging
+import re
+from array import array
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, func, or_, select
+
+from config import settings
+from database import SessionLocal
+from models.conversation import Conversation
+from models.message import Message
+
+logger = logging.getLogger(__name__)
+
+NUMBER = re.compile(r"\d+(?:[.,]\d+)*")
+
+# Candidates scored exactly after the trigram vote
+MAX_CANDIDATES = 50
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.split())
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f" {text.lower()} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def fill_number_slots(text: str, original: str, translated: str) -> Optional[str]:
+    """
+    Adapt a stored translation to text that differs from its original only in numbers.
+
+    "Take 3 tablets daily" with the pair ("Take 2 tablets daily",
+    "Tome 2 tabletas al día") gives "Tome 3 tabletas al día". Returns None
+    unless every changed number maps unambiguously onto the translation.
+    """
+    if NUMBER.sub("#", text) != NUMBER.sub("#", original):
+        return None
+
+    changes: Dict[str, str] = {}
+    for old, new in zip(NUMBER.findall(original), NUMBER.findall(text)):
+        if old != new and changes.setdefault(old, new) != new:
+            return None
+
+    original_counts = Counter(NUMBER.findall(original))
+    translated_counts = Counter(NUMBER.findall(translated))
+    for old in changes:
+        if translated_counts[old] != original_counts[old]:
+            # The number was spelled out, reformatted or repeated differently
+            return None
+
+    return NUMBER.sub(lambda match: changes.get(match.group(), match.group()), translated)
+
+
+@dataclass
+class MemoryMatch:
+    """What the memory knows about a text about to be translated."""
+    # A stored translation that can be used as is (exact or number-adapted)
+    reuse: Optional[str] = None
+    # Similar (original, translation) pairs, most similar first
+    examples: List[Tuple[str, str]] = field(default_factory=list)
+
+
+class _PairIndex:
+    """
+    Originals and translations of one language pair, indexed by character trigrams.
+
+    Trigrams are stored as integer ids in compact arrays rather than as
+    sets of strings: an entry's trigrams and each posting list are an array
+    of 4-byte ints.
+    """
+
+    __slots__ = (
+        "max_entries", "gram_ids", "entries", "postings", "by_text", "by_template", "by_conversation", "next_id",
+    )
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        # trigram -> id
+        self.gram_ids: Dict[str, int] = {}
+        # entry id -> (original, translated, conversation id, sorted trigram ids), oldest first
+        self.entries: "OrderedDict[int, Tuple[str, str, str, array]]" = OrderedDict()
+        # trigram id -> entry ids, oldest first
+        self.postings: Dict[int, array] = {}
+        self.by_text: Dict[str, int] = {}
+        # original with its numbers replaced by "#" -> newest entry id (only originals with numbers)
+        self.by_template: Dict[str, int] = {}
+        self.by_conversation: Dict[str, Set[int]] = {}
+        self.next_id = 0
+
+    def add(self, original: str, translated: str, conversation_id: str):
+        original = _normalize(original)
+        if original in self.by_text:
+            # The newest translation of a text wins
+            self._remove(self.by_text[original])
+
+        entry_id = self.next_id
+        self.next_id += 1
+        gram_ids = self.gram_ids
+        grams = array("I", sorted({gram_ids.setdefault(gram, len(gram_ids)) for gram in _trigrams(original)}))
+        self.entries[entry_id] = (original, translated.strip(), conversation_id, grams)
+        self.by_text[original] = entry_id
+        self.by_conversation.setdefault(conversation_id, set()).add(entry_id)
+        if NUMBER.search(original):
+            self.by_template[NUMBER.sub("#", original)] = entry_id
+        for gram in grams:
+            posting = self.postings.get(gram)
+            if posting is None:
+                posting = self.postings[gram] = array("I")
+            posting.append(entry_id)
+
+        while len(self.entries) > self.max_entries:
+            self._remove(next(iter(self.entries)))
+
+    def get(self, original: str) -> Optional[str]:
+        entry_id = self.by_text.get(original)
+        return self.entries[entry_id][1] if entry_id is not None else None
+
+    def get_template(self, text: str) -> Optional[Tuple[str, str]]:
+        """(original, translated) of the newest entry that differs from text at most in numbers."""
+        entry_id = self.by_template.get(NUMBER.sub("#", text))
+        if entry_id is None:
+            return None
+        original, translated, _, _ = self.entries[entry_id]
+        return original, translated
+
+    def _remove(self, entry_id: int):
+        original, _, conversation_id, grams = self.entries.pop(entry_id)
+        del self.by_text[original]
+        conversation_entries = self.by_conversation[conversation_id]
+        conversation_entries.discard(entry_id)
+        if not conversation_entries:
+            del self.by_conversation[conversation_id]
+        template = NUMBER.sub("#", original)
+        if self.by_template.get(template) == entry_id:
+            del self.by_template[template]
+        for gram in grams:
+            posting = self.postings[gram]
+            # Evictions remove the oldest entry, which is found at the front
+            posting.remove(entry_id)
+            if not posting:
+                del self.postings[gram]
+
+    def search(
+        self,
+        text: str,
+        limit: int,
+        min_similarity: float,
+        conversation_id: Optional[str] = None,
+    ) -> List[Tuple[float, str, str]]:
+        """
+        (Dice similarity, original, translated) of the closest entries,
+        only among a conversation's own entries if conversation_id is given.
+
+        Runs in a thread while the event loop may add entries; entries
+        removed in the meantime are skipped.
+        """
+        grams = _trigrams(text)
+        if not grams:
+            return []
+        ids = {self.gram_ids[gram] for gram in grams if gram in self.gram_ids}
+
+        if conversation_id is not None:
+            # A conversation has few entries: score them all
+            candidates = list(self.by_conversation.get(conversation_id, ()))
+        else:
+            # Each shared trigram is a vote. Only the rarer half of the trigrams
+            # vote: common ones carry little signal but most of the cost, and any
+            # entry similar enough to return shares many of the rare ones too.
+            postings = sorted(
+                (posting for posting in map(self.postings.get, ids) if posting is not None),
+                key=len,
+            )
+            votes: Counter = Counter()
+            for posting in postings[:max(1, (len(postings) + 1) // 2)]:
+                votes.update(posting)
+            candidates = [entry_id for entry_id, _ in votes.most_common(MAX_CANDIDATES)]
+
+        results = []
+        for entry_id in candidates:
+            entry = self.entries.get(entry_id)
+            if entry is None:
+                continue
+            original, translated, _, entry_grams = entry
+            similarity = 2 * len(ids.intersection(entry_grams)) / (len(grams) + len(entry_grams))
+            if similarity >= min_similarity:
+                results.append((similarity, original, translated))
+        results.sort(key=lambda result: result[0], reverse=True)
+        return results[:limit]
+
+
+class TranslationMemory:
+    """
+    Past translations per language pair, for few-shot prompting and reuse.
+
+    Each pair is loaded from persisted messages in the background on first
+    use and grows as new messages are saved. Lookups return a stored
+    translation to reuse outright when the text matches an earlier original
+    exactly or up to numbers, and otherwise the most similar pairs as
+    examples for the prompt, which keeps terminology consistent.
+
+    Examples contain what was said, so by default they only come from the
+    same conversation; shared_examples also uses other conversations'
+    messages. Texts longer than max_chars (free-text history rather than
+    stock phrases) are never stored.
+    """
+
+    def __init__(self):
+        self.enabled = settings.translation_memory_enabled
+        self.max_entries = settings.translation_memory_max_entries
+        self.min_similarity = settings.translation_memory_min_similarity
+        self.max_examples = settings.translation_memory_examples
+        self.max_chars = settings.translation_memory_max_chars
+        self.shared_examples = settings.translation_memory_shared_examples
+        self._indexes: Dict[Tuple[str, str], _PairIndex] = {}
+        self._loading: Dict[Tuple[str, str], asyncio.Task] = {}
+        self.reused = 0
+        self.prompted = 0
+
+    def _index(self, source_language: str, target_language: str) -> Optional[_PairIndex]:
+        """A pair's index, or None until it has loaded (the first call starts the load)."""
+        pair = (source_language, target_language)
+        index = self._indexes.get(pair)
+        if index is None and pair not in self._loading:
+            task = self._loading[pair] = asyncio.create_task(asyncio.to_thread(self._load, pair))
+            task.add_done_callback(lambda done: self._loaded(pair, done))
+        return index
+
+    def _loaded(self, pair: Tuple[str, str], task: asyncio.Task):
+        self._loading.pop(pair, None)
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            # The next lookup retries
+            logger.error(f"Failed to load translation memory {pair[0]}->{pair[1]}: {task.exception()}")
+            return
+        self._indexes.setdefault(pair, task.result())
+
+    def _load(self, pair: Tuple[str, str]) -> _PairIndex:
+        """Build a pair's index from its most recent persisted messages (runs in a thread)."""
+        source_language, target_language = pair
+        sent_by_doctor = and_(
+            Message.role == "doctor",
+            Conversation.doctor_language == source_language,
+            Conversation.patient_language == target_language,
+        )
+        sent_by_patient = and_(
+            Message.role == "patient",
+            Conversation.patient_language == source_language,
+            Conversation.doctor_language == target_language,
+        )
+
+        db = SessionLocal()
+        try:
+            rows = db.execute(
+                select(Message.original_text, Message.translated_text, Message.conversation_id)
+                .join(Conversation, Conversation.id == Message.conversation_id)
+                .where(or_(sent_by_doctor, sent_by_patient))
+                # Untranslated fallbacks are not translations
+                .where(Message.translated_text != Message.original_text)
+                .where(func.length(Message.original_text) <= self.max_chars)
+                .order_by(Message.created_at.desc())
+                .limit(self.max_entries)
+            ).all()
+        finally:
+            db.close()
+
+        index = _PairIndex(self.max_entries)
+        for original, translated, conversation_id in reversed(rows):
+            index.add(original, translated, conversation_id)
+        logger.info(f"Loaded translation memory {source_language}->{target_language}: {len(rows)} entries")
+        return index
+
+    async def lookup(
+        self,
+        text: str,
+        source_language: str,
+        target_language: str,
+        conversation_id: Optional[str] = None,
+    ) -> MemoryMatch:
+        """Find a reusable translation or similar examples for text sent in a conversation."""
+        if not self.enabled or len(text) > self.max_chars:
+            return MemoryMatch()
+
+        index = self._index(source_language, target_language)
+        if index is None:
+            # Still loading: translate without the memory rather than wait
+            return MemoryMatch()
+
+        text = _normalize(text)
+        exact = index.get(text)
+        if exact is not None:
+            self.reused += 1
+            return MemoryMatch(reuse=exact)
+
+        template = index.get_template(text)
+        if template is not None:
+            reuse = fill_number_slots(text, *template)
+            if reuse is not None:
+                self.reused += 1
+                return MemoryMatch(reuse=reuse)
+
+        if not self.shared_examples:
+            if conversation_id is None:
+                return MemoryMatch()
+            matches = index.search(text, self.max_examples, self.min_similarity, conversation_id)
+        else:
+            # Scoring takes milliseconds on a full index; keep it off the event loop
+            matches = await asyncio.to_thread(index.search, text, self.max_examples, self.min_similarity)
+        if matches:
+            self.prompted += 1
+        return MemoryMatch(examples=[(original, translated) for _, original, translated in matches])
+
+    def add(
+        self,
+        original: str,
+        translated: str,
+        source_language: str,
+        target_language: str,
+        conversation_id: str,
+    ):
+        """Remember a persisted translation (ignored until the pair has been loaded)."""
+        if not self.enabled or not original.strip() or translated.strip() == original.strip():
+            return
+        if len(original) > self.max_chars:
+            return
+        # Unloaded pairs pick the message up from the database when they load
+        index = self._indexes.get((source_language, target_language))
+        if index is not None:
+            index.add(original, translated, conversation_id)
+
+    def get_metrics(self) -> dict:
+        return {
+            "pairs": len(self._indexes),
+            "loading": len(self._loading),
+            "entries": sum(len(index.entries) for index in self._indexes.values()),
+            "reused": self.reused,
+            "prompted": self.prompted,
+        }
+
+
+# Singleton instance
+translation_memory = TranslationMemory()
@@ -1,4 +1,8 @@
+from typing import Optional
+from config import settings
+from services.circuit_breaker import CircuitBreaker
 from services.openrouter_client import OpenRouterClient
+from services.translation_memory import MemoryMatch, translation_memory
 from prompts.translation import get_translation_prompt
 import logging
 
@@ -10,12 +14,20 @@ class TranslationService:
 
     def __init__(self):
         self.client = OpenRouterClient()
+        # Skips the LLM while it is failing, so callers fall back at once
+        self.breaker = CircuitBreaker(
+            "translation",
+            threshold=settings.translation_breaker_threshold,
+            cooldown_seconds=settings.translation_breaker_cooldown_seconds,
+        )
 
     async def translate(
         self,
         text: str,
         source_language: str,
         target_language: str,
+        fallback: bool = True,
+        conversation_id: Optional[str] = None,
     ) -> dict:
         """
         Translate text from source language to target language.
@@ -24,6 +36,10 @@ class TranslationService:
             text: Text to translate
             source_language: Source language code (en, es, etc.)
             target_language: Target language code (en, es, etc.)
+            fallback: Return the original text if translation fails,
+                instead of raising
+            conversation_id: Conversation the text was sent in; translation
+                memory examples are drawn from it
 
         Returns:
             Dict with original_text, translated_text, source_language, target_language
@@ -46,12 +62,32 @@ class TranslationService:
             }
 
         try:
-            messages = get_translation_prompt(source_language, target_language, text)
-            translated = await self.client.chat_completion(
-                messages=messages,
-                model="flash",
-                temperature=0.3,  # Lower temp for more consistent translations
-            )
+            match = await translation_memory.lookup(text, source_language, target_language, conversation_id)
+        except Exception as e:
+            logger.warning(f"Translation memory lookup failed: {e}")
+            match = MemoryMatch()
+
+        if match.reuse is not None:
+            return {
+                "original_text": text,
+                "translated_text": match.reuse,
+                "source_language": source_language,
+                "target_language": target_language,
+            }
+
+        try:
+            self.breaker.check()
+            messages = get_translation_prompt(source_language, target_language, text, match.examples)
+            try:
+                translated = await self.client.chat_completion(
+                    messages=messages,
+                    model="flash",
+                    temperature=0.3,  # Lower temp for more consistent translations
+                )
+            except Exception:
+                self.breaker.record_failure()
+                raise
+            self.breaker.record_success()
 
             return {
                 "original_text": text,
@@ -62,6 +98,8 @@ class TranslationService:
 
         except Exception as e:
             logger.error(f"Translation failed: {e}")
+            if not fallback:
+                raise
             # Return original text as fallback
             return {
                 "original_text": text,
@@ -0,0 +1,173 @@
+"""Tests for cross-worker broadcast fan-out."""
+import asyncio
+import json
+
+from websocket.manager import ConnectionManager
+from websocket.pubsub import InMemoryHub, InMemoryPubSub, RespPubSub
+from websocket.pubsub_broker import LocalBroker
+
+
+class FakeWebSocket:
+    """Records the frames a connection is sent."""
+
+    def __init__(self):
+        self.scope = {"subprotocols": []}
+        self.received = []
+
+    async def accept(self, subprotocol=None):
+        pass
+
+    async def send_text(self, text: str):
+        self.received.append(json.loads(text))
+
+    async def close(self, code: int = 1000, reason=None):
+        pass
+
+
+async def wait_until(condition, timeout: float = 2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+def test_broadcast_reaches_connections_on_other_manager():
+    async def scenario():
+        hub = InMemoryHub()
+        first, second = ConnectionManager(InMemoryPubSub(hub)), ConnectionManager(InMemoryPubSub(hub))
+        await first.start()
+        await second.start()
+        sender, local, remote, elsewhere = FakeWebSocket(), FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+        await first.connect(sender, "c1")
+        await first.connect(local, "c1")
+        await second.connect(remote, "c1")
+        await second.connect(elsewhere, "c2")
+
+        await first.broadcast("c1", {"type": "typing", "data": {"role": "doctor"}}, exclude=sender)
+        await second.broadcast("c1", {"type": "typing", "data": {"role": "patient"}})
+        await wait_until(lambda: len(local.received) == 2 and len(remote.received) == 2)
+        await asyncio.sleep(0.05)
+
+        # exclude only skips the sender's own socket, not the other workers'
+        assert [m["data"]["role"] for m in sender.received] == ["patient"]
+        assert [m["data"]["role"] for m in local.received] == ["doctor", "patient"]
+        assert [m["data"]["role"] for m in remote.received] == ["doctor", "patient"]
+        assert elsewhere.received == []
+
+        await first.stop()
+        await second.stop()
+
+    asyncio.run(scenario())
+
+
+def test_control_messages_reach_other_managers_but_not_sockets():
+    async def scenario():
+        hub = InMemoryHub()
+        first, second = ConnectionManager(InMemoryPubSub(hub)), ConnectionManager(InMemoryPubSub(hub))
+        invalidated = []
+        second.on_control("invalidate", invalidated.append)
+        await first.start()
+        await second.start()
+        remote = FakeWebSocket()
+        await second.connect(remote, "c1")
+
+        await first.publish_control("c1", "invalidate")
+        await asyncio.sleep(0.05)
+
+        assert invalidated == ["c1"]
+        assert remote.received == []
+
+        await first.stop()
+        await second.stop()
+
+    asyncio.run(scenario())
+
+
+def test_single_manager_is_not_shared():
+    async def scenario():
+        pubsub = InMemoryPubSub(InMemoryHub())
+        manager = ConnectionManager(pubsub)
+        await manager.start()
+        assert not pubsub.shared
+        await manager.stop()
+
+    asyncio.run(scenario())
+
+
+def test_resp_pubsub_fans_out_through_local_broker():
+    async def scenario():
+        broker = LocalBroker()
+        server = await broker.start(port=0)
+        url = f"redis://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+        first, second = RespPubSub(url), RespPubSub(url)
+        got_first, got_second = [], []
+
+        async def on_first(conversation_id, message):
+            got_first.append((conversation_id, message))
+
+        async def on_second(conversation_id, message):
+            got_second.append((conversation_id, message))
+
+        await first.start(on_first)
+        await second.start(on_second)
+        await wait_until(lambda: len(broker.channels.get(first.channel, ())) == 2)
+
+        await first.publish("c1", {"type": "new_message", "seq": 1})
+        await wait_until(lambda: got_second)
+        await asyncio.sleep(0.05)
+
+        assert got_second == [("c1", {"type": "new_message", "seq": 1})]
+        # Backends never hand a process its own messages back
+        assert got_first == []
+
+        await first.stop()
+        await second.stop()
+        await broker.stop()
+
+    asyncio.run(scenario())
+
+
+def test_resp_pubsub_reconnects_after_broker_restart(tmp_path):
+    async def scenario():
+        path = str(tmp_path / "pubsub.sock")
+        broker = LocalBroker()
+        await broker.start(unix_path=path)
+        publisher, subscriber = RespPubSub(f"unix://{path}"), RespPubSub(f"unix://{path}")
+        subscriber.reconnect_delay = 0.05
+        received = []
+
+        async def on_message(conversation_id, message):
+            received.append(message)
+
+        async def noop(conversation_id, message):
+            pass
+
+        await publisher.start(noop)
+        await subscriber.start(on_message)
+        await wait_until(lambda: len(broker.channels.get(subscriber.channel, ())) == 2)
+        await publisher.publish("c1", {"n": 1})
+        await wait_until(lambda: received == [{"n": 1}])
+
+        await broker.stop()
+        broker = LocalBroker()
+        await broker.start(unix_path=path)
+        await wait_until(lambda: subscriber.channel in broker.channels and broker.channels[subscriber.channel])
+
+        # The first publish after the restart may find the old connection dead;
+        # the publisher reconnects on the next one
+        async def delivered():
+            while {"n": 2} not in received:
+                await publisher.publish("c1", {"n": 2})
+                await asyncio.sleep(0.05)
+
+        await asyncio.wait_for(delivered(), 2.0)
+
+        await publisher.stop()
+        await subscriber.stop()
+        assert subscriber._subscriber_task is None
+        assert publisher._publisher is None and publisher._reply_task is None
+        # Stopped backends drop their subscriptions
+        await wait_until(lambda: not broker.channels.get(subscriber.channel))
+        await broker.stop()
+
+    asyncio.run(scenario())
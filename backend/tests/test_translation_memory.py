@@ -0,0 +1,99 @@
+"""Tests for translation memory reuse and scoping."""
+from services.translation_memory import _PairIndex, fill_number_slots
+
+
+def test_fill_number_slots_swaps_changed_number():
+    assert fill_number_slots(
+        "Take 3 tablets daily", "Take 2 tablets daily", "Tome 2 tabletas al día"
+    ) == "Tome 3 tabletas al día"
+
+
+def test_fill_number_slots_swaps_several_numbers():
+    assert fill_number_slots(
+        "Take 2 tablets 3 times a day", "Take 1 tablets 4 times a day", "Tome 1 tabletas 4 veces al día"
+    ) == "Tome 2 tabletas 3 veces al día"
+
+
+def test_fill_number_slots_keeps_unchanged_numbers():
+    assert fill_number_slots(
+        "Take 2 tablets for 10 days", "Take 2 tablets for 7 days", "Tome 2 tabletas durante 7 días"
+    ) == "Tome 2 tabletas durante 10 días"
+
+
+def test_fill_number_slots_decimals():
+    assert fill_number_slots(
+        "Take 2.5 mg at night", "Take 0.5 mg at night", "Tome 0.5 mg por la noche"
+    ) == "Tome 2.5 mg por la noche"
+
+
+def test_fill_number_slots_decimal_comma():
+    assert fill_number_slots(
+        "Prenez 2,5 mg le soir", "Prenez 0,5 mg le soir", "Take 0,5 mg in the evening"
+    ) == "Take 2,5 mg in the evening"
+
+
+def test_fill_number_slots_rejects_reformatted_decimal():
+    # "0.5" became "0,5" in the translation: nothing to substitute safely
+    assert fill_number_slots(
+        "Take 2.5 mg at night", "Take 0.5 mg at night", "Prenez 0,5 mg le soir"
+    ) is None
+
+
+def test_fill_number_slots_rejects_spelled_out_number():
+    assert fill_number_slots(
+        "Take 3 tablets daily", "Take 2 tablets daily", "Tome dos tabletas al día"
+    ) is None
+
+
+def test_fill_number_slots_rejects_ambiguous_repeated_number():
+    # The same old number would have to become two different numbers
+    assert fill_number_slots(
+        "Take 2 tablets 3 times", "Take 1 tablets 1 times", "Tome 1 tabletas 1 veces"
+    ) is None
+
+
+def test_fill_number_slots_consistent_repeated_number():
+    assert fill_number_slots(
+        "Take 2 tablets 2 times", "Take 1 tablets 1 times", "Tome 1 tabletas 1 veces"
+    ) == "Tome 2 tabletas 2 veces"
+
+
+def test_fill_number_slots_rejects_number_repeated_only_in_translation():
+    assert fill_number_slots(
+        "Take 3 tablets", "Take 2 tablets", "Tome 2 tabletas (2 en total)"
+    ) is None
+
+
+def test_fill_number_slots_rejects_different_words():
+    assert fill_number_slots(
+        "Take 3 capsules daily", "Take 2 tablets daily", "Tome 2 tabletas al día"
+    ) is None
+
+
+def test_template_lookup_finds_number_variant():
+    index = _PairIndex(max_entries=10)
+    index.add("Take 2 tablets daily", "Tome 2 tabletas al día", "c1")
+    assert index.get_template("Take 5 tablets daily") == ("Take 2 tablets daily", "Tome 2 tabletas al día")
+    assert index.get_template("Take tablets daily") is None
+
+
+def test_search_scoped_to_conversation():
+    index = _PairIndex(max_entries=10)
+    index.add("Do you have chest pain when walking?", "¿Tiene dolor de pecho al caminar?", "c1")
+    index.add("Do you have chest pain when resting?", "¿Tiene dolor de pecho en reposo?", "c2")
+
+    scoped = index.search("Do you have chest pain when running?", 3, 0.5, "c1")
+    assert [original for _, original, _ in scoped] == ["Do you have chest pain when walking?"]
+    assert len(index.search("Do you have chest pain when running?", 3, 0.5)) == 2
+
+
+def test_eviction_removes_oldest_entry():
+    index = _PairIndex(max_entries=2)
+    index.add("Take 1 tablet", "Tome 1 tableta", "c1")
+    index.add("Drink water", "Beba agua", "c1")
+    index.add("Rest at home", "Descanse en casa", "c2")
+
+    assert index.get("Take 1 tablet") is None
+    assert index.get_template("Take 4 tablet") is None
+    assert index.get("Rest at home") == "Descanse en casa"
+    assert set(index.by_conversation) == {"c1", "c2"}
@@ -0,0 +1,392 @@
+"""Lightweight span tracing for the message lifecycle.
+
+The API mirrors the parts of OpenTelemetry's tracing API the app uses
+(``get_tracer``, ``start_as_current_span``, ``set_attribute``,
+``record_exception``, W3C ``traceparent`` propagation), so call sites stay
+the same if the OpenTelemetry SDK is adopted later. Spans are exported to
+the log (``TRACING_EXPORTER=console``) or to an NDJSON file
+(``TRACING_EXPORTER=file``); no collector is needed.
+
+Independently of exporting, a root span slower than
+``SLOW_TRACE_THRESHOLD_MS`` is logged with a per-stage breakdown.
+"""
+import contextvars
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from config import settings
+from serialization import dumps
+
+logger = logging.getLogger(__name__)
+slow_logger = logging.getLogger("tracing.slow")
+
+TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+# Ended spans kept per unfinished trace for the slow-trace breakdown
+MAX_PENDING_TRACES = 10000
+
+# FileSpanExporter writes every EXPORT_INTERVAL_SECONDS, or sooner once
+# EXPORT_BATCH_SIZE spans are queued
+EXPORT_INTERVAL_SECONDS = 1.0
+EXPORT_BATCH_SIZE = 512
+MAX_QUEUED_SPANS = 10000
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+
+class StatusCode:
+    UNSET = "UNSET"
+    OK = "OK"
+    ERROR = "ERROR"
+
+
+class Span:
+    """A timed operation within a trace."""
+
+    __slots__ = (
+        "name", "trace_id", "span_id", "parent_span_id", "attributes", "events",
+        "status", "status_description", "start_time_ns", "end_time_ns",
+        "is_root", "_start", "_duration", "_provider",
+    )
+
+    def __init__(
+        self,
+        provider: "TracerProvider",
+        name: str,
+        trace_id: str,
+        parent_span_id: Optional[str],
+        attributes: Optional[Dict[str, Any]] = None,
+        is_root: bool = False,
+    ):
+        self._provider = provider
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = parent_span_id
+        # First span of the trace in this process (its parent, if any, is remote)
+        self.is_root = is_root or parent_span_id is None
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.events: List[dict] = []
+        self.status = StatusCode.UNSET
+        self.status_description: Optional[str] = None
+        self.start_time_ns = time.time_ns()
+        self.end_time_ns: Optional[int] = None
+        self._start = time.perf_counter()
+        self._duration: Optional[float] = None
+
+    @property
+    def duration_ms(self) -> float:
+        end = self._duration if self._duration is not None else time.perf_counter() - self._start
+        return end * 1000
+
+    def is_recording(self) -> bool:
+        return self.end_time_ns is None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes: Dict[str, Any]):
+        self.attributes.update(attributes)
+
+    def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None):
+        self.events.append({"name": name, "time_unix_nano": time.time_ns(), "attributes": attributes or {}})
+
+    def set_status(self, status: str, description: Optional[str] = None):
+        self.status = status
+        self.status_description = description
+
+    def record_exception(self, exception: BaseException):
+        self.add_event("exception", {
+            "exception.type": type(exception).__name__,
+            "exception.message": str(exception),
+        })
+        self.set_status(StatusCode.ERROR, str(exception))
+
+    def end(self):
+        if self.end_time_ns is not None:
+            return
+        self._duration = time.perf_counter() - self._start
+        self.end_time_ns = time.time_ns()
+        self._provider.on_end(self)
+
+    def traceparent(self) -> str:
+        """W3C trace context header value for this span."""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "start_time_unix_nano": self.start_time_ns,
+            "end_time_unix_nano": self.end_time_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "events": self.events,
+            "status": {"code": self.status, "description": self.status_description},
+        }
+
+
+class ConsoleSpanExporter:
+    """Writes finished spans to the log as JSON."""
+
+    def export(self, span: Span):
+        logger.info(f"span {dumps(span.to_dict())}")
+
+    def shutdown(self):
+        pass
+
+
+class FileSpanExporter:
+    """
+    Appends finished spans to an NDJSON file.
+
+    export() only queues the span; a background thread writes the queue
+    in batches, so no file I/O happens on the event loop. Spans beyond
+    MAX_QUEUED_SPANS (a stalled disk) are dropped and counted.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.dropped = 0
+        self._queue: List[dict] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+    def export(self, span: Span):
+        with self._lock:
+            if self._stopping:
+                return
+            if len(self._queue) >= MAX_QUEUED_SPANS:
+                self.dropped += 1
+                return
+            self._queue.append(span.to_dict())
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+                self._thread.start()
+            if len(self._queue) >= EXPORT_BATCH_SIZE:
+                self._wake.set()
+
+    def _run(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as file:
+            while True:
+                self._wake.wait(EXPORT_INTERVAL_SECONDS)
+                self._wake.clear()
+                with self._lock:
+                    batch, self._queue = self._queue, []
+                    stopping = self._stopping
+                if batch:
+                    try:
+                        file.write("".join(dumps(span) + "\n" for span in batch))
+                        file.flush()
+                    except Exception as e:
+                        logger.error(f"Failed to write {len(batch)} spans: {e}")
+                if stopping:
+                    return
+
+    def shutdown(self):
+        """Write the queued spans and stop the thread; blocks until done."""
+        with self._lock:
+            self._stopping = True
+            thread = self._thread
+        if thread is not None:
+            self._wake.set()
+            thread.join()
+
+
+class TracerProvider:
+    """Creates tracers, exports ended spans and logs slow traces."""
+
+    def __init__(
+        self,
+        exporter=None,
+        sample_rate: float = 1.0,
+        slow_threshold_ms: float = 3000.0,
+        slow_sample_rate: float = 1.0,
+    ):
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self.slow_threshold_ms = slow_threshold_ms
+        self.slow_sample_rate = slow_sample_rate
+        # trace_id -> ended child spans, until the root span ends
+        self._pending: "OrderedDict[str, List[Span]]" = OrderedDict()
+
+    def get_tracer(self, name: str) -> "Tracer":
+        return Tracer(self, name)
+
+    def shutdown(self):
+        """Flush the exporter; blocks, so call it off the event loop."""
+        if self.exporter is not None:
+            self.exporter.shutdown()
+
+    def on_end(self, span: Span):
+        if self.exporter is not None and random.random() < self.sample_rate:
+            try:
+                self.exporter.export(span)
+            except Exception as e:
+                logger.error(f"Failed to export span: {e}")
+
+        if not span.is_root:
+            children = self._pending.get(span.trace_id)
+            if children is None:
+                children = self._pending[span.trace_id] = []
+                while len(self._pending) > MAX_PENDING_TRACES:
+                    self._pending.popitem(last=False)
+            children.append(span)
+            return
+
+        children = self._pending.pop(span.trace_id, [])
+        if span.duration_ms >= self.slow_threshold_ms and random.random() < self.slow_sample_rate:
+            self._log_slow(span, children)
+
+    def _log_slow(self, root: Span, children: List[Span]):
+        stages = ", ".join(
+            f"{child.name}={child.duration_ms:.0f}ms"
+            for child in sorted(children, key=lambda child: child.start_time_ns)
+        )
+        attributes = " ".join(f"{key}={value}" for key, value in root.attributes.items())
+        slow_logger.warning(
+            f"Slow {root.name} ({root.duration_ms:.0f}ms) trace={root.trace_id} "
+            f"{attributes} stages: {stages or 'none'}"
+        )
+
+
+class Tracer:
+    """Starts spans for one instrumented module."""
+
+    def __init__(self, provider: TracerProvider, name: str):
+        self.provider = provider
+        self.name = name
+
+    def start_span(
+        self,
+        name: str,
+        attributes: Optional[Dict[str, Any]] = None,
+        parent: Optional[Span] = None,
+        traceparent: Optional[str] = None,
+    ) -> Span:
+        """
+        Start a span without making it current.
+
+        The parent is, in order: parent, the span described by a W3C
+        traceparent header, the current span. Otherwise a new trace starts.
+        """
+        trace_id, parent_span_id, remote = None, None, False
+        if parent is None and traceparent:
+            match = TRACEPARENT.match(traceparent.strip().lower())
+            if match:
+                trace_id, parent_span_id, remote = match.group(1), match.group(2), True
+        if trace_id is None:
+            parent = parent or _current_span.get()
+            if parent is not None:
+                trace_id, parent_span_id = parent.trace_id, parent.span_id
+            else:
+                trace_id = os.urandom(16).hex()
+        return Span(self.provider, name, trace_id, parent_span_id, attributes, is_root=remote)
+
+    @contextmanager
+    def start_as_current_span(
+        self,
+        name: str,
+        attributes: Optional[Dict[str, Any]] = None,
+        end_on_exit: bool = True,
+    ) -> Iterator[Span]:
+        """Start a child of the current span and make it current for the block."""
+        span = self.start_span(name, attributes)
+        with use_span(span, end_on_exit=end_on_exit):
+            yield span
+
+
+@contextmanager
+def use_span(span: Span, end_on_exit: bool = False) -> Iterator[Span]:
+    """Make a span current for the block, recording any exception on it."""
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        if not isinstance(e, GeneratorExit):
+            span.record_exception(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        if end_on_exit:
+            span.end()
+
+
+def get_current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def _create_exporter():
+    if settings.tracing_exporter == "console":
+        return ConsoleSpanExporter()
+    if settings.tracing_exporter == "file":
+        return FileSpanExporter(settings.tracing_file_path)
+    return None
+
+
+# Singleton instance
+tracer_provider = TracerProvider(
+    exporter=_create_exporter(),
+    sample_rate=settings.tracing_sample_rate,
+    slow_threshold_ms=settings.slow_trace_threshold_ms,
+    slow_sample_rate=settings.slow_trace_sample_rate,
+)
+
+
+def get_tracer(name: str) -> Tracer:
+    return tracer_provider.get_tracer(name)
+
+
+class TracingMiddleware:
+    """ASGI middleware that wraps each HTTP request in a root span."""
+
+    def __init__(self, app):
+        self.app = app
+        self.tracer = get_tracer(__name__)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        # Renamed after the route template once routing has matched, so IDs
+        # in the path do not each become a span name
+        span = self.tracer.start_span(
+            scope["method"],
+            attributes={"http.method": scope["method"], "http.target": scope["path"]},
+            traceparent=headers.get(b"traceparent", b"").decode("latin-1") or None,
+        )
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                span.set_attribute("http.status_code", message["status"])
+                if message["status"] >= 500:
+                    span.set_status(StatusCode.ERROR)
+            await send(message)
+
+        with use_span(span, end_on_exit=True):
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                # The router adds the matched route to the (shared) scope
+                route = scope.get("route")
+                if route is not None and getattr(route, "path", None):
+                    span.name = f"{scope['method']} {route.path}"
+                    span.set_attribute("http.route", route.path)
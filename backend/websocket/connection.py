@@ -0,0 +1,165 @@
+from collections import OrderedDict, deque
+from enum import Enum
+from typing import Callable, Deque, Dict, Optional
+from fastapi import WebSocket
+from serialization import Frame
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+# Frames a client can do without: superseded by the next one or refetchable.
+# Only these are dropped or coalesced when a queue is full; any other frame
+# (a chat message) closes the connection instead, and the client resumes.
+EPHEMERAL_TYPES = {"typing", "summary_updated", "ping"}
+
+
+class SlowConsumerPolicy(str, Enum):
+    """What to do with an ephemeral frame when a connection's outbound queue is full."""
+    DROP = "drop"              # Drop the new frame
+    COALESCE = "coalesce"      # Replace the oldest queued ephemeral frame (of the same type first)
+    DISCONNECT = "disconnect"  # Close the connection
+
+
+class ClientConnection:
+    """
+    Outbound queue and writer task for one WebSocket.
+
+    Broadcasts only append to the queue, so a slow or half-dead client never
+    delays delivery to the other connections in its conversation.
+
+    Ephemeral frames (typing indicators) go to a separate low-priority lane
+    keyed by coalesce key: a newer frame replaces a queued one with the same
+    key, and the lane is only drained when the main queue is empty.
+    """
+
+    __slots__ = (
+        "websocket", "conversation_id", "max_queue", "policy", "on_failure", "binary",
+        "queue", "ephemeral", "dropped", "closed", "last_seen", "_ready", "_writer",
+    )
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        conversation_id: str,
+        max_queue: int,
+        policy: SlowConsumerPolicy,
+        on_failure: Callable[[WebSocket], None],
+        binary: bool = False,
+    ):
+        self.websocket = websocket
+        self.conversation_id = conversation_id
+        self.max_queue = max_queue
+        self.policy = policy
+        self.on_failure = on_failure
+        # Send MessagePack binary frames instead of JSON text
+        self.binary = binary
+        # Frames in send order
+        self.queue: Deque[Frame] = deque()
+        # coalesce key -> latest low-priority frame
+        self.ephemeral: Dict[str, Frame] = OrderedDict()
+        self.dropped = 0
+        self.closed = False
+        # Monotonic time of the last frame received from the client
+        self.last_seen = time.monotonic()
+        self._ready = asyncio.Event()
+        self._writer: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._writer = asyncio.create_task(self._write_loop())
+
+    def touch(self):
+        """Record activity from the client."""
+        self.last_seen = time.monotonic()
+
+    @property
+    def depth(self) -> int:
+        return len(self.queue) + len(self.ephemeral)
+
+    def enqueue(self, frame: Frame, coalesce_key: Optional[str] = None) -> bool:
+        """
+        Queue a frame without blocking. Returns False if it was not queued.
+
+        Frames with a coalesce_key are low priority and replace any queued
+        frame with the same key.
+        """
+        if self.closed:
+            return False
+
+        if coalesce_key is not None:
+            self.ephemeral.pop(coalesce_key, None)
+            self.ephemeral[coalesce_key] = frame
+            self._ready.set()
+            return True
+
+        if len(self.queue) >= self.max_queue:
+            if frame.type not in EPHEMERAL_TYPES or self.policy == SlowConsumerPolicy.DISCONNECT:
+                # Never lose a chat message silently: the client resumes after 1013
+                logger.warning(f"Disconnecting slow consumer in {self.conversation_id}")
+                self.close(code=1013)
+                self.on_failure(self.websocket)
+                return False
+
+            self.dropped += 1
+            if self.policy == SlowConsumerPolicy.DROP or not self._evict_for(frame.type):
+                return False
+
+        self.queue.append(frame)
+        self._ready.set()
+        return True
+
+    def _evict_for(self, message_type: Optional[str]) -> bool:
+        """
+        Make room by dropping the oldest ephemeral frame of the same type
+        (or else the oldest ephemeral frame). Returns False if there is none.
+        """
+        fallback = None
+        for index, queued in enumerate(self.queue):
+            if queued.type == message_type:
+                del self.queue[index]
+                return True
+            if fallback is None and queued.type in EPHEMERAL_TYPES:
+                fallback = index
+        if fallback is None:
+            return False
+        del self.queue[fallback]
+        return True
+
+    async def _write_loop(self):
+        while True:
+            while not self.queue and not self.ephemeral:
+                self._ready.clear()
+                await self._ready.wait()
+
+            if self.queue:
+                frame = self.queue.popleft()
+            else:
+                _, frame = self.ephemeral.popitem(last=False)
+            try:
+                if self.binary:
+                    await self.websocket.send_bytes(frame.binary)
+                else:
+                    await self.websocket.send_text(frame.text)
+            except Exception as e:
+                logger.error(f"Failed to send to connection: {e}")
+                self.closed = True
+                self.on_failure(self.websocket)
+                return
+
+    def close(self, code: Optional[int] = None):
+        """Stop the writer and optionally close the socket with a code."""
+        self.closed = True
+        self.queue.clear()
+        self.ephemeral.clear()
+        if self._writer is not None and self._writer is not asyncio.current_task():
+            self._writer.cancel()
+        if code is not None:
+            asyncio.create_task(self._close_socket(code))
+
+    async def _close_socket(self, code: int):
+        try:
+            await self.websocket.close(code=code)
+        except Exception:
+            pass
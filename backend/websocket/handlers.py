@@ -2,19 +2,32 @@ from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import Optional
+import asyncio
 import json
 import logging
 from datetime import datetime
+import uuid
 
 from database import get_db
+from serialization import msgpack_loads
 from websocket.manager import manager
+from websocket.pipeline import message_pipeline
+from websocket.speculation import SpeculativeMatch, join_sentences, speculative_translator
+from websocket.typing_throttle import typing_throttle
 from services.translation_service import translation_service
 from services.database_service import database_service
 from services.transcription_service import transcription_service
+from services.summary_scheduler import summary_scheduler
+from services.conversation_cache import conversation_cache
+from services.translation_memory import translation_memory
+from services.outbox import outbox
+from services.runtime_metrics import loop_monitor, process_rss_bytes
+from tracing import get_current_span, get_tracer, use_span
 from config import settings
 import os
 
 logger = logging.getLogger(__name__)
+tracer = get_tracer(__name__)
 
 websocket_router = APIRouter()
 
@@ -33,6 +46,8 @@ class SendMessage(BaseModel):
     role: str  # 'doctor' or 'patient'
     is_audio: Optional[bool] = False
     audio_url: Optional[str] = None  # Path to audio file for transcription
+    client_id: Optional[str] = None  # Opts in to message_pending/message_translated frames
+    traceparent: Optional[str] = None  # W3C trace context to continue
 
 
 class TypingMessage(BaseModel):
@@ -40,27 +55,61 @@ class TypingMessage(BaseModel):
     type: str = "typing"
     role: str  # 'doctor' or 'patient'
     is_typing: bool
+    draft: Optional[str] = None  # Current input text, for speculative translation
 
 
 @websocket_router.websocket("/ws/{conversation_id}")
-async def websocket_endpoint(websocket: WebSocket, conversation_id: str):
-    """WebSocket endpoint for real-time messaging."""
-    await manager.connect(websocket, conversation_id)
+async def websocket_endpoint(
+    websocket: WebSocket,
+    conversation_id: str,
+    last_seq: Optional[int] = None,
+    last_message_id: Optional[str] = None,
+):
+    """
+    WebSocket endpoint for real-time messaging.
+
+    Reconnecting clients pass the seq of the last message frame they
+    received (and the id of the last message) to get only what they missed.
+    """
+    if not await manager.connect(websocket, conversation_id):
+        return
+
+    # Warm the metadata cache so messages need no conversation lookup
+    try:
+        await conversation_cache.load(conversation_id)
+    except Exception as e:
+        # Messages use the last known or default languages until the database is back
+        logger.warning(f"Failed to load conversation {conversation_id}: {e}")
+
+    if last_seq is not None or last_message_id:
+        await resume_connection(websocket, conversation_id, last_seq, last_message_id)
 
     try:
         while True:
-            data = await websocket.receive_text()
+            # Clients that negotiated MessagePack send binary frames, but may
+            # still send JSON text (either is accepted from any client)
+            received = await websocket.receive()
+            if received["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(received.get("code", 1000))
+            manager.touch(websocket)
+            data = received.get("text")
+            if data is None:
+                data = received.get("bytes")
 
             try:
-                message = json.loads(data)
+                message = json.loads(data) if isinstance(data, str) else msgpack_loads(data)
+
+                # Heartbeat reply (receiving it already counted as activity)
+                if message.get("type") == "pong":
+                    continue
 
                 # Handle join_conversation
-                if message.get("type") == "join_conversation":
+                elif message.get("type") == "join_conversation":
                     role = message.get("role")
-                    await websocket.send_json({
+                    await manager.send_personal({
                         "type": "joined",
                         "data": {"conversation_id": conversation_id, "role": role}
-                    })
+                    }, websocket)
 
                 # Handle send_message
                 elif message.get("type") == "send_message":
@@ -68,7 +117,7 @@ async def websocket_endpoint(websocket: WebSocket, conversation_id: str):
 
                 # Handle typing
                 elif message.get("type") == "typing":
-                    await handle_typing(conversation_id, message)
+                    await handle_typing(websocket, conversation_id, message)
 
             except json.JSONDecodeError:
                 logger.error(f"Invalid JSON received: {data}")
@@ -80,29 +129,186 @@ async def websocket_endpoint(websocket: WebSocket, conversation_id: str):
     except Exception as e:
         logger.error(f"WebSocket error: {e}")
         manager.disconnect(websocket)
+    finally:
+        await typing_throttle.forget(websocket)
+        speculative_translator.forget(websocket)
+
+
+async def resume_connection(
+    websocket: WebSocket,
+    conversation_id: str,
+    last_seq: Optional[int],
+    last_message_id: Optional[str],
+):
+    """Send a reconnecting client the frames it missed, then a resumed frame."""
+    if last_seq is not None and manager.replay(websocket, conversation_id, last_seq):
+        mode = "buffer"
+    else:
+        # The gap is older than the buffer: fall back to a keyset query
+        missed = None
+        if last_message_id:
+            db = next(get_db())
+            try:
+                missed = await database_service.get_messages_after(db, conversation_id, last_message_id)
+            finally:
+                db.close()
+
+        if missed is None:
+            # Nothing to resume from; the client should refetch the conversation
+            mode = "resync"
+        else:
+            for message_obj in missed:
+                await manager.send_personal({"type": "new_message", "data": message_obj}, websocket)
+            mode = "database"
+
+    logger.info(f"Resumed connection to {conversation_id} from {mode}")
+    await manager.send_personal({
+        "type": "resumed",
+        "seq": manager.current_seq(conversation_id),
+        "data": {"mode": mode}
+    }, websocket)
+
+
+@websocket_router.get("/api/ws/metrics")
+async def websocket_metrics():
+    """Connection, outbound queue and runtime metrics for this worker."""
+    metrics = manager.get_metrics()
+    metrics["typing_events_suppressed"] = typing_throttle.suppressed
+    metrics["conversation_cache"] = conversation_cache.get_metrics()
+    metrics["speculative_translation"] = speculative_translator.get_metrics()
+    metrics["translation_memory"] = translation_memory.get_metrics()
+    metrics["translation_breaker"] = translation_service.breaker.get_metrics()
+    metrics["outbox"] = await outbox.get_metrics()
+    metrics["event_loop_lag"] = loop_monitor.snapshot()
+    metrics["rss_bytes"] = process_rss_bytes()
+    return metrics
 
 
 async def handle_send_message(websocket: WebSocket, conversation_id: str, message_data: dict):
-    """Handle sending a message to the conversation."""
+    """
+    Handle sending a message to the conversation.
+
+    Transcription and translation run concurrently with the conversation's
+    other messages; saving and broadcasting happen in sequence order.
+
+    If the client sends a client_id, the original text is broadcast at once
+    as message_pending and the result follows as message_translated (or
+    message_failed); otherwise a single new_message is broadcast.
+
+    The whole lifecycle is one trace rooted at a ws.send_message span,
+    which ends once the message has been delivered.
+    """
+    role = message_data.get("role", "doctor")
+    audio_url = message_data.get("audio_url")
+    client_id = message_data.get("client_id")
+
+    root = tracer.start_span(
+        "ws.send_message",
+        attributes={"conversation.id": conversation_id, "message.role": role},
+        traceparent=message_data.get("traceparent"),
+    )
+    if client_id:
+        root.set_attribute("client.id", client_id)
+
+    async def announce(seq: int):
+        text = message_data.get("text", "")
+        await manager.broadcast(conversation_id, {
+            "type": "message_pending",
+            "seq": seq,
+            "data": {
+                "client_id": client_id,
+                "conversation_id": conversation_id,
+                "role": role,
+                # Audio is not transcribed yet
+                "original_text": None if audio_url else text,
+                "audio_url": audio_url,
+                "created_at": datetime.utcnow().isoformat(),
+            }
+        })
+
+    # Translations already started from the draft's sentences, if any
+    if audio_url:
+        # Drafts are typed text; an audio message is translated from its transcription
+        speculative_translator.discard(websocket)
+        speculation = None
+    else:
+        speculation = speculative_translator.claim(websocket, message_data.get("text", ""))
+
+    async def process() -> dict:
+        try:
+            return await prepare_message(conversation_id, message_data, speculation)
+        except Exception as e:
+            root.record_exception(e)
+            root.end()
+            raise
+        finally:
+            if speculation is not None:
+                # Not awaited if processing failed early: stop what is still running
+                speculation.cancel()
+
+    async def deliver(seq: int, translation: dict):
+        root.set_attribute("message.seq", seq)
+        try:
+            await deliver_message(conversation_id, seq, role, translation, audio_url, client_id)
+        finally:
+            root.end()
+
+    async def fail(seq: int, error: Exception):
+        # Clients would otherwise show the pending message as translating forever
+        await manager.broadcast(conversation_id, {
+            "type": "message_failed",
+            "seq": seq,
+            "data": {"client_id": client_id, "conversation_id": conversation_id, "role": role},
+        })
+
+    # The pipeline task copies the current context, so its spans join this trace
+    try:
+        with use_span(root):
+            await message_pipeline.submit(
+                conversation_id,
+                process,
+                deliver,
+                announce=announce if client_id else None,
+                fail=fail if client_id else None,
+            )
+    except BaseException:
+        root.end()
+        raise
+
+
+async def prepare_message(
+    conversation_id: str,
+    message_data: dict,
+    speculation: Optional[SpeculativeMatch] = None,
+) -> dict:
+    """
+    Transcribe (if needed) and translate an incoming message.
+
+    speculation holds translations of the text's leading sentences started
+    from its draft; they are used if made for the same language pair, and
+    only the remaining sentences are translated.
+    """
     text = message_data.get("text", "")
     role = message_data.get("role", "doctor")
-    is_audio = message_data.get("is_audio", False)
     audio_url = message_data.get("audio_url")
 
-    # Determine language pair based on role
-    source_lang = "en" if role == "doctor" else "es"
-    target_lang = "es" if role == "doctor" else "en"
+    # The sender's language to the other participant's, from cached metadata
+    source_lang, target_lang = await conversation_cache.language_pair(conversation_id, role)
 
     # If audio URL is provided, transcribe it
     audio_file_path = None
     if audio_url:
-        # Extract audio ID from URL (e.g., "/api/audio/abc123" -> "abc123")
-        audio_id = audio_url.split("/")[-1]
-        audio_file_path = os.path.join(settings.audio_storage_path, f"{audio_id}.webm")
+        with tracer.start_as_current_span("audio.lookup") as span:
+            # Extract audio ID from URL (e.g., "/api/audio/abc123" -> "abc123")
+            audio_id = audio_url.split("/")[-1]
+            audio_file_path = os.path.join(settings.audio_storage_path, f"{audio_id}.webm")
+            span.set_attributes({"audio.id": audio_id, "audio.exists": os.path.exists(audio_file_path)})
 
         # Transcribe the audio
         logger.info(f"Transcribing audio: {audio_file_path}")
-        transcription = await transcription_service.transcribe_audio(audio_file_path)
+        with tracer.start_as_current_span("transcription", {"audio.id": audio_id}) as span:
+            transcription = await transcription_service.transcribe_audio(audio_file_path)
+            span.set_attribute("transcription.ok", bool(transcription))
 
         if transcription:
             text = transcription
@@ -116,58 +322,291 @@ async def handle_send_message(websocket: WebSocket, conversation_id: str, messag
     if not text or not text.strip():
         text = "[Empty message]"
 
+    if speculation is not None and not audio_url:
+        try:
+            with tracer.start_as_current_span("translation", {
+                "translation.speculative": True,
+                "translation.speculated_sentences": len(speculation.tasks),
+            }):
+                translation = await translate_with_speculation(
+                    text, speculation, source_lang, target_lang, conversation_id
+                )
+            if translation is not None:
+                return translation
+        except Exception as e:
+            logger.warning(f"Speculative translation failed: {e}")
+
     # Translate the message
     try:
-        translation = await translation_service.translate(text, source_lang, target_lang)
+        with tracer.start_as_current_span("translation", {
+            "translation.source_language": source_lang,
+            "translation.target_language": target_lang,
+            "translation.chars": len(text),
+        }):
+            translation = await translation_service.translate(
+                text, source_lang, target_lang, fallback=False, conversation_id=conversation_id
+            )
     except Exception as e:
         logger.error(f"Translation failed: {e}")
+        # Deliver the original text now; the outbox retries the translation
         translation = {
             "original_text": text,
             "translated_text": text,
             "source_language": source_lang,
             "target_language": target_lang,
+            "translation_failed": True,
         }
 
+    return translation
+
+
+async def translate_with_speculation(
+    text: str,
+    speculation: SpeculativeMatch,
+    source_lang: str,
+    target_lang: str,
+    conversation_id: str,
+) -> Optional[dict]:
+    """
+    Translate text from its speculated leading sentences plus the rest.
+
+    Returns None if a speculation failed or was made for another language
+    pair (the conversation's languages changed meanwhile).
+    """
+    results = await asyncio.gather(*speculation.tasks, return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            logger.warning(f"Speculative translation failed: {result!r}")
+            return None
+        if (result["source_language"], result["target_language"]) != (source_lang, target_lang):
+            return None
+
+    parts = [result["translated_text"] for result in results]
+    if speculation.remainder:
+        rest = await translation_service.translate(
+            join_sentences(speculation.remainder, source_lang),
+            source_lang,
+            target_lang,
+            fallback=False,
+            conversation_id=conversation_id,
+        )
+        parts.append(rest["translated_text"])
+
+    return {
+        "original_text": text,
+        "translated_text": join_sentences(parts, target_lang),
+        "source_language": source_lang,
+        "target_language": target_lang,
+    }
+
+
+async def deliver_message(
+    conversation_id: str,
+    seq: int,
+    role: str,
+    translation: dict,
+    audio_url: Optional[str],
+    client_id: Optional[str] = None,
+):
+    """
+    Save a translated message and broadcast it with its sequence number.
+
+    If the translation or the save failed, the message is broadcast anyway
+    and the failed step is queued in the outbox (see redeliver_message).
+    An untranslated message is saved with translation_status 'pending'.
+    """
+    translation_failed = translation.get("translation_failed", False)
+    translation_status = "pending" if translation_failed else None
+    saved = True
+
     # Save to database
     db = next(get_db())
     try:
-        message_obj = await database_service.create_message(
-            db=db,
-            conversation_id=conversation_id,
-            role=role,
-            original_text=translation["original_text"],
-            translated_text=translation["translated_text"],
-            audio_url=audio_url,
-        )
+        with tracer.start_as_current_span("db.insert"):
+            message_obj = await database_service.create_message(
+                db=db,
+                conversation_id=conversation_id,
+                role=role,
+                original_text=translation["original_text"],
+                translated_text=translation["translated_text"],
+                audio_url=audio_url,
+                translation_status=translation_status,
+            )
         logger.info(f"Message saved to database: {message_obj['id']}")
+        translation_memory.add(
+            translation["original_text"],
+            translation["translated_text"],
+            translation["source_language"],
+            translation["target_language"],
+            conversation_id,
+        )
     except Exception as e:
         logger.error(f"Failed to save message to database: {e}")
-        # Create a fallback message object even if DB save fails
+        # The outbox saves it later under this id
+        saved = False
         message_obj = {
-            "id": f"msg-{conversation_id}-{len(text)}",
+            "id": str(uuid.uuid4()),
             "conversation_id": conversation_id,
             "role": role,
             "original_text": translation["original_text"],
             "translated_text": translation["translated_text"],
             "audio_url": audio_url,
+            "translation_status": translation_status,
             "created_at": datetime.utcnow().isoformat(),
         }
     finally:
         db.close()
 
+    if translation_failed or not saved:
+        try:
+            await outbox.enqueue({
+                "message": message_obj,
+                "save": not saved,
+                "translate": translation_failed,
+                "source_language": translation["source_language"],
+                "target_language": translation["target_language"],
+            })
+        except Exception as e:
+            logger.error(f"Failed to queue message {message_obj['id']} for retry: {e}")
+            if translation_failed:
+                # Nothing will retry the translation
+                message_obj = {**message_obj, "translation_status": "failed"}
+                if saved:
+                    db = next(get_db())
+                    try:
+                        await database_service.set_translation_status(db, message_obj["id"], "failed")
+                    except Exception as e:
+                        logger.error(f"Failed to mark translation of {message_obj['id']} as failed: {e}")
+                    finally:
+                        db.close()
+
+    # Links this trace to REST requests for the same message
+    span = get_current_span()
+    if span is not None:
+        span.set_attribute("message.id", message_obj["id"])
+
     # Broadcast to all participants
-    await manager.broadcast(conversation_id, {
-        "type": "new_message",
-        "data": message_obj
-    })
+    with tracer.start_as_current_span("broadcast"):
+        if client_id:
+            await manager.broadcast(conversation_id, {
+                "type": "message_translated",
+                "seq": seq,
+                "data": {**message_obj, "client_id": client_id}
+            })
+        else:
+            await manager.broadcast(conversation_id, {
+                "type": "new_message",
+                "seq": seq,
+                "data": message_obj
+            })
+
+    # Refresh the summary in the background once the conversation goes idle
+    summary_scheduler.touch(conversation_id)
+
+
+async def redeliver_message(job: dict):
+    """
+    Outbox handler: finish saving and translating a message.
+
+    Each completed step is recorded in the job, so a retry resumes after it.
+    Participants get a message_updated frame once the translation exists.
+    """
+    message_obj = job["message"]
+    conversation_id = message_obj["conversation_id"]
+
+    if job["save"]:
+        db = next(get_db())
+        try:
+            restored = await database_service.restore_message(db, message_obj)
+        finally:
+            db.close()
+        if restored is None:
+            logger.info(f"Dropping message {message_obj['id']}: conversation {conversation_id} was deleted")
+            return
+        job["save"] = False
+        logger.info(f"Message saved to database from outbox: {message_obj['id']}")
+        # The summary may have been refreshed while the message was missing
+        summary_scheduler.touch(conversation_id)
 
+    if job["translate"]:
+        if "translated_text" not in job:
+            translation = await translation_service.translate(
+                message_obj["original_text"],
+                job["source_language"],
+                job["target_language"],
+                fallback=False,
+                conversation_id=conversation_id,
+            )
+            job["translated_text"] = translation["translated_text"]
+        db = next(get_db())
+        try:
+            updated = await database_service.update_translation(db, message_obj["id"], job["translated_text"])
+        finally:
+            db.close()
+        if updated is None:
+            logger.info(f"Dropping translation of deleted message {message_obj['id']}")
+            return
+        job["translate"] = False
 
-async def handle_typing(conversation_id: str, message_data: dict):
-    """Handle typing indicator."""
+        translation_memory.add(
+            updated["original_text"],
+            updated["translated_text"],
+            job["source_language"],
+            job["target_language"],
+            conversation_id,
+        )
+        await broadcast_message_update(conversation_id, updated)
+        logger.info(f"Late translation delivered for message {message_obj['id']}")
+
+
+async def abandon_redelivery(job: dict):
+    """
+    Outbox dead handler: the translation was retried too often, so mark it failed.
+
+    A message that was never saved is lost and has nothing to mark.
+    """
+    message_obj = job["message"]
+    if job["save"] or not job["translate"]:
+        return
+
+    db = next(get_db())
+    try:
+        updated = await database_service.set_translation_status(db, message_obj["id"], "failed")
+    finally:
+        db.close()
+    if updated is not None:
+        await broadcast_message_update(message_obj["conversation_id"], updated)
+
+
+async def broadcast_message_update(conversation_id: str, message: dict):
+    """
+    Broadcast a changed message as message_updated.
+
+    The frame goes through the message pipeline, so it gets a sequence
+    number (and a place in the resume buffer) after every message ahead of it.
+    """
+    async def process() -> dict:
+        return message
+
+    async def deliver(seq: int, updated: dict):
+        await manager.broadcast(conversation_id, {
+            "type": "message_updated",
+            "seq": seq,
+            "data": updated
+        })
+
+    await message_pipeline.submit(conversation_id, process, deliver)
+
+
+async def handle_typing(websocket: WebSocket, conversation_id: str, message_data: dict):
+    """Handle typing indicator (throttled per connection and role)."""
     role = message_data.get("role", "doctor")
-    is_typing = message_data.get("is_typing", False)
+    is_typing = bool(message_data.get("is_typing", False))
+
+    # Clients opted in to speculative translation attach the draft text
+    if "draft" in message_data:
+        speculative_translator.update(
+            websocket, conversation_id, role, message_data["draft"] if is_typing else None
+        )
 
-    await manager.broadcast(conversation_id, {
-        "type": "typing",
-        "data": {"role": role, "is_typing": is_typing}
-    })
+    await typing_throttle.update(websocket, conversation_id, role, is_typing)
@@ -1,76 +1,316 @@
-from typing import Dict, Set, Optional
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, Set, Optional, Tuple
 from fastapi import WebSocket
+import asyncio
 import logging
+import time
+from config import settings
+import serialization
+from serialization import Frame
+from websocket.connection import ClientConnection, SlowConsumerPolicy
+from websocket.pubsub import PubSubBackend, create_pubsub
 
 logger = logging.getLogger(__name__)
 
+# WebSocket subprotocols, in order of server preference
+MSGPACK_SUBPROTOCOL = "medtranslate.msgpack"
+JSON_SUBPROTOCOL = "medtranslate.json"
+
+# Frame types that are superseded by the next one and may wait behind messages
+LOW_PRIORITY_TYPES = {"typing"}
+
+
+def _coalesce_key(message: dict) -> Optional[str]:
+    """Key under which a low-priority frame replaces an older queued one."""
+    message_type = message.get("type")
+    if message_type not in LOW_PRIORITY_TYPES:
+        return None
+    return f"{message_type}:{message.get('data', {}).get('role')}"
+
+
+class ConversationStream:
+    """Sequence counter and recent sequenced frames of one conversation."""
+
+    __slots__ = ("seq", "frames")
+
+    def __init__(self, buffer_size: int):
+        # Start from the clock so numbers keep increasing after this stream
+        # is evicted or the worker restarts; stale last_seq values then
+        # always look like a gap instead of matching new messages.
+        self.seq = int(time.time() * 1000)
+        # (seq, frame), oldest first
+        self.frames: Deque[Tuple[int, Frame]] = deque(maxlen=buffer_size)
+
 
 class ConnectionManager:
     """Manages WebSocket connections for conversations."""
 
-    def __init__(self):
+    def __init__(self, pubsub: Optional[PubSubBackend] = None):
         # conversation_id -> set of connections
         self.active_connections: Dict[str, Set[WebSocket]] = {}
-        # connection -> conversation_id mapping
-        self.connection_conversation: Dict[WebSocket, str] = {}
+        # connection -> outbound queue and writer (also records its conversation)
+        self.connections: Dict[WebSocket, ClientConnection] = {}
+        # conversation_id -> sequence counter and resume buffer, least recently used first
+        self.streams: "OrderedDict[str, ConversationStream]" = OrderedDict()
+        self.resume_buffer_size = settings.ws_resume_buffer_size
+        self.resume_max_conversations = settings.ws_resume_max_conversations
+        # Fans broadcasts out to connections held by other workers
+        self.pubsub = pubsub or create_pubsub(settings.pubsub_url)
+        self.send_queue_size = settings.ws_send_queue_size
+        self.slow_consumer_policy = SlowConsumerPolicy(settings.ws_slow_consumer_policy)
+        self.slow_consumer_disconnects = 0
+        self.dropped_frames = 0
+        self.buffer_resumes = 0
+        # Heartbeats and admission control
+        self.heartbeat_interval = settings.ws_heartbeat_interval_seconds
+        self.idle_timeout = settings.ws_idle_timeout_seconds
+        self.max_connections = settings.ws_max_connections
+        self.max_connections_per_conversation = settings.ws_max_connections_per_conversation
+        self.idle_disconnects = 0
+        self.rejected_connections = 0
+        self._heartbeat: Optional[asyncio.Task] = None
+        # Control message name -> handler called with the conversation id
+        self.control_handlers: Dict[str, Callable[[str], None]] = {}
+
+    async def start(self):
+        """Start receiving broadcasts published by other workers, and heartbeats."""
+        await self.pubsub.start(self._deliver_remote)
+        self._heartbeat = asyncio.create_task(self._heartbeat_loop())
+
+    async def stop(self):
+        """Stop heartbeats and the pub/sub backend."""
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            await asyncio.gather(self._heartbeat, return_exceptions=True)
+            self._heartbeat = None
+        await self.pubsub.stop()
+
+    async def _heartbeat_loop(self):
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.error(f"Heartbeat sweep failed: {e}")
+
+    def sweep(self):
+        """Ping every connection and close those silent for longer than the idle timeout."""
+        now = time.monotonic()
+        ping = Frame({"type": "ping"})
+        for websocket, connection in list(self.connections.items()):
+            if now - connection.last_seen > self.idle_timeout:
+                logger.info(f"Closing idle WebSocket in conversation: {connection.conversation_id}")
+                connection.close(code=1001)
+                self.disconnect(websocket)
+                self.idle_disconnects += 1
+            else:
+                connection.enqueue(ping, coalesce_key="ping")
+
+    def touch(self, websocket: WebSocket):
+        """Record that a frame was received on a connection."""
+        connection = self.connections.get(websocket)
+        if connection is not None:
+            connection.touch()
+
+    def _negotiate_subprotocol(self, websocket: WebSocket) -> Optional[str]:
+        """Pick a subprotocol offered by the client (JSON when none is offered)."""
+        offered = websocket.scope.get("subprotocols") or []
+        if MSGPACK_SUBPROTOCOL in offered and serialization.get_msgpack() is not None:
+            return MSGPACK_SUBPROTOCOL
+        if JSON_SUBPROTOCOL in offered:
+            return JSON_SUBPROTOCOL
+        return None
+
+    def _admission_error(self, conversation_id: str) -> Optional[str]:
+        if len(self.connections) >= self.max_connections:
+            return "Too many connections"
+        if len(self.active_connections.get(conversation_id, ())) >= self.max_connections_per_conversation:
+            return "Too many connections to this conversation"
+        return None
 
-    async def connect(self, websocket: WebSocket, conversation_id: str):
-        """Connect a WebSocket to a conversation."""
-        await websocket.accept()
+    async def connect(self, websocket: WebSocket, conversation_id: str) -> bool:
+        """Connect a WebSocket to a conversation. Returns False if it was refused."""
+        subprotocol = self._negotiate_subprotocol(websocket)
+        await websocket.accept(subprotocol=subprotocol)
+
+        error = self._admission_error(conversation_id)
+        if error is not None:
+            logger.warning(f"Refusing WebSocket for {conversation_id}: {error}")
+            self.rejected_connections += 1
+            # 1013: try again later
+            await websocket.close(code=1013, reason=error)
+            return False
 
         if conversation_id not in self.active_connections:
             self.active_connections[conversation_id] = set()
 
+        connection = ClientConnection(
+            websocket,
+            conversation_id,
+            max_queue=self.send_queue_size,
+            policy=self.slow_consumer_policy,
+            on_failure=self.disconnect,
+            binary=subprotocol == MSGPACK_SUBPROTOCOL,
+        )
+        connection.start()
+
         self.active_connections[conversation_id].add(websocket)
-        self.connection_conversation[websocket] = conversation_id
+        self.connections[websocket] = connection
 
         logger.info(f"WebSocket connected to conversation: {conversation_id}")
+        return True
 
     def disconnect(self, websocket: WebSocket):
         """Disconnect a WebSocket."""
-        conversation_id = self.connection_conversation.get(websocket)
+        connection = self.connections.pop(websocket, None)
+        if connection is None:
+            return
 
-        if conversation_id and conversation_id in self.active_connections:
+        connection.close()
+        self.dropped_frames += connection.dropped
+        conversation_id = connection.conversation_id
+
+        if conversation_id in self.active_connections:
             self.active_connections[conversation_id].discard(websocket)
 
             # Clean up empty conversations
             if not self.active_connections[conversation_id]:
                 del self.active_connections[conversation_id]
 
-        self.connection_conversation.pop(websocket, None)
         logger.info(f"WebSocket disconnected from conversation: {conversation_id}")
 
+    def _stream(self, conversation_id: str) -> ConversationStream:
+        stream = self.streams.get(conversation_id)
+        if stream is None:
+            stream = self.streams[conversation_id] = ConversationStream(self.resume_buffer_size)
+            while len(self.streams) > self.resume_max_conversations:
+                self.streams.popitem(last=False)
+        else:
+            self.streams.move_to_end(conversation_id)
+        return stream
+
+    def next_seq(self, conversation_id: str) -> int:
+        """Issue the next message sequence number for a conversation."""
+        stream = self._stream(conversation_id)
+        stream.seq += 1
+        return stream.seq
+
+    def current_seq(self, conversation_id: str) -> Optional[int]:
+        """Last sequence number seen for a conversation, if it is still tracked."""
+        stream = self.streams.get(conversation_id)
+        return stream.seq if stream is not None else None
+
+    def replay(self, websocket: WebSocket, conversation_id: str, last_seq: int) -> bool:
+        """
+        Queue the buffered frames a reconnecting client missed after last_seq.
+
+        Returns False, without queuing anything, if the buffer does not reach
+        back far enough (or last_seq belongs to an evicted stream). Sequence
+        numbers are issued per worker, so they only order a conversation's
+        frames when there is one worker; with several, this always returns
+        False and clients resume from the database.
+        """
+        if self.pubsub.shared:
+            return False
+
+        connection = self.connections.get(websocket)
+        stream = self.streams.get(conversation_id)
+        if connection is None or stream is None or last_seq > stream.seq:
+            return False
+
+        frames = stream.frames
+        if last_seq < stream.seq and (not frames or frames[0][0] > last_seq + 1):
+            return False
+
+        for seq, frame in frames:
+            if seq > last_seq:
+                connection.enqueue(frame)
+        self.buffer_resumes += 1
+        return True
+
     async def send_personal(self, message: dict, websocket: WebSocket):
         """Send a message to a specific WebSocket."""
-        try:
-            await websocket.send_json(message)
-        except Exception as e:
-            logger.error(f"Failed to send message: {e}")
+        connection = self.connections.get(websocket)
+        if connection is not None:
+            connection.enqueue(Frame(message))
 
     async def broadcast(self, conversation_id: str, message: dict, exclude: Optional[WebSocket] = None):
-        """Broadcast a message to all connections in a conversation."""
-        if conversation_id not in self.active_connections:
+        """Broadcast a message to all connections in a conversation, on every worker."""
+        await self._deliver_local(conversation_id, message, exclude)
+        await self.pubsub.publish(conversation_id, message)
+
+    def on_control(self, name: str, handler: Callable[[str], None]):
+        """Call handler when another worker publishes the control message name."""
+        self.control_handlers[name] = handler
+
+    async def publish_control(self, conversation_id: str, name: str):
+        """Tell the other workers about a change to a conversation; never sent to sockets."""
+        await self.pubsub.publish(conversation_id, {"control": name})
+
+    async def _deliver_remote(self, conversation_id: str, message: dict):
+        """Handle a message published by another worker."""
+        name = message.get("control")
+        if name is None:
+            await self._deliver_local(conversation_id, message)
             return
+        handler = self.control_handlers.get(name)
+        if handler is not None:
+            handler(conversation_id)
 
-        disconnected = set()
-        for connection in self.active_connections[conversation_id]:
-            if connection == exclude:
+    async def _deliver_local(self, conversation_id: str, message: dict, exclude: Optional[WebSocket] = None):
+        """Queue a message for this worker's connections in a conversation."""
+        websockets = self.active_connections.get(conversation_id)
+        seq = message.get("seq")
+        if not websockets and seq is None:
+            return
+
+        # One Frame for every connection: encoded once per wire format
+        coalesce_key = _coalesce_key(message)
+        frame = Frame(message)
+
+        if seq is not None and not self.pubsub.shared:
+            # Keep sequenced frames for clients that reconnect (all issued here)
+            self._stream(conversation_id).frames.append((seq, frame))
+
+        if not websockets:
+            return
+
+        for websocket in list(websockets):
+            if websocket == exclude:
                 continue
 
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                logger.error(f"Failed to broadcast to connection: {e}")
-                disconnected.add(connection)
+            connection = self.connections.get(websocket)
+            if connection is None or connection.closed:
+                continue
 
-        # Remove disconnected connections
-        for connection in disconnected:
-            self.disconnect(connection)
+            if not connection.enqueue(frame, coalesce_key) and connection.closed:
+                # Closed by the slow consumer policy
+                self.slow_consumer_disconnects += 1
 
     def get_connection_count(self, conversation_id: str) -> int:
         """Get the number of active connections for a conversation."""
         return len(self.active_connections.get(conversation_id, set()))
 
+    def get_metrics(self) -> dict:
+        """Connection counts and outbound queue statistics for this worker."""
+        depths = [connection.depth for connection in self.connections.values()]
+        return {
+            "connections": len(self.connections),
+            "conversations": len(self.active_connections),
+            "queue_depth_total": sum(depths),
+            "queue_depth_max": max(depths, default=0),
+            "queue_capacity": self.send_queue_size,
+            "slow_consumer_policy": self.slow_consumer_policy.value,
+            "dropped_frames": self.dropped_frames + sum(
+                connection.dropped for connection in self.connections.values()
+            ),
+            "slow_consumer_disconnects": self.slow_consumer_disconnects,
+            "idle_disconnects": self.idle_disconnects,
+            "rejected_connections": self.rejected_connections,
+            "resume_streams": len(self.streams),
+            "buffer_resumes": self.buffer_resumes,
+        }
+
 
 # Singleton instance
 manager = ConnectionManager()
@@ -0,0 +1,141 @@
+"""Concurrent, in-order processing of incoming chat messages."""
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Optional, Set, TypeVar
+
+from config import settings
+from tracing import get_tracer
+from websocket.manager import ConnectionManager, manager
+
+logger = logging.getLogger(__name__)
+tracer = get_tracer(__name__)
+
+T = TypeVar("T")
+
+
+class _PipelineState:
+    """In-flight messages of one conversation."""
+
+    __slots__ = ("slots", "tail", "tasks")
+
+    def __init__(self, max_in_flight: int):
+        self.slots = asyncio.Semaphore(max_in_flight)
+        # Resolved once the most recently submitted message has been delivered
+        self.tail: Optional[asyncio.Future] = None
+        self.tasks: Set[asyncio.Task] = set()
+
+
+class MessagePipeline:
+    """
+    Processes a conversation's messages concurrently but delivers them in order.
+
+    Each submitted message gets the conversation's next sequence number.
+    Its processing step (transcription, translation) starts right away; its
+    delivery step (persist, broadcast) waits until every earlier message of
+    the conversation has been delivered. Submitting blocks once
+    max_in_flight messages are pending, which backpressures the sender.
+    """
+
+    def __init__(self, connection_manager: ConnectionManager):
+        self.manager = connection_manager
+        self.max_in_flight = settings.ws_max_in_flight_messages
+        # conversation_id -> pipeline state
+        self._states: Dict[str, _PipelineState] = {}
+
+    async def submit(
+        self,
+        conversation_id: str,
+        process: Callable[[], Awaitable[T]],
+        deliver: Callable[[int, T], Awaitable[None]],
+        announce: Optional[Callable[[int], Awaitable[None]]] = None,
+        fail: Optional[Callable[[int, Exception], Awaitable[None]]] = None,
+    ) -> int:
+        """
+        Start processing a message and return its sequence number.
+
+        announce, if given, is awaited with the sequence number before
+        processing starts, so it always reaches clients ahead of deliver.
+        fail, if given, is awaited in deliver's place (and order) when
+        processing or delivery raises, so an announced message always ends.
+        """
+        state = self._states.get(conversation_id)
+        if state is None:
+            state = self._states[conversation_id] = _PipelineState(self.max_in_flight)
+
+        await state.slots.acquire()
+        seq = self.manager.next_seq(conversation_id)
+
+        previous = state.tail
+        done = asyncio.get_running_loop().create_future()
+        state.tail = done
+
+        if announce is not None:
+            try:
+                await announce(seq)
+            except Exception as e:
+                logger.error(f"Failed to announce message {seq} in {conversation_id}: {e}")
+
+        task = asyncio.create_task(
+            self._run(conversation_id, state, seq, process, deliver, fail, previous, done)
+        )
+        state.tasks.add(task)
+        task.add_done_callback(state.tasks.discard)
+        return seq
+
+    async def _run(
+        self,
+        conversation_id: str,
+        state: _PipelineState,
+        seq: int,
+        process: Callable[[], Awaitable[T]],
+        deliver: Callable[[int, T], Awaitable[None]],
+        fail: Optional[Callable[[int, Exception], Awaitable[None]]],
+        previous: Optional[asyncio.Future],
+        done: asyncio.Future,
+    ):
+        error: Optional[Exception] = None
+        try:
+            try:
+                result = await process()
+            except Exception as e:
+                error = e
+            if previous is not None and not previous.done():
+                # Time spent behind earlier messages of the conversation
+                with tracer.start_as_current_span("pipeline.wait"):
+                    # Shielded: cancelling this message must not cancel the
+                    # earlier message's future, which later messages also await
+                    await asyncio.shield(previous)
+            if error is None:
+                try:
+                    await deliver(seq, result)
+                except Exception as e:
+                    error = e
+
+            if error is not None:
+                logger.error(f"Failed to process message {seq} in {conversation_id}: {error}")
+                if fail is not None:
+                    await fail(seq, error)
+        except Exception as e:
+            logger.error(f"Failed to report failed message {seq} in {conversation_id}: {e}")
+        finally:
+            if not done.done():
+                if previous is not None and not previous.done():
+                    # Failed or cancelled early: later messages still wait for earlier ones
+                    previous.add_done_callback(lambda _: done.done() or done.set_result(None))
+                else:
+                    done.set_result(None)
+            state.slots.release()
+            if state.tail is done and self._states.get(conversation_id) is state:
+                del self._states[conversation_id]
+
+    async def shutdown(self):
+        """Cancel messages still in flight."""
+        tasks = [task for state in self._states.values() for task in state.tasks]
+        self._states.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# Singleton instance
+message_pipeline = MessagePipeline(manager)
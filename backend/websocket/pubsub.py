@@ -0,0 +1,267 @@
+"""Pub/sub backends that fan broadcasts out across worker processes.
+
+ConnectionManager delivers each broadcast to its own sockets and publishes it
+through a backend so that other workers (or replicas) deliver it to theirs.
+Backends never hand a process its own messages back.
+
+- ``memory://``: in-process hub. Only useful with a single worker, or in tests
+  where several managers share one hub to stand in for several workers.
+- ``redis://host:port`` / ``unix:///path/to.sock``: Redis protocol (RESP)
+  PUBLISH/SUBSCRIBE on one channel. Works against Redis or against the local
+  stand-in broker in ``websocket.pubsub_broker``.
+"""
+import asyncio
+import json
+import logging
+import uuid
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, List, Optional
+from urllib.parse import urlparse
+from serialization import dumps_bytes
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHANNEL = "medtranslate:broadcast"
+
+MessageHandler = Callable[[str, dict], Awaitable[None]]
+
+
+class PubSubError(Exception):
+    """Raised when the pub/sub server replies with an error."""
+    pass
+
+
+def encode_command(*args) -> bytes:
+    """Encode a command as a RESP array of bulk strings."""
+    parts = [f"*{len(args)}\r\n".encode()]
+    for arg in args:
+        data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+        parts.append(f"${len(data)}\r\n".encode() + data + b"\r\n")
+    return b"".join(parts)
+
+
+async def read_reply(reader: asyncio.StreamReader):
+    """Read one RESP value."""
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("Connection closed")
+
+    prefix, rest = line[:1], line[1:-2]
+    if prefix == b"+":
+        return rest.decode()
+    if prefix == b"-":
+        raise PubSubError(rest.decode())
+    if prefix == b":":
+        return int(rest)
+    if prefix == b"$":
+        length = int(rest)
+        if length == -1:
+            return None
+        return (await reader.readexactly(length + 2))[:-2]
+    if prefix == b"*":
+        length = int(rest)
+        if length == -1:
+            return None
+        return [await read_reply(reader) for _ in range(length)]
+    raise PubSubError(f"Unexpected reply: {line!r}")
+
+
+class PubSubBackend(ABC):
+    """Base class for broadcast fan-out backends."""
+
+    def __init__(self):
+        # Identifies this process so its own messages can be skipped
+        self.node_id = uuid.uuid4().hex
+
+    @property
+    def shared(self) -> bool:
+        """Whether broadcasts reach other managers (workers) at all."""
+        return True
+
+    @abstractmethod
+    async def start(self, handler: MessageHandler):
+        """Start delivering messages published by other processes to handler."""
+
+    @abstractmethod
+    async def publish(self, conversation_id: str, message: dict):
+        """Publish a message for delivery by other processes."""
+
+    async def stop(self):
+        """Stop receiving and release connections."""
+        pass
+
+
+class InMemoryHub:
+    """Process-local message bus shared by InMemoryPubSub instances."""
+
+    def __init__(self):
+        self.subscribers: List["InMemoryPubSub"] = []
+
+
+default_hub = InMemoryHub()
+
+
+class InMemoryPubSub(PubSubBackend):
+    """Pub/sub within one process."""
+
+    def __init__(self, hub: Optional[InMemoryHub] = None):
+        super().__init__()
+        self.hub = hub or default_hub
+        self.handler: Optional[MessageHandler] = None
+
+    @property
+    def shared(self) -> bool:
+        return len(self.hub.subscribers) > 1
+
+    async def start(self, handler: MessageHandler):
+        self.handler = handler
+        self.hub.subscribers.append(self)
+
+    async def publish(self, conversation_id: str, message: dict):
+        for subscriber in list(self.hub.subscribers):
+            if subscriber is not self and subscriber.handler is not None:
+                await subscriber.handler(conversation_id, message)
+
+    async def stop(self):
+        if self in self.hub.subscribers:
+            self.hub.subscribers.remove(self)
+        self.handler = None
+
+
+class RespPubSub(PubSubBackend):
+    """
+    Pub/sub over the Redis protocol, via TCP or a Unix socket.
+
+    Publishes are pipelined on one connection: each PUBLISH is written
+    without waiting for its reply, and a background task consumes the
+    replies, so one conversation's fan-out never waits on another's.
+    """
+
+    def __init__(self, url: str, channel: str = DEFAULT_CHANNEL):
+        super().__init__()
+        self.url = urlparse(url)
+        self.channel = channel
+        self.reconnect_delay = 1.0
+        self._handler: Optional[MessageHandler] = None
+        self._subscriber_task: Optional[asyncio.Task] = None
+        self._publisher: Optional[asyncio.StreamWriter] = None
+        self._reply_task: Optional[asyncio.Task] = None
+        self._connect_lock = asyncio.Lock()
+
+    async def _open_connection(self):
+        if self.url.scheme == "unix":
+            return await asyncio.open_unix_connection(self.url.path)
+        return await asyncio.open_connection(self.url.hostname or "localhost", self.url.port or 6379)
+
+    async def start(self, handler: MessageHandler):
+        self._handler = handler
+        self._subscriber_task = asyncio.create_task(self._subscribe_loop())
+
+    async def _subscribe_loop(self):
+        """Keep a subscription open, reconnecting with backoff."""
+        delay = self.reconnect_delay
+        while True:
+            writer = None
+            try:
+                reader, writer = await self._open_connection()
+                writer.write(encode_command("SUBSCRIBE", self.channel))
+                await writer.drain()
+                delay = self.reconnect_delay
+
+                while True:
+                    reply = await read_reply(reader)
+                    if isinstance(reply, list) and len(reply) == 3 and reply[0] == b"message":
+                        await self._dispatch(reply[2])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Pub/sub subscription lost ({e}), retrying in {delay}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+            finally:
+                if writer is not None:
+                    writer.close()
+
+    async def _dispatch(self, payload: bytes):
+        try:
+            envelope = json.loads(payload)
+        except json.JSONDecodeError:
+            logger.error("Invalid pub/sub payload")
+            return
+
+        if envelope.get("origin") == self.node_id or self._handler is None:
+            return
+        try:
+            await self._handler(envelope["conversation_id"], envelope["message"])
+        except Exception as e:
+            logger.error(f"Failed to deliver pub/sub message: {e}")
+
+    async def _get_publisher(self) -> asyncio.StreamWriter:
+        if self._publisher is None:
+            async with self._connect_lock:
+                if self._publisher is None:
+                    reader, writer = await self._open_connection()
+                    self._publisher = writer
+                    self._reply_task = asyncio.create_task(self._read_replies(reader, writer))
+        return self._publisher
+
+    async def _read_replies(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Consume PUBLISH replies until the publisher connection closes."""
+        try:
+            while True:
+                try:
+                    await read_reply(reader)
+                except PubSubError as e:
+                    logger.error(f"Pub/sub publish failed: {e}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Pub/sub publisher connection lost: {e}")
+        finally:
+            writer.close()
+            if self._publisher is writer:
+                self._publisher = None
+
+    def _close_publisher(self):
+        if self._reply_task is not None:
+            self._reply_task.cancel()
+            self._reply_task = None
+        if self._publisher is not None:
+            self._publisher.close()
+            self._publisher = None
+
+    async def publish(self, conversation_id: str, message: dict):
+        payload = dumps_bytes({
+            "origin": self.node_id,
+            "conversation_id": conversation_id,
+            "message": message,
+        })
+        try:
+            writer = await self._get_publisher()
+            # A single write keeps concurrent commands from interleaving
+            writer.write(encode_command("PUBLISH", self.channel, payload))
+            await writer.drain()
+        except Exception as e:
+            # Local sockets already have the message; remote ones miss it
+            logger.error(f"Pub/sub publish failed: {e}")
+            self._close_publisher()
+
+    async def stop(self):
+        if self._subscriber_task is not None:
+            self._subscriber_task.cancel()
+            await asyncio.gather(self._subscriber_task, return_exceptions=True)
+            self._subscriber_task = None
+        reply_task = self._reply_task
+        self._close_publisher()
+        if reply_task is not None:
+            await asyncio.gather(reply_task, return_exceptions=True)
+
+
+def create_pubsub(url: str) -> PubSubBackend:
+    """Create a backend from a URL (memory://, redis://host:port, unix:///path)."""
+    scheme = urlparse(url).scheme
+    if scheme in ("", "memory"):
+        return InMemoryPubSub()
+    if scheme in ("redis", "unix"):
+        return RespPubSub(url)
+    raise ValueError(f"Unsupported pub/sub URL: {url}")
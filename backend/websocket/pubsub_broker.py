@@ -0,0 +1,116 @@
+"""Minimal local stand-in for a Redis pub/sub server.
+
+Speaks just enough of the Redis protocol (SUBSCRIBE, UNSUBSCRIBE, PUBLISH,
+PING) for RespPubSub, so several workers can share broadcasts on one machine
+or in tests without running Redis.
+
+Usage (from the backend directory):
+    python -m websocket.pubsub_broker --port 6380
+    python -m websocket.pubsub_broker --unix /tmp/medtranslate.sock
+"""
+import argparse
+import asyncio
+import logging
+from typing import Dict, Optional, Set
+
+from websocket.pubsub import encode_command, read_reply
+
+logger = logging.getLogger(__name__)
+
+
+class LocalBroker:
+    """In-process RESP pub/sub server."""
+
+    def __init__(self):
+        # channel -> subscribed writers
+        self.channels: Dict[str, Set[asyncio.StreamWriter]] = {}
+        self.clients: Set[asyncio.StreamWriter] = set()
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 6380, unix_path: Optional[str] = None):
+        if unix_path:
+            self.server = await asyncio.start_unix_server(self._handle_client, path=unix_path)
+        else:
+            self.server = await asyncio.start_server(self._handle_client, host, port)
+        return self.server
+
+    async def stop(self):
+        """Stop accepting clients and drop connected ones, as a Redis shutdown would."""
+        if self.server is not None:
+            self.server.close()
+            for writer in list(self.clients):
+                writer.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        subscriptions: Set[str] = set()
+        self.clients.add(writer)
+        try:
+            while True:
+                command = await read_reply(reader)
+                if not isinstance(command, list) or not command:
+                    break
+                name = command[0].decode().upper()
+                args = [arg.decode() for arg in command[1:]]
+
+                if name == "SUBSCRIBE":
+                    for channel in args:
+                        self.channels.setdefault(channel, set()).add(writer)
+                        subscriptions.add(channel)
+                        writer.write(self._subscribe_reply("subscribe", channel, len(subscriptions)))
+                elif name == "UNSUBSCRIBE":
+                    for channel in args or list(subscriptions):
+                        self.channels.get(channel, set()).discard(writer)
+                        subscriptions.discard(channel)
+                        writer.write(self._subscribe_reply("unsubscribe", channel, len(subscriptions)))
+                elif name == "PUBLISH":
+                    channel, payload = args[0], command[2]
+                    receivers = list(self.channels.get(channel, ()))
+                    frame = encode_command("message", channel, payload)
+                    for receiver in receivers:
+                        receiver.write(frame)
+                    writer.write(f":{len(receivers)}\r\n".encode())
+                elif name == "PING":
+                    writer.write(b"+PONG\r\n")
+                else:
+                    writer.write(f"-ERR unknown command '{name}'\r\n".encode())
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for channel in subscriptions:
+                self.channels.get(channel, set()).discard(writer)
+            self.clients.discard(writer)
+            writer.close()
+
+    @staticmethod
+    def _subscribe_reply(kind: str, channel: str, count: int) -> bytes:
+        return (
+            f"*3\r\n${len(kind)}\r\n{kind}\r\n".encode()
+            + f"${len(channel.encode())}\r\n{channel}\r\n".encode()
+            + f":{count}\r\n".encode()
+        )
+
+
+async def _serve(host: str, port: int, unix_path: Optional[str]):
+    broker = LocalBroker()
+    server = await broker.start(host, port, unix_path)
+    logger.info(f"Pub/sub broker listening on {unix_path or f'{host}:{port}'}")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Redis-protocol pub/sub broker")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6380)
+    parser.add_argument("--unix", help="Listen on a Unix socket instead of TCP")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_serve(args.host, args.port, args.unix))
+
+
+if __name__ == "__main__":
+    main()
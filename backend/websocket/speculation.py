@@ -0,0 +1,238 @@
+"""Speculative translation of drafts attached to typing events."""
+import asyncio
+import logging
+import re
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from fastapi import WebSocket
+
+from config import settings
+from services.conversation_cache import conversation_cache
+from services.translation_service import translation_service
+
+logger = logging.getLogger(__name__)
+
+# Sentence ends: ASCII and Arabic marks followed by whitespace (so "2.5 mg"
+# stays whole), or CJK full-width marks, which are not followed by spaces
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?؟])\s+|(?<=[。！？])")
+
+# Target languages written without spaces between sentences
+UNSPACED_LANGUAGES = {"zh"}
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split normalized text into sentences; the last one may be unfinished."""
+    return [sentence.strip() for sentence in SENTENCE_BOUNDARY.split(text) if sentence.strip()]
+
+
+def join_sentences(sentences: List[str], language: str) -> str:
+    return ("" if language in UNSPACED_LANGUAGES else " ").join(sentences)
+
+
+@dataclass
+class SpeculativeMatch:
+    """Translations started from a draft for the leading sentences of a sent message."""
+    # One translation task per reused sentence, in order
+    tasks: List[asyncio.Task]
+    # The sentences after them, which still need translating
+    remainder: List[str]
+
+    def cancel(self):
+        for task in self.tasks:
+            task.cancel()
+
+
+class _Speculation:
+    """A draft sentence being translated."""
+
+    __slots__ = ("text", "task")
+
+    def __init__(self, text: str, task: asyncio.Task):
+        self.text = text
+        self.task = task
+
+
+class _Draft:
+    """A connection's latest draft and the speculations started for its sentences."""
+
+    __slots__ = ("sentences", "speculations", "timer")
+
+    def __init__(self):
+        self.sentences: List[str] = []
+        # Translations of sentences[:len(speculations)]
+        self.speculations: List[_Speculation] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+    def cancel_timer(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+
+class SpeculativeTranslator:
+    """
+    Translates a sender's draft, sentence by sentence, before the message is sent.
+
+    Clients opt in by attaching the draft text to typing events. Once the
+    draft has been stable for debounce_ms, each of its sentences not
+    translated yet is translated in the background. Editing the draft only
+    discards the speculations from the first changed sentence on, so
+    finished sentences survive edits further along. When send_message
+    arrives, the translations of the sentences it starts with are reused
+    and only the rest of the message is translated.
+
+    The extra LLM calls are bounded: a connection starts speculations at
+    most every min_interval_ms, at most max_concurrency run per worker, and
+    none start while the translation circuit breaker is not closed.
+    """
+
+    def __init__(self):
+        self.enabled = settings.speculative_translation_enabled
+        self.debounce = settings.speculative_debounce_ms / 1000
+        self.min_chars = settings.speculative_min_chars
+        self.min_interval = settings.speculative_min_interval_ms / 1000
+        self.max_concurrency = settings.speculative_max_concurrency
+        # connection -> its current draft
+        self._drafts: Dict[WebSocket, _Draft] = {}
+        # connection -> monotonic time its last speculations started
+        self._last_started: Dict[WebSocket, float] = {}
+        # Counted in sentences
+        self.running = 0
+        self.started = 0
+        self.skipped = 0
+        self.used = 0
+        self.discarded = 0
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return " ".join(text.split())
+
+    def update(self, websocket: WebSocket, conversation_id: str, role: str, draft: Optional[str]):
+        """Record a draft from a typing event, (re)starting its debounce."""
+        if not self.enabled:
+            return
+
+        text = self._normalize(draft or "")
+        sentences = split_sentences(text) if len(text) >= self.min_chars else []
+        state = self._drafts.get(websocket)
+        if state is None:
+            if not sentences:
+                return
+            state = self._drafts[websocket] = _Draft()
+        elif state.sentences == sentences:
+            return
+
+        state.sentences = sentences
+        kept = 0
+        for speculation, sentence in zip(state.speculations, sentences):
+            if speculation.text != sentence:
+                break
+            kept += 1
+        self._drop(state.speculations[kept:])
+        del state.speculations[kept:]
+
+        state.cancel_timer()
+        if not sentences:
+            del self._drafts[websocket]
+            return
+        if kept == len(sentences):
+            return
+
+        # Wait out the debounce, and the rest of the connection's interval
+        delay = self.debounce
+        last_started = self._last_started.get(websocket)
+        if last_started is not None:
+            delay = max(delay, last_started + self.min_interval - time.monotonic())
+        loop = asyncio.get_running_loop()
+        state.timer = loop.call_later(delay, self._start, websocket, state, conversation_id, role)
+
+    def _start(self, websocket: WebSocket, state: _Draft, conversation_id: str, role: str):
+        if self._drafts.get(websocket) is not state:
+            return
+        state.timer = None
+        for sentence in state.sentences[len(state.speculations):]:
+            if self.running >= self.max_concurrency or translation_service.breaker.state != "closed":
+                # The rest is translated normally when sent
+                self.skipped += 1
+                break
+            task = asyncio.create_task(self._translate(sentence, conversation_id, role))
+            task.add_done_callback(self._finished)
+            state.speculations.append(_Speculation(sentence, task))
+            self.running += 1
+            self.started += 1
+        self._last_started[websocket] = time.monotonic()
+
+    def _finished(self, task: asyncio.Task):
+        self.running -= 1
+        if not task.cancelled():
+            # Retrieved here so unused failures are not reported as never retrieved
+            task.exception()
+
+    async def _translate(self, sentence: str, conversation_id: str, role: str) -> dict:
+        source_lang, target_lang = await conversation_cache.language_pair(conversation_id, role)
+        # A failed speculation is not used; the sentence is translated normally
+        return await translation_service.translate(
+            sentence, source_lang, target_lang, fallback=False, conversation_id=conversation_id
+        )
+
+    def claim(self, websocket: WebSocket, text: str) -> Optional[SpeculativeMatch]:
+        """
+        Take the speculations for the leading sentences of a sent message.
+
+        Returns None if the message does not start with a speculated
+        sentence. The connection's other speculations are discarded.
+        """
+        state = self._drafts.pop(websocket, None)
+        if state is None:
+            return None
+        state.cancel_timer()
+
+        sentences = split_sentences(self._normalize(text))
+        matched = 0
+        for speculation, sentence in zip(state.speculations, sentences):
+            if speculation.text != sentence:
+                break
+            matched += 1
+        self._drop(state.speculations[matched:])
+        if matched == 0:
+            return None
+
+        self.used += matched
+        return SpeculativeMatch(
+            tasks=[speculation.task for speculation in state.speculations[:matched]],
+            remainder=sentences[matched:],
+        )
+
+    def discard(self, websocket: WebSocket):
+        """Drop a connection's speculations (its message will not use them)."""
+        state = self._drafts.pop(websocket, None)
+        if state is not None:
+            state.cancel_timer()
+            self._drop(state.speculations)
+
+    def forget(self, websocket: WebSocket):
+        """Drop a disconnected connection's speculations."""
+        self.discard(websocket)
+        self._last_started.pop(websocket, None)
+
+    def _drop(self, speculations: List[_Speculation]):
+        for speculation in speculations:
+            speculation.task.cancel()
+        self.discarded += len(speculations)
+
+    def get_metrics(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "pending": len(self._drafts),
+            "running": self.running,
+            "started": self.started,
+            "skipped": self.skipped,
+            "used": self.used,
+            "discarded": self.discarded,
+        }
+
+
+# Singleton instance
+speculative_translator = SpeculativeTranslator()
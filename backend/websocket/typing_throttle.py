@@ -0,0 +1,107 @@
+"""Server-side throttling of typing indicators."""
+import asyncio
+import logging
+import time
+from typing import Dict, Optional, Tuple
+
+from fastapi import WebSocket
+
+from config import settings
+from websocket.manager import ConnectionManager, manager
+
+logger = logging.getLogger(__name__)
+
+
+class _TypingState:
+    """Last typing state broadcast for one connection and role."""
+
+    __slots__ = ("conversation_id", "is_typing", "last_sent", "stop_timer")
+
+    def __init__(self, conversation_id: str):
+        self.conversation_id = conversation_id
+        self.is_typing = False
+        self.last_sent = 0.0
+        self.stop_timer: Optional[asyncio.TimerHandle] = None
+
+
+class TypingThrottle:
+    """
+    Throttles typing events per connection and role.
+
+    Start/stop transitions are broadcast immediately. While typing continues,
+    at most one refresh goes out every refresh_ms, and a stop is broadcast
+    automatically if no event arrives for timeout_seconds.
+    """
+
+    def __init__(self, connection_manager: ConnectionManager):
+        self.manager = connection_manager
+        self.refresh_interval = settings.typing_refresh_ms / 1000
+        self.timeout = settings.typing_timeout_seconds
+        # (connection, role) -> state
+        self._states: Dict[Tuple[WebSocket, str], _TypingState] = {}
+        self.suppressed = 0
+
+    async def update(self, websocket: WebSocket, conversation_id: str, role: str, is_typing: bool):
+        """Record a typing event and broadcast it if it passes the throttle."""
+        key = (websocket, role)
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = _TypingState(conversation_id)
+
+        now = time.monotonic()
+        changed = is_typing != state.is_typing
+        refresh_due = is_typing and now - state.last_sent >= self.refresh_interval
+
+        if is_typing:
+            self._arm_stop_timer(key, state)
+        elif state.stop_timer is not None:
+            state.stop_timer.cancel()
+            state.stop_timer = None
+
+        if not changed and not refresh_due:
+            self.suppressed += 1
+            return
+
+        state.is_typing = is_typing
+        state.last_sent = now
+        await self._broadcast(conversation_id, role, is_typing)
+
+    async def forget(self, websocket: WebSocket):
+        """Drop a disconnected connection's state, sending a stop if it was typing."""
+        for key in [key for key in self._states if key[0] is websocket]:
+            state = self._states.pop(key)
+            if state.stop_timer is not None:
+                state.stop_timer.cancel()
+            if state.is_typing:
+                await self._broadcast(state.conversation_id, key[1], False)
+
+    def _arm_stop_timer(self, key: Tuple[WebSocket, str], state: _TypingState):
+        if state.stop_timer is not None:
+            state.stop_timer.cancel()
+        loop = asyncio.get_running_loop()
+        state.stop_timer = loop.call_later(
+            self.timeout, lambda: asyncio.create_task(self._expire(key))
+        )
+
+    async def _expire(self, key: Tuple[WebSocket, str]):
+        """Broadcast a stop for a connection that went quiet while typing."""
+        state = self._states.get(key)
+        if state is None or not state.is_typing:
+            return
+        state.is_typing = False
+        state.stop_timer = None
+        state.last_sent = time.monotonic()
+        await self._broadcast(state.conversation_id, key[1], False)
+
+    async def _broadcast(self, conversation_id: str, role: str, is_typing: bool):
+        try:
+            await self.manager.broadcast(conversation_id, {
+                "type": "typing",
+                "data": {"role": role, "is_typing": is_typing}
+            })
+        except Exception as e:
+            logger.error(f"Failed to broadcast typing indicator: {e}")
+
+
+# Singleton instance
+typing_throttle = TypingThrottle(manager)
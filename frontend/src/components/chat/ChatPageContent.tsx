@@ -31,8 +31,14 @@ export function ChatPageContent({ conversationId }: ChatPageContentProps) {
   // Summary panel state
   const [showSummary, setShowSummary] = useState(false)
 
-  // Combine REST messages with WebSocket messages
-  const allMessages = [...messages, ...wsMessages]
+  // Combine REST messages with WebSocket messages; the WebSocket copy of a
+  // message is newer (e.g. after a resync reload)
+  const wsById = new Map(wsMessages.map((m) => [m.id, m]))
+  const restIds = new Set(messages.map((m) => m.id))
+  const allMessages = [
+    ...messages.map((m) => wsById.get(m.id) ?? m),
+    ...wsMessages.filter((m) => !restIds.has(m.id)),
+  ]
 
   // Join conversation when connected
   useEffect(() => {
@@ -72,8 +78,8 @@ export function ChatPageContent({ conversationId }: ChatPageContentProps) {
     await generateSummary()
   }
 
-  const handleTyping = (isCurrentlyTyping: boolean) => {
-    sendTyping(selectedRole, isCurrentlyTyping)
+  const handleTyping = (isCurrentlyTyping: boolean, draft?: string) => {
+    sendTyping(selectedRole, isCurrentlyTyping, draft)
   }
 
   const header = (
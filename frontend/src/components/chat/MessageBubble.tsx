@@ -34,7 +34,17 @@ export function MessageBubble({ message, currentRole }: MessageBubbleProps) {
         }`} />
 
         {/* Translated text */}
-        <p className="font-medium">{message.translated_text}</p>
+        {message.pending ? (
+          <p className="font-medium italic opacity-60">Translating…</p>
+        ) : message.failed ? (
+          <p className="font-medium italic opacity-60">Message could not be sent</p>
+        ) : message.translation_status === 'pending' ? (
+          <p className="font-medium italic opacity-60">Translation pending…</p>
+        ) : message.translation_status === 'failed' ? (
+          <p className="font-medium italic opacity-60">Translation unavailable</p>
+        ) : (
+          <p className="font-medium">{message.translated_text}</p>
+        )}
 
         {/* Audio player if present */}
         {message.audio_url && (
@@ -6,7 +6,7 @@ import { useAudioRecorder } from '../../hooks/useAudioRecorder'
 
 interface MessageInputProps {
   onSendMessage: (text: string, audioBlob?: { blob: Blob; url: string; duration: number }) => void
-  onTyping?: (isTyping: boolean) => void
+  onTyping?: (isTyping: boolean, draft?: string) => void
   disabled?: boolean
   placeholder?: string
   language?: string
@@ -34,7 +34,7 @@ export function MessageInput({
     setText(newText)
     // Trigger typing indicator
     if (onTyping) {
-      onTyping(newText.length > 0)
+      onTyping(newText.length > 0, newText)
     }
   }
 
@@ -42,6 +42,7 @@ export function MessageInput({
     if (transcript) {
       setText(transcript)
       setShowSpeechInput(false)
+      onTyping?.(true, transcript)
     }
   }
 
@@ -54,7 +55,7 @@ export function MessageInput({
     resetRecording()
     // Stop typing indicator
     if (onTyping) {
-      onTyping(false)
+      onTyping(false, '')
     }
   }
 
@@ -1,13 +1,21 @@
 import { useEffect, useRef, useCallback, useState } from 'react'
+import { useQueryClient } from '@tanstack/react-query'
 import { createWebSocketClient, WebSocketClient } from '../services/websocket'
-import type { WSMessage, Message } from '../types'
+import { messagesApi } from '../services/api'
+import type { WSMessage, Message, Conversation, MedicalSummary } from '../types'
 
 export function useWebSocket(conversationId: string) {
+  const queryClient = useQueryClient()
   const clientRef = useRef<WebSocketClient | null>(null)
   const [isConnected, setIsConnected] = useState(false)
   const [messages, setMessages] = useState<Message[]>([])
+  const messagesRef = useRef<Message[]>([])
   const [isTyping, setIsTyping] = useState<{ role: 'doctor' | 'patient' } | null>(null)
 
+  useEffect(() => {
+    messagesRef.current = messages
+  }, [messages])
+
   useEffect(() => {
     if (!conversationId) return
 
@@ -21,7 +29,65 @@ export function useWebSocket(conversationId: string) {
       switch (wsMessage.type) {
         case 'new_message':
           if (wsMessage.data) {
-            setMessages((prev) => [...prev, wsMessage.data as Message])
+            const message = wsMessage.data as Message
+            // Replayed after a reconnect: skip messages already shown
+            setMessages((prev) => (prev.some((m) => m.id === message.id) ? prev : [...prev, message]))
+          }
+          break
+        case 'message_pending':
+          if (wsMessage.data) {
+            const pending: Message = {
+              ...wsMessage.data,
+              id: wsMessage.data.client_id,
+              original_text: wsMessage.data.original_text ?? '',
+              translated_text: '',
+              pending: true,
+            }
+            setMessages((prev) =>
+              prev.some((m) => m.client_id === pending.client_id) ? prev : [...prev, pending]
+            )
+          }
+          break
+        case 'message_translated':
+          if (wsMessage.data) {
+            const translated = wsMessage.data as Message
+            setMessages((prev) => {
+              if (prev.some((m) => m.id === translated.id)) {
+                // Already loaded (e.g. by a resync); drop the pending copy
+                return prev.filter((m) => !(m.pending && m.client_id === translated.client_id))
+              }
+              return prev.some((m) => m.pending && m.client_id === translated.client_id)
+                ? prev.map((m) => (m.pending && m.client_id === translated.client_id ? translated : m))
+                : [...prev, translated]
+            })
+          }
+          break
+        case 'message_failed':
+          if (wsMessage.data) {
+            const { client_id } = wsMessage.data
+            setMessages((prev) =>
+              prev.map((m) => (m.pending && m.client_id === client_id ? { ...m, pending: false, failed: true } : m))
+            )
+          }
+          break
+        case 'message_updated':
+          if (wsMessage.data) {
+            const updated = wsMessage.data as Message
+            // Messages loaded over REST are not in this list yet: add them so they replace the stale copy
+            setMessages((prev) =>
+              prev.some((m) => m.id === updated.id)
+                ? prev.map((m) => (m.id === updated.id ? updated : m))
+                : [...prev, updated]
+            )
+          }
+          break
+        case 'summary_updated':
+          if (wsMessage.data?.summary) {
+            // Regenerated in the background: show it without refetching the conversation
+            const summary = wsMessage.data.summary as MedicalSummary
+            queryClient.setQueryData<Conversation>(['conversation', conversationId], (prev) =>
+              prev ? { ...prev, summary } : prev
+            )
           }
           break
         case 'typing':
@@ -30,6 +96,22 @@ export function useWebSocket(conversationId: string) {
             setIsTyping(wsMessage.data.is_typing ? wsMessage.data : null)
           }
           break
+        case 'resumed':
+          console.log('WebSocket:', wsMessage.type, wsMessage.data)
+          // Database replays carry new messages but not message_updated frames, so
+          // translations finished meanwhile are only picked up by reloading too
+          if (wsMessage.data?.mode === 'resync' || wsMessage.data?.mode === 'database') {
+            // Reload the conversation, keeping only messages that arrived since
+            const stale = new Set(messagesRef.current.map((m) => m.id))
+            messagesApi
+              .list(conversationId)
+              .then((list) => {
+                const ids = new Set(list.map((m) => m.id))
+                setMessages((prev) => [...list, ...prev.filter((m) => !stale.has(m.id) && !ids.has(m.id))])
+              })
+              .catch((error) => console.error('Failed to reload messages:', error))
+          }
+          break
         case 'joined':
         case 'error':
           console.log('WebSocket:', wsMessage.type, wsMessage.data)
@@ -50,7 +132,7 @@ export function useWebSocket(conversationId: string) {
       clientRef.current = null
       setIsConnected(false)
     }
-  }, [conversationId])
+  }, [conversationId, queryClient])
 
   const joinConversation = useCallback((role: 'doctor' | 'patient') => {
     clientRef.current?.joinConversation(role)
@@ -60,8 +142,8 @@ export function useWebSocket(conversationId: string) {
     clientRef.current?.sendMessage(text, role, audioUrl)
   }, [])
 
-  const sendTyping = useCallback((role: 'doctor' | 'patient', isTyping: boolean) => {
-    clientRef.current?.sendTyping(role, isTyping)
+  const sendTyping = useCallback((role: 'doctor' | 'patient', isTyping: boolean, draft?: string) => {
+    clientRef.current?.sendTyping(role, isTyping, draft)
   }, [])
 
   return {
@@ -1,9 +1,16 @@
 import type { WSMessage, WSClientMessage } from '../types'
 
 const WS_URL = import.meta.env.VITE_WS_URL || 'ws://localhost:8000'
+// Attach drafts to typing events so the server can translate them early
+const SPECULATIVE_TRANSLATION = import.meta.env.VITE_SPECULATIVE_TRANSLATION === 'true'
 
 export type WebSocketEventHandler = (message: WSMessage) => void
 
+// crypto.randomUUID is only available in secure contexts
+function newClientId(): string {
+  return crypto.randomUUID?.() ?? `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`
+}
+
 export class WebSocketClient {
   private ws: WebSocket | null = null
   private url: string
@@ -11,18 +18,40 @@ export class WebSocketClient {
   private maxReconnectAttempts = 5
   private reconnectDelay = 1000
   private handlers: Set<WebSocketEventHandler> = new Set()
+  // Position in the conversation, sent on reconnect to receive only missed frames
+  private lastSeq: number | null = null
+  private lastMessageId: string | null = null
 
   constructor(conversationId: string) {
     this.url = `${WS_URL}/ws/${conversationId}`
   }
 
+  private connectUrl(): string {
+    const params = new URLSearchParams()
+    if (this.lastSeq !== null) params.set('last_seq', String(this.lastSeq))
+    if (this.lastMessageId) params.set('last_message_id', this.lastMessageId)
+    const query = params.toString()
+    return query ? `${this.url}?${query}` : this.url
+  }
+
+  private trackPosition(message: WSMessage): void {
+    // Pending frames are not final, so they do not advance the position
+    if (message.type === 'new_message' || message.type === 'message_translated' || message.type === 'resumed') {
+      if (typeof message.seq === 'number') this.lastSeq = message.seq
+      if (message.data?.id) this.lastMessageId = message.data.id
+    } else if (message.type === 'message_updated' || message.type === 'message_failed') {
+      // Final, but not the newest message: the message id stays
+      if (typeof message.seq === 'number') this.lastSeq = message.seq
+    }
+  }
+
   connect(): void {
     if (this.ws?.readyState === WebSocket.OPEN) {
       return
     }
 
     try {
-      this.ws = new WebSocket(this.url)
+      this.ws = new WebSocket(this.connectUrl())
 
       this.ws.onopen = () => {
         console.log('WebSocket connected')
@@ -32,6 +61,12 @@ export class WebSocketClient {
       this.ws.onmessage = (event) => {
         try {
           const message: WSMessage = JSON.parse(event.data)
+          if (message.type === 'ping') {
+            // Server heartbeat: idle connections are closed without a reply
+            this.send({ type: 'pong' })
+            return
+          }
+          this.trackPosition(message)
           this.handlers.forEach((handler) => handler(message))
         } catch (error) {
           console.error('Failed to parse WebSocket message:', error)
@@ -72,11 +107,16 @@ export class WebSocketClient {
   }
 
   sendMessage(text: string, role: 'doctor' | 'patient', audioUrl?: string): void {
-    this.send({ type: 'send_message', text, role, audio_url: audioUrl })
+    // A client id opts in to message_pending / message_translated frames
+    this.send({ type: 'send_message', text, role, audio_url: audioUrl, client_id: newClientId() })
   }
 
-  sendTyping(role: 'doctor' | 'patient', isTyping: boolean): void {
-    this.send({ type: 'typing', role, is_typing: isTyping })
+  sendTyping(role: 'doctor' | 'patient', isTyping: boolean, draft?: string): void {
+    if (SPECULATIVE_TRANSLATION && draft !== undefined) {
+      this.send({ type: 'typing', role, is_typing: isTyping, draft })
+    } else {
+      this.send({ type: 'typing', role, is_typing: isTyping })
+    }
   }
 
   onMessage(handler: WebSocketEventHandler): () => void {
@@ -14,6 +14,10 @@ export interface Conversation {
   patient_language: Language
   status: ConversationStatus
   summary?: MedicalSummary
+  // Present on list responses only
+  message_count?: number
+  last_message_preview?: string | null
+  last_message_at?: string | null
 }
 
 export interface Message {
@@ -24,6 +28,12 @@ export interface Message {
   translated_text: string
   audio_url?: string
   created_at: string
+  client_id?: string  // Set on messages sent with optimistic delivery
+  pending?: boolean   // Original text shown, translation still in progress
+  // Set while translated_text is just the original text: 'pending' is retried
+  // and sent as message_updated, 'failed' was given up on
+  translation_status?: 'pending' | 'failed' | null
+  failed?: boolean    // Processing failed after message_pending; nothing was saved
 }
 
 export interface MedicalSummary {
@@ -46,6 +56,7 @@ export interface TranslateResponse {
   translated_text: string
   source_language: Language
   target_language: Language
+  translation_status?: 'failed' | null  // translated_text is then the original text
 }
 
 export interface CreateConversationRequest {
@@ -72,7 +83,8 @@ export interface SearchResult {
 
 // WebSocket message types
 export interface WSMessage {
-  type: 'new_message' | 'typing' | 'error' | 'joined'
+  type: 'new_message' | 'message_pending' | 'message_translated' | 'message_failed' | 'message_updated' | 'typing' | 'error' | 'joined' | 'summary_updated' | 'resumed' | 'ping'
+  seq?: number  // Per-conversation message sequence number (message frames)
   data?: any
 }
 
@@ -81,12 +93,14 @@ export interface WSSendMessage {
   text: string
   role: Role
   audio_url?: string
+  client_id?: string
 }
 
 export interface WSTypingMessage {
   type: 'typing'
   role: Role
   is_typing: boolean
+  draft?: string
 }
 
 export interface WSJoinMessage {
@@ -95,5 +109,9 @@ export interface WSJoinMessage {
   role: Role
 }
 
-export type WSClientMessage = WSSendMessage | WSTypingMessage | WSJoinMessage
+export interface WSPongMessage {
+  type: 'pong'
+}
+
+export type WSClientMessage = WSSendMessage | WSTypingMessage | WSJoinMessage | WSPongMessage
 